@@ -0,0 +1,36 @@
+"""Add dead-link validation columns to job postings
+
+Revision ID: 0a6c2f8d4e19
+Revises: f3d9a6e1b274
+Create Date: 2026-10-19 13:58:22.417630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6c2f8d4e19'
+down_revision: Union[str, Sequence[str], None] = 'f3d9a6e1b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_postings', sa.Column('url_checked_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('job_postings', sa.Column('url_status', sa.Integer(), nullable=True))
+    op.add_column('job_postings', sa.Column('dead_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_job_postings_url_checked_at'), 'job_postings', ['url_checked_at'], unique=False)
+    op.create_index(op.f('ix_job_postings_dead_at'), 'job_postings', ['dead_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_postings_dead_at'), table_name='job_postings')
+    op.drop_index(op.f('ix_job_postings_url_checked_at'), table_name='job_postings')
+    op.drop_column('job_postings', 'dead_at')
+    op.drop_column('job_postings', 'url_status')
+    op.drop_column('job_postings', 'url_checked_at')
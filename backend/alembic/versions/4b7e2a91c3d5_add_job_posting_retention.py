@@ -0,0 +1,54 @@
+"""Add job posting retention columns and archive table
+
+Revision ID: 4b7e2a91c3d5
+Revises: 93281d630dc4
+Create Date: 2026-10-19 09:12:40.512387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2a91c3d5'
+down_revision: Union[str, Sequence[str], None] = '93281d630dc4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_postings', sa.Column('posted_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('job_postings', sa.Column('expired_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_job_postings_fetched_at'), 'job_postings', ['fetched_at'], unique=False)
+    op.create_index(op.f('ix_job_postings_expired_at'), 'job_postings', ['expired_at'], unique=False)
+
+    op.create_table(
+        'job_postings_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('external_id', sa.String(), nullable=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('company_name', sa.String(), nullable=False),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('salary_range', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('employment_type', sa.String(), nullable=True),
+        sa.Column('url', sa.String(), nullable=True),
+        sa.Column('posted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_job_postings_archive_external_id'), 'job_postings_archive', ['external_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_postings_archive_external_id'), table_name='job_postings_archive')
+    op.drop_table('job_postings_archive')
+    op.drop_index(op.f('ix_job_postings_expired_at'), table_name='job_postings')
+    op.drop_index(op.f('ix_job_postings_fetched_at'), table_name='job_postings')
+    op.drop_column('job_postings', 'expired_at')
+    op.drop_column('job_postings', 'posted_at')
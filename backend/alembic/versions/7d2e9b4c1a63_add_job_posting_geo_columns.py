@@ -0,0 +1,46 @@
+"""Add resolved location columns to job postings
+
+Revision ID: 7d2e9b4c1a63
+Revises: 0a6c2f8d4e19
+Create Date: 2026-10-19 15:12:07.284913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e9b4c1a63'
+down_revision: Union[str, Sequence[str], None] = '0a6c2f8d4e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXED = ['latitude', 'geo_cell', 'region_code', 'country_code', 'is_remote']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_postings', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('job_postings', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('job_postings', sa.Column('geohash', sa.String(), nullable=True))
+    op.add_column('job_postings', sa.Column('geo_cell', sa.String(), nullable=True))
+    op.add_column('job_postings', sa.Column('region_code', sa.String(), nullable=True))
+    op.add_column('job_postings', sa.Column('country_code', sa.String(), nullable=True))
+    op.add_column('job_postings', sa.Column('is_remote', sa.Boolean(), nullable=True))
+    for column in INDEXED:
+        op.create_index(op.f(f'ix_job_postings_{column}'), 'job_postings', [column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(INDEXED):
+        op.drop_index(op.f(f'ix_job_postings_{column}'), table_name='job_postings')
+    op.drop_column('job_postings', 'is_remote')
+    op.drop_column('job_postings', 'country_code')
+    op.drop_column('job_postings', 'region_code')
+    op.drop_column('job_postings', 'geo_cell')
+    op.drop_column('job_postings', 'geohash')
+    op.drop_column('job_postings', 'longitude')
+    op.drop_column('job_postings', 'latitude')
@@ -0,0 +1,37 @@
+"""Add page_load_stats table for adaptive page readiness timeouts
+
+Revision ID: a3c7e5d9b142
+Revises: e2b8c6a4f7d3
+Create Date: 2026-10-19 20:14:52.408731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e5d9b142'
+down_revision: Union[str, Sequence[str], None] = 'e2b8c6a4f7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'page_load_stats',
+        sa.Column('host', sa.String(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.Column('ready_ms_avg', sa.Float(), nullable=False),
+        sa.Column('last_ready_ms', sa.Integer(), nullable=True),
+        sa.Column('timeouts', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('host'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('page_load_stats')
@@ -0,0 +1,37 @@
+"""Add automation_worker_status so the API can show per-worker browser pool stats
+
+Revision ID: a7d3e9b1c460
+Revises: f1c4a7e2d950
+Create Date: 2026-10-20 10:12:44.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9b1c460'
+down_revision: Union[str, Sequence[str], None] = 'f1c4a7e2d950'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'automation_worker_status',
+        sa.Column('worker_id', sa.String(), nullable=False),
+        sa.Column('in_flight', sa.Integer(), nullable=False),
+        sa.Column('stats', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('worker_id'),
+    )
+    op.create_index(op.f('ix_automation_worker_status_updated_at'), 'automation_worker_status', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_automation_worker_status_updated_at'), table_name='automation_worker_status')
+    op.drop_table('automation_worker_status')
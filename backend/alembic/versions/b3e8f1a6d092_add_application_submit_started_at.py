@@ -0,0 +1,28 @@
+"""Add applications.submit_started_at so automation retries never re-submit
+
+Revision ID: b3e8f1a6d092
+Revises: a7d3e9b1c460
+Create Date: 2026-10-20 14:03:51.617204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8f1a6d092'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e9b1c460'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('applications', sa.Column('submit_started_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('applications', 'submit_started_at')
@@ -0,0 +1,58 @@
+"""Add automation_jobs queue table
+
+Revision ID: b94e1d7f2c08
+Revises: 7d2e9b4c1a63
+Create Date: 2026-10-19 16:40:51.903214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b94e1d7f2c08'
+down_revision: Union[str, Sequence[str], None] = '7d2e9b4c1a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+automation_job_status = sa.Enum('QUEUED', 'RUNNING', 'DONE', 'FAILED', name='automationjobstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'automation_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('status', automation_job_status, nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('locked_by', sa.String(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['application_id'], ['applications.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_automation_jobs_id'), 'automation_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_automation_jobs_application_id'), 'automation_jobs', ['application_id'], unique=False)
+    op.create_index(op.f('ix_automation_jobs_status'), 'automation_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_automation_jobs_run_after'), 'automation_jobs', ['run_after'], unique=False)
+    op.create_index(op.f('ix_automation_jobs_locked_until'), 'automation_jobs', ['locked_until'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_automation_jobs_locked_until'), table_name='automation_jobs')
+    op.drop_index(op.f('ix_automation_jobs_run_after'), table_name='automation_jobs')
+    op.drop_index(op.f('ix_automation_jobs_status'), table_name='automation_jobs')
+    op.drop_index(op.f('ix_automation_jobs_application_id'), table_name='automation_jobs')
+    op.drop_index(op.f('ix_automation_jobs_id'), table_name='automation_jobs')
+    op.drop_table('automation_jobs')
+    automation_job_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,48 @@
+"""Add form_templates table for per-host form template caching
+
+Revision ID: c6f1b8e3a905
+Revises: a3c7e5d9b142
+Create Date: 2026-10-19 20:52:17.603418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1b8e3a905'
+down_revision: Union[str, Sequence[str], None] = 'a3c7e5d9b142'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'form_templates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('host', sa.String(), nullable=False),
+        sa.Column('fingerprint', sa.String(), nullable=False),
+        sa.Column('field_selectors', sa.JSON(), nullable=False),
+        sa.Column('submit_selector', sa.String(), nullable=True),
+        sa.Column('unknown_fields', sa.JSON(), nullable=True),
+        sa.Column('hits', sa.Integer(), nullable=False),
+        sa.Column('stale_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('host', 'fingerprint', name='uq_form_templates_host_fingerprint'),
+    )
+    op.create_index(op.f('ix_form_templates_id'), 'form_templates', ['id'], unique=False)
+    op.create_index(op.f('ix_form_templates_host'), 'form_templates', ['host'], unique=False)
+    op.create_index(op.f('ix_form_templates_last_used_at'), 'form_templates', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_form_templates_last_used_at'), table_name='form_templates')
+    op.drop_index(op.f('ix_form_templates_host'), table_name='form_templates')
+    op.drop_index(op.f('ix_form_templates_id'), table_name='form_templates')
+    op.drop_table('form_templates')
@@ -0,0 +1,46 @@
+"""Add SimHash fingerprint and canonical link to job_postings
+
+Revision ID: c81f5d0e6a27
+Revises: 4b7e2a91c3d5
+Create Date: 2026-10-19 10:03:17.284915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f5d0e6a27'
+down_revision: Union[str, Sequence[str], None] = '4b7e2a91c3d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BANDS = [f'simhash_band_{i}' for i in range(6)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.add_column(sa.Column('simhash', sa.BigInteger(), nullable=True))
+        for band in BANDS:
+            batch_op.add_column(sa.Column(band, sa.Integer(), nullable=True))
+            batch_op.create_index(f'ix_job_postings_{band}', [band], unique=False)
+        batch_op.add_column(sa.Column('canonical_id', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_job_postings_canonical_id', ['canonical_id'], unique=False)
+        batch_op.create_foreign_key(
+            'fk_job_postings_canonical_id', 'job_postings', ['canonical_id'], ['id']
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.drop_constraint('fk_job_postings_canonical_id', type_='foreignkey')
+        batch_op.drop_index('ix_job_postings_canonical_id')
+        batch_op.drop_column('canonical_id')
+        for band in BANDS:
+            batch_op.drop_index(f'ix_job_postings_{band}')
+            batch_op.drop_column(band)
+        batch_op.drop_column('simhash')
@@ -0,0 +1,77 @@
+"""Make swipes and applications unique per user/job and add idempotency keys
+
+Revision ID: d47a3e8c5b16
+Revises: b94e1d7f2c08
+Create Date: 2026-10-19 17:55:13.560472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd47a3e8c5b16'
+down_revision: Union[str, Sequence[str], None] = 'b94e1d7f2c08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Earliest row per (user_id, job_posting_id) survives; later duplicates fold into it
+KEEP_FIRST = """
+    SELECT MIN(id) FROM {table} GROUP BY user_id, job_posting_id
+"""
+
+
+def _dedupe_applications() -> None:
+    rows = op.get_bind().execute(sa.text("""
+        SELECT a.id, (
+            SELECT MIN(b.id) FROM applications b
+            WHERE b.user_id = a.user_id AND b.job_posting_id = a.job_posting_id
+        ) AS keep_id
+        FROM applications a
+    """)).fetchall()
+    duplicates = [(row_id, keep_id) for row_id, keep_id in rows if row_id != keep_id]
+    for duplicate_id, keep_id in duplicates:
+        for child in ('application_status_events', 'automation_jobs'):
+            op.execute(sa.text(
+                f"UPDATE {child} SET application_id = :keep WHERE application_id = :dup"
+            ).bindparams(keep=keep_id, dup=duplicate_id))
+        op.execute(sa.text("DELETE FROM applications WHERE id = :dup").bindparams(dup=duplicate_id))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f"DELETE FROM swipe_actions WHERE id NOT IN ({KEEP_FIRST.format(table='swipe_actions')})")
+    _dedupe_applications()
+
+    with op.batch_alter_table('swipe_actions') as batch_op:
+        batch_op.create_unique_constraint('uq_swipe_actions_user_job', ['user_id', 'job_posting_id'])
+    with op.batch_alter_table('applications') as batch_op:
+        batch_op.create_unique_constraint('uq_applications_user_job', ['user_id', 'job_posting_id'])
+
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('endpoint', sa.String(), nullable=False),
+        sa.Column('response', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_key'),
+    )
+    op.create_index(op.f('ix_idempotency_keys_id'), 'idempotency_keys', ['id'], unique=False)
+    op.create_index(op.f('ix_idempotency_keys_created_at'), 'idempotency_keys', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_idempotency_keys_created_at'), table_name='idempotency_keys')
+    op.drop_index(op.f('ix_idempotency_keys_id'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
+    with op.batch_alter_table('applications') as batch_op:
+        batch_op.drop_constraint('uq_applications_user_job', type_='unique')
+    with op.batch_alter_table('swipe_actions') as batch_op:
+        batch_op.drop_constraint('uq_swipe_actions_user_job', type_='unique')
@@ -0,0 +1,50 @@
+"""Add automation_step_timings table for per-step automation telemetry
+
+Revision ID: d8a2f4c6e317
+Revises: c6f1b8e3a905
+Create Date: 2026-10-19 22:14:41.208377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a2f4c6e317'
+down_revision: Union[str, Sequence[str], None] = 'c6f1b8e3a905'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'automation_step_timings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('host', sa.String(), nullable=True),
+        sa.Column('outcome', sa.String(), nullable=False),
+        sa.Column('step', sa.String(), nullable=False),
+        sa.Column('duration_ms', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['application_id'], ['applications.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_automation_step_timings_id'), 'automation_step_timings', ['id'], unique=False)
+    op.create_index(op.f('ix_automation_step_timings_application_id'), 'automation_step_timings', ['application_id'], unique=False)
+    op.create_index(op.f('ix_automation_step_timings_host'), 'automation_step_timings', ['host'], unique=False)
+    op.create_index(op.f('ix_automation_step_timings_outcome'), 'automation_step_timings', ['outcome'], unique=False)
+    op.create_index(op.f('ix_automation_step_timings_created_at'), 'automation_step_timings', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_automation_step_timings_created_at'), table_name='automation_step_timings')
+    op.drop_index(op.f('ix_automation_step_timings_outcome'), table_name='automation_step_timings')
+    op.drop_index(op.f('ix_automation_step_timings_host'), table_name='automation_step_timings')
+    op.drop_index(op.f('ix_automation_step_timings_application_id'), table_name='automation_step_timings')
+    op.drop_index(op.f('ix_automation_step_timings_id'), table_name='automation_step_timings')
+    op.drop_table('automation_step_timings')
@@ -0,0 +1,32 @@
+"""Add compressed description and excerpt columns to job postings
+
+Revision ID: e5a0c4b8f912
+Revises: c81f5d0e6a27
+Create Date: 2026-10-19 11:26:51.730148
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a0c4b8f912'
+down_revision: Union[str, Sequence[str], None] = 'c81f5d0e6a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_postings', sa.Column('description_zlib', sa.LargeBinary(), nullable=True))
+    op.add_column('job_postings', sa.Column('description_excerpt', sa.Text(), nullable=True))
+    op.add_column('job_postings_archive', sa.Column('description_zlib', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('job_postings_archive', 'description_zlib')
+    op.drop_column('job_postings', 'description_excerpt')
+    op.drop_column('job_postings', 'description_zlib')
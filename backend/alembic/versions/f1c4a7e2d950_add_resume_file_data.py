@@ -0,0 +1,28 @@
+"""Add resumes.file_data so automation workers can read uploads without a shared disk
+
+Revision ID: f1c4a7e2d950
+Revises: d8a2f4c6e317
+Create Date: 2026-10-19 23:41:07.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c4a7e2d950'
+down_revision: Union[str, Sequence[str], None] = 'd8a2f4c6e317'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('file_data', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('resumes', 'file_data')
@@ -0,0 +1,72 @@
+"""Add companies and company_aliases tables, link job postings
+
+Revision ID: f3d9a6e1b274
+Revises: e5a0c4b8f912
+Create Date: 2026-10-19 12:41:08.906215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3d9a6e1b274'
+down_revision: Union[str, Sequence[str], None] = 'e5a0c4b8f912'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'companies',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('name_key', sa.String(), nullable=False),
+        sa.Column('domain', sa.String(), nullable=True),
+        sa.Column('industry', sa.String(), nullable=True),
+        sa.Column('employee_count', sa.Integer(), nullable=True),
+        sa.Column('size_bucket', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_companies_id'), 'companies', ['id'], unique=False)
+    op.create_index(op.f('ix_companies_name_key'), 'companies', ['name_key'], unique=True)
+    op.create_index(op.f('ix_companies_size_bucket'), 'companies', ['size_bucket'], unique=False)
+
+    op.create_table(
+        'company_aliases',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('alias_key', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_company_aliases_id'), 'company_aliases', ['id'], unique=False)
+    op.create_index(op.f('ix_company_aliases_company_id'), 'company_aliases', ['company_id'], unique=False)
+    op.create_index(op.f('ix_company_aliases_alias_key'), 'company_aliases', ['alias_key'], unique=True)
+
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.add_column(sa.Column('company_id', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_job_postings_company_id', ['company_id'], unique=False)
+        batch_op.create_foreign_key('fk_job_postings_company_id', 'companies', ['company_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.drop_constraint('fk_job_postings_company_id', type_='foreignkey')
+        batch_op.drop_index('ix_job_postings_company_id')
+        batch_op.drop_column('company_id')
+
+    op.drop_index(op.f('ix_company_aliases_alias_key'), table_name='company_aliases')
+    op.drop_index(op.f('ix_company_aliases_company_id'), table_name='company_aliases')
+    op.drop_index(op.f('ix_company_aliases_id'), table_name='company_aliases')
+    op.drop_table('company_aliases')
+    op.drop_index(op.f('ix_companies_size_bucket'), table_name='companies')
+    op.drop_index(op.f('ix_companies_name_key'), table_name='companies')
+    op.drop_index(op.f('ix_companies_id'), table_name='companies')
+    op.drop_table('companies')
@@ -1,12 +1,12 @@
-from typing import Any, List, Dict
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from typing import Any, List, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.api import deps
 from app.models import User, Application, ApplicationStatus, ApplicationStatusEvent
 from app.schemas import application as application_schema
-from app.services.automation import resume_automation
+from app.services import automation_queue, automation_timing
 
 router = APIRouter()
 
@@ -30,6 +30,45 @@ def get_applications(
     return current_user.applications
 
 
+@router.get("/queue/stats")
+def get_automation_queue_stats(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),  # Admin only in real app
+) -> Any:
+    """
+    Automation queue depth by status, for monitoring worker throughput.
+    """
+    return automation_queue.queue_stats(db)
+
+
+@router.get("/queue/workers")
+def get_automation_worker_stats(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),  # Admin only in real app
+) -> Any:
+    """
+    Live automation workers with their browser pool (browsers, recycles, acquire
+    wait, RSS), form template, preflight and screenshot stats from the last heartbeat.
+    """
+    return automation_queue.worker_stats(db)
+
+
+@router.get("/automation/timings")
+def get_automation_timings(
+    hours: int = Query(24, ge=1, le=24 * 30),
+    host: Optional[str] = None,
+    outcome: Optional[str] = None,
+    kind: Optional[str] = None,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),  # Admin only in real app
+) -> Any:
+    """
+    Per-step automation timing (count, p50, p95, mean in ms) over the last `hours`,
+    optionally for one host, outcome status or run kind (apply/resume).
+    """
+    return automation_timing.summary(db, hours=hours, host=host, outcome=outcome, kind=kind)
+
+
 @router.patch("/{application_id}/status", response_model=application_schema.Application)
 def update_application_status(
     application_id: int,
@@ -80,13 +119,12 @@ def update_application_status(
 def provide_fields(
     application_id: int,
     request: ProvideFieldsRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Provide missing field values for an application that needs user input.
-    Triggers resume_automation as a background task.
+    Queues a resume automation job for the automation workers.
     """
     application = db.query(Application).filter(
         Application.id == application_id,
@@ -116,10 +154,8 @@ def provide_fields(
         message=f"User provided {len(request.fields)} missing field(s). Resuming automation."
     )
     db.add(event)
+    automation_queue.enqueue(db, application.id, kind="resume", payload={"fields": request.fields})
     db.commit()
     db.refresh(application)
 
-    # Trigger resume in background
-    background_tasks.add_task(resume_automation, application.id, request.fields, db)
-
     return application
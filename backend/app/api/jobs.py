@@ -1,11 +1,20 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import logging
+import os
+import shutil
+import uuid
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, File, Header, UploadFile
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.models import User, JobPosting, SwipeAction, Application, ApplicationStatus
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import User, Company, JobPosting, SwipeAction
 from app.schemas import job as job_schema
-from app.services import job_ingestion, automation
+from app.services import job_ingestion, job_dedup, companies, geo, bulk_import, idempotency, swipes
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -20,6 +29,79 @@ def trigger_ingestion(
     job_ingestion.ingest_jobs(db)
     return {"message": "Ingestion triggered"}
 
+def _run_feed_import(path: str, fmt: str):
+    """Background task: import a spooled feed with its own session, then delete it."""
+    db = SessionLocal()
+    try:
+        bulk_import.import_file(db, path, fmt)
+    except Exception as e:
+        logger.error(f"[Import] Feed import failed for {path}: {e}")
+    finally:
+        db.close()
+        os.remove(path)
+
+@router.post("/import", status_code=202)
+def import_job_feed(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    current_user: User = Depends(deps.get_current_user), # Admin only in real app
+) -> Any:
+    """
+    Bulk import an offline NDJSON or CSV job feed.
+    The upload is spooled to disk and imported in the background.
+    """
+    try:
+        fmt = format or bulk_import.detect_format(file.filename or "")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fmt not in bulk_import.SUPPORTED_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Must be one of: {list(bulk_import.SUPPORTED_FORMATS)}")
+
+    os.makedirs(settings.JOB_IMPORT_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.JOB_IMPORT_UPLOAD_DIR, f"{uuid.uuid4().hex}.{fmt}")
+    with open(path, "wb") as out:
+        shutil.copyfileobj(file.file, out)
+
+    background_tasks.add_task(_run_feed_import, path, fmt)
+    return {"message": "Import started", "format": fmt}
+
+@router.get("/duplicates/stats")
+def get_duplicate_stats(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user), # Admin only in real app
+) -> Any:
+    """
+    Near-duplicate job posting stats for monitoring.
+    """
+    return job_dedup.duplicate_stats(db)
+
+def _live_unswiped_jobs(db: Session, user: User, swiped_ids: List[int]):
+    """Canonical, unexpired postings matching the user's company-size and location prefs that they haven't swiped on yet."""
+    query = db.query(JobPosting).filter(
+        JobPosting.id.notin_(swiped_ids),
+        JobPosting.expired_at.is_(None),
+        JobPosting.dead_at.is_(None),
+        JobPosting.canonical_id.is_(None),
+    )
+
+    size_buckets = companies.size_buckets_for_prefs(
+        user.profile.company_size_prefs if user.profile else None
+    )
+    if size_buckets:
+        # Companies with unknown size stay in the feed rather than silently vanishing
+        query = query.outerjoin(Company, JobPosting.company_id == Company.id).filter(
+            or_(Company.size_bucket.in_(size_buckets), Company.size_bucket.is_(None))
+        )
+
+    if user.profile:
+        location_filter = geo.desired_locations_filter(
+            user.profile.desired_locations, user.profile.remote_preference
+        )
+        if location_filter is not None:
+            query = query.filter(location_filter)
+    return query
+
 @router.get("/recommendations", response_model=List[job_schema.JobPosting])
 def get_recommendations(
     db: Session = Depends(deps.get_db),
@@ -35,14 +117,14 @@ def get_recommendations(
     swiped_ids = db.query(SwipeAction.job_posting_id).filter(SwipeAction.user_id == current_user.id).all()
     swiped_ids = [id[0] for id in swiped_ids]
     
-    jobs = db.query(JobPosting).filter(JobPosting.id.notin_(swiped_ids)).offset(skip).limit(limit).all()
+    jobs = _live_unswiped_jobs(db, current_user, swiped_ids).offset(skip).limit(limit).all()
     
     # If no jobs, try fetching fresh jobs specifically for this user's preferences
     if not jobs:
         # job_ingestion.ingest_jobs(db) # Old generic way
         job_ingestion.fetch_jobs_for_user(db, current_user)
         # Query again
-        jobs = db.query(JobPosting).filter(JobPosting.id.notin_(swiped_ids)).offset(skip).limit(limit).all()
+        jobs = _live_unswiped_jobs(db, current_user, swiped_ids).offset(skip).limit(limit).all()
         
     return jobs
 
@@ -50,31 +132,54 @@ def get_recommendations(
 def swipe_job(
     job_id: int,
     swipe: job_schema.SwipeActionCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ) -> Any:
     """
     Swipe on a job.
+    Repeating a swipe (retry, double tap) returns the existing application
+    without creating anything or launching a second automation.
     """
-    # Record swipe
-    action = SwipeAction(user_id=current_user.id, job_posting_id=job_id, action=swipe.direction)
-    db.add(action)
-    
-    if swipe.direction == "RIGHT":
-        # Create Application
-        application = Application(
-            user_id=current_user.id,
-            job_posting_id=job_id,
-            status=ApplicationStatus.PENDING_AUTOMATION
-        )
-        db.add(application)
-        db.commit()
-        db.refresh(application)
-        
-        # Trigger automation worker
-        background_tasks.add_task(automation.run_automation, application.id, db)
-    else:
-        db.commit()
-        
-    return {"message": "Swipe recorded"}
+    endpoint = f"POST /jobs/{job_id}/swipe"
+    replay = idempotency.stored_response(db, current_user.id, idempotency_key, endpoint)
+    if replay is not None:
+        return replay
+
+    [result] = swipes.record_swipes(db, current_user.id, [(job_id, swipe.direction)])
+    if result["status"] == "invalid":
+        raise HTTPException(status_code=400, detail=result["detail"])
+    if result["status"] == "not_found":
+        raise HTTPException(status_code=404, detail=result["detail"])
+
+    response = {
+        "message": "Swipe recorded" if result["status"] == "recorded" else "Swipe already recorded",
+        "status": result["status"],
+        "application_id": result["application_id"],
+    }
+    return idempotency.commit_with_response(db, current_user.id, idempotency_key, endpoint, response)
+
+@router.post("/swipes", response_model=job_schema.SwipeBatchResult)
+def swipe_jobs_batch(
+    batch: job_schema.SwipeBatchCreate,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+) -> Any:
+    """
+    Record an ordered batch of swipes in one transaction.
+    Right swipes create applications and queue their automations together.
+    Returns one result per submitted swipe, in order.
+    """
+    if len(batch.swipes) > settings.SWIPE_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch too large. At most {settings.SWIPE_BATCH_MAX_SIZE} swipes per request.")
+
+    endpoint = "POST /jobs/swipes"
+    replay = idempotency.stored_response(db, current_user.id, idempotency_key, endpoint)
+    if replay is not None:
+        return replay
+
+    results = swipes.record_swipes(
+        db, current_user.id, [(swipe.job_posting_id, swipe.direction) for swipe in batch.swipes]
+    )
+    return idempotency.commit_with_response(db, current_user.id, idempotency_key, endpoint, {"results": results})
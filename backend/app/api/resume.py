@@ -1,6 +1,6 @@
 from typing import Any
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from sqlalchemy.orm import Session
 
 from app.api import deps
@@ -10,6 +10,7 @@ from app.services import resume_parser, embedding
 import os
 import shutil
 import logging
+from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +57,7 @@ async def upload_resume(
     # Generate embedding vector
     embedding_vector = embedding.generate_embedding(text) if text else []
 
-    # Save file to disk
+    # Save file to disk (and to the DB below, for automation workers on other hosts)
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     file_location = f"{UPLOAD_DIR}/{current_user.id}_{file.filename}"
 
@@ -72,12 +73,14 @@ async def upload_resume(
         resume = Resume(
             user_id=current_user.id,
             file_path=file_location,
+            file_data=content,
             raw_text=text,
             embedding_vector=embedding_vector if embedding_vector else None
         )
         db.add(resume)
     else:
         resume.file_path = file_location
+        resume.file_data = content
         resume.raw_text = text
         resume.embedding_vector = embedding_vector if embedding_vector else None
 
@@ -95,6 +98,14 @@ async def upload_resume(
     }
 
 
+def _content_disposition(filename: str) -> str:
+    """Attachment header for any filename; non-ASCII or quoted names use RFC 5987 like FileResponse."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
 @router.get("/download")
 def download_resume(
     current_user: User = Depends(deps.get_current_user),
@@ -106,8 +117,17 @@ def download_resume(
         raise HTTPException(status_code=404, detail="Resume not found")
 
     file_path = current_user.resume.file_path
+    filename = os.path.basename(file_path)
+
+    if current_user.resume.file_data:
+        media_type = "application/pdf" if filename.lower().endswith(".pdf") else "application/octet-stream"
+        return Response(
+            current_user.resume.file_data,
+            media_type=media_type,
+            headers={"Content-Disposition": _content_disposition(filename)},
+        )
 
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Resume file not found on server")
 
-    return FileResponse(file_path, filename=os.path.basename(file_path))
+    return FileResponse(file_path, filename=filename)
@@ -0,0 +1,309 @@
+"""
+Offline end-to-end automation benchmark.
+
+Serves the labeled ATS fixtures in `app/data/ats_fixtures` from a local HTTP
+server and drives `automation.run_automation` against them at one or more
+concurrency levels. Each level uses a fresh throwaway SQLite database, so it
+starts with cold form templates and page-readiness history. Reports:
+
+- per-step latency (count, p50, p95, mean) from `automation_step_timings`
+- outcome accuracy: final status and status message vs. the labels in
+  `manifest.json`
+- known gaps: fixtures labeled with the outcome automation *should* reach
+  plus a `known_gap` note (e.g. forms inside iframes). They are reported
+  separately and never counted in the accuracy figures, so closing a gap
+  shows up as "now passing" rather than as a regression
+- field-detection accuracy: detected field types and unknown questions vs.
+  the labels, as micro precision/recall and exact-match rate
+- throughput in applications per minute
+
+Nothing leaves the machine. Pages come from 127.0.0.1, the cover letter
+uses the built-in template (OPENAI_API_KEY is ignored), and forms are
+submitted to the local server, which answers with a confirmation page.
+Settings the benchmark overrides are restored when it finishes or fails.
+
+Usage:
+    python -m app.automation_benchmark
+    python -m app.automation_benchmark --concurrency 1 4 8 --rounds 5
+    python -m app.automation_benchmark --fixture greenhouse_simple --fixture lever_style --dry-run
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models import Application, ApplicationStatus, ApplicationStatusEvent, JobPosting, Resume, User, UserProfile
+from app.services import automation, automation_timing, form_preflight, form_templates, screenshots
+from app.services.browser_pool import browser_pool
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "data", "ats_fixtures")
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """Static fixtures; any form POST is drained and redirected to the confirmation page."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.send_response(303)
+        self.send_header("Location", "/confirmation.html")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures() -> ThreadingHTTPServer:
+    """Start the fixture server on a free local port in a daemon thread."""
+    handler = functools.partial(_FixtureHandler, directory=FIXTURE_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_fixtures(names: Optional[List[str]] = None) -> List[dict]:
+    with open(os.path.join(FIXTURE_DIR, "manifest.json")) as f:
+        fixtures = json.load(f)["fixtures"]
+    if names:
+        unknown = set(names) - {fixture["name"] for fixture in fixtures}
+        if unknown:
+            raise SystemExit(f"Unknown fixture(s): {', '.join(sorted(unknown))}")
+        fixtures = [fixture for fixture in fixtures if fixture["name"] in names]
+    return fixtures
+
+
+@contextmanager
+def _patched(target, **values):
+    """Temporarily set attributes on `target`, restoring them even if the run fails."""
+    originals = {name: getattr(target, name) for name in values}
+    for name, value in values.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in originals.items():
+            setattr(target, name, value)
+
+
+def _seed(db, base_url: str, fixtures: List[dict], rounds: int, resume_path: str) -> Dict[int, dict]:
+    """One benchmark user; one posting + application per fixture per round. Returns {application_id: fixture}."""
+    user = User(email="benchmark@example.com", google_sub="benchmark")
+    user.profile = UserProfile(name="Ada Lovelace", phone_number="+1 416 555 0100",
+                               location="Toronto", address="100 Front St W")
+    user.resume = Resume(file_path=resume_path, raw_text="Backend engineer with 6 years of Python and Postgres.")
+    db.add(user)
+    db.flush()
+
+    applications = {}
+    for round_number in range(rounds):
+        for fixture in fixtures:
+            job = JobPosting(title=fixture["name"], company_name="Benchmark Co")
+            application = Application(user=user, job_posting=job, status=ApplicationStatus.PENDING_AUTOMATION)
+            db.add(application)
+            db.flush()
+            job.url = f"{base_url}/{fixture['file']}?application={application.id}"
+            applications[application.id] = fixture
+    db.commit()
+    return applications
+
+
+def _score(db, applications: Dict[int, dict], detections: Dict[int, dict]) -> dict:
+    """Compare each run's outcome and detected fields with its fixture's labels."""
+    outcomes_ok, true_pos, detected_total, expected_total = 0, 0, 0, 0
+    field_runs, field_exact, mismatches = 0, 0, []
+    known_gaps: Dict[str, str] = {}
+    scored = 0
+
+    for application in db.query(Application).filter(Application.id.in_(list(applications))):
+        fixture = applications[application.id]
+        expected = fixture["expected"]
+        last_event = (
+            db.query(ApplicationStatusEvent)
+            .filter(ApplicationStatusEvent.application_id == application.id)
+            .order_by(ApplicationStatusEvent.id.desc())
+            .first()
+        )
+        message = last_event.message if last_event else ""
+        status = application.status.value
+        outcome_ok = status == expected["status"] and expected["message"].lower() in (message or "").lower()
+        found = detections.get(application.id, {"fields": [], "unknown_fields": []})
+
+        if fixture.get("known_gap"):
+            # Labeled with the target outcome; tracked, but kept out of the score
+            if not outcome_ok:
+                known_gaps[fixture["name"]] = f"{fixture['known_gap']} (got {status} with fields {found['fields']})"
+            elif fixture["name"] not in known_gaps:
+                known_gaps[fixture["name"]] = "now passing — remove its known_gap label"
+            continue
+
+        scored += 1
+        if outcome_ok:
+            outcomes_ok += 1
+        else:
+            mismatches.append(f"{fixture['name']}: expected {expected['status']} ('{expected['message']}'), "
+                              f"got {status} ('{message}')")
+
+        if expected["fields"] is None:
+            continue
+        field_runs += 1
+        true_pos += len(set(found["fields"]) & set(expected["fields"]))
+        detected_total += len(found["fields"])
+        expected_total += len(expected["fields"])
+        if found["fields"] == sorted(expected["fields"]) and found["unknown_fields"] == sorted(expected["unknown_fields"]):
+            field_exact += 1
+        else:
+            mismatches.append(f"{fixture['name']}: expected fields {expected['fields']} + {expected['unknown_fields']}, "
+                              f"detected {found['fields']} + {found['unknown_fields']}")
+
+    return {
+        "runs": len(applications),
+        "scored_runs": scored,
+        "outcomes_ok": outcomes_ok,
+        "field_runs": field_runs,
+        "field_exact": field_exact,
+        "field_precision": round(true_pos / detected_total, 3) if detected_total else None,
+        "field_recall": round(true_pos / expected_total, 3) if expected_total else None,
+        "mismatches": sorted(set(mismatches)),
+        "known_gaps": known_gaps,
+    }
+
+
+async def run_level(concurrency: int, fixtures: List[dict], rounds: int, base_url: str, workdir: str,
+                    dry_run: bool) -> dict:
+    """Run every fixture `rounds` times with `concurrency` applications in flight; returns the level's report."""
+    db_path = os.path.join(workdir, f"benchmark_c{concurrency}.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+    db = Session()
+    try:
+        applications = _seed(db, base_url, fixtures, rounds, os.path.join(workdir, "resume.pdf"))
+    finally:
+        db.close()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    detections: Dict[int, dict] = {}
+    templates_before = dict(form_templates.stats)
+
+    def record(application_id: int, detection):
+        detections[application_id] = {
+            "fields": sorted(detection.fields),
+            "unknown_fields": sorted(field["key"] for field in detection.unknown_fields),
+        }
+
+    async def run_one(application_id: int):
+        async with semaphore:
+            session = Session()
+            try:
+                run = automation.run_automation(application_id, session, dry_run=dry_run, on_detect=record)
+                await asyncio.wait_for(run, timeout=settings.AUTOMATION_RUN_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(f"[Benchmark] Application {application_id} timed out")
+            finally:
+                session.close()
+
+    started = time.monotonic()
+    await asyncio.gather(*(run_one(application_id) for application_id in applications))
+    elapsed = time.monotonic() - started
+
+    db = Session()
+    try:
+        report = {
+            "concurrency": concurrency,
+            "elapsed_s": round(elapsed, 2),
+            "applications_per_min": round(len(applications) / elapsed * 60, 1),
+            **_score(db, applications, detections),
+            "template_hits": form_templates.stats["hits"] - templates_before.get("hits", 0),
+            "steps": automation_timing.summary(db),
+        }
+    finally:
+        db.close()
+        engine.dispose()
+    return report
+
+
+def print_report(report: dict):
+    print(f"\n== concurrency {report['concurrency']}: {report['runs']} applications in {report['elapsed_s']}s "
+          f"— {report['applications_per_min']} applications/min")
+    print(f"outcomes:  {report['outcomes_ok']}/{report['scored_runs']} as labeled "
+          f"({report['runs'] - report['scored_runs']} known-gap runs not scored)")
+    precision, recall = (f"{value:.3f}" if value is not None else "n/a"
+                         for value in (report["field_precision"], report["field_recall"]))
+    print(f"fields:    precision {precision}, recall {recall}, "
+          f"exact {report['field_exact']}/{report['field_runs']} runs; template hits {report['template_hits']}")
+    print(f"{'step':<16}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'avg ms':>9}")
+    for step, row in report["steps"].items():
+        print(f"{step:<16}{row['count']:>7}{row['p50_ms']:>9}{row['p95_ms']:>9}{row['avg_ms']:>9}")
+    for mismatch in report["mismatches"]:
+        print(f"  MISMATCH {mismatch}")
+    for name, note in sorted(report["known_gaps"].items()):
+        print(f"  KNOWN GAP {name}: {note}")
+
+
+async def run_benchmark(levels: List[int], rounds: int, fixture_names: Optional[List[str]], dry_run: bool,
+                        browsers: Optional[int] = None) -> List[dict]:
+    fixtures = load_fixtures(fixture_names)
+
+    server = serve_fixtures()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    reports = []
+    with tempfile.TemporaryDirectory(prefix="jinder-benchmark-") as workdir, \
+            _patched(settings, OPENAI_API_KEY=None,  # Template cover letter: no network, deterministic timing
+                     BROWSER_POOL_SIZE=browsers or settings.BROWSER_POOL_SIZE), \
+            _patched(screenshots, SCREENSHOT_DIR=os.path.join(workdir, "screenshots")):
+        with open(os.path.join(workdir, "resume.pdf"), "wb") as f:
+            f.write(b"%PDF-1.4\n% benchmark resume\n")
+
+        await browser_pool.start()
+        try:
+            # Launch the warm browsers before timing anything
+            async with browser_pool.context():
+                pass
+            for concurrency in levels:
+                report = await run_level(concurrency, fixtures, rounds, base_url, workdir, dry_run)
+                print_report(report)
+                reports.append(report)
+        finally:
+            await browser_pool.close()
+            await form_preflight.aclose()
+            server.shutdown()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark browser automation against the offline ATS fixtures.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8],
+                        help="Concurrency levels to run (applications in flight)")
+    parser.add_argument("--rounds", type=int, default=3, help="Times each fixture is applied to per level")
+    parser.add_argument("--fixture", action="append", help="Only run these fixtures (repeatable)")
+    parser.add_argument("--browsers", type=int, default=settings.BROWSER_POOL_SIZE, help="Warm Chromium processes")
+    parser.add_argument("--dry-run", action="store_true", help="Fill forms but don't submit them")
+    parser.add_argument("--json", help="Also write the reports to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    reports = asyncio.run(run_benchmark(args.concurrency, args.rounds, args.fixture, args.dry_run, args.browsers))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
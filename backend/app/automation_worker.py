@@ -0,0 +1,225 @@
+"""
+Automation worker: claims queued automation jobs and runs them.
+
+Usage:
+    python -m app.automation_worker
+    python -m app.automation_worker --concurrency 32
+
+Each worker runs up to N automations concurrently as asyncio tasks on one
+event loop, sharing a small pool of warm Chromium browsers (one isolated
+context per application). An automation spends nearly all its time waiting
+on the browser or the LLM, so one process handles dozens at once. Every run
+is bounded by `AUTOMATION_RUN_TIMEOUT_SECONDS`; on shutdown in-flight runs
+get `AUTOMATION_SHUTDOWN_GRACE_SECONDS` to finish, then are cancelled and
+their jobs released back to the queue.
+
+A heartbeat task keeps the leases of in-flight jobs alive, reports the
+worker's browser pool and cache stats (served by `/applications/queue/workers`),
+and the main loop periodically reaps leases left behind by dead workers. Screenshots live on
+the worker's own disk, so the worker also prunes them on an interval. Queue bookkeeping
+runs in threads so it never stalls the loop. Scale throughput further by
+starting more workers.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+import uuid
+from typing import Dict, List
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models import AutomationJob
+from app.services import automation, automation_queue, form_preflight, form_templates, screenshots
+from app.services.browser_pool import browser_pool
+
+logger = logging.getLogger(__name__)
+
+# Automation sessions keep loaded rows after commit, so an application never
+# holds a connection (or an open transaction) across a browser await.
+AutomationSession = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+class AutomationWorker:
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.stopping: asyncio.Event = None
+        self._in_flight: Dict[int, asyncio.Task] = {}
+        self._last_reap = 0.0
+        self._last_prune = 0.0
+
+    async def _execute(self, job_id: int):
+        """Run one claimed job with its own session, bounded by the per-run timeout."""
+        db = AutomationSession()
+        try:
+            job = db.query(AutomationJob).filter(AutomationJob.id == job_id).first()
+            if job is None:
+                return
+            if not automation_queue.ready_to_run(db, job):
+                return
+            db.commit()  # End the read transaction; the session must not pin a connection while awaiting
+            logger.info(f"[Worker] Running job {job.id} ({job.kind}) for application {job.application_id}")
+            if job.kind == "resume":
+                run = automation.resume_automation(job.application_id, (job.payload or {}).get("fields", {}), db)
+            else:
+                run = automation.run_automation(job.application_id, db)
+            try:
+                await asyncio.wait_for(run, timeout=settings.AUTOMATION_RUN_TIMEOUT_SECONDS)
+                db.refresh(job)
+                automation_queue.complete(db, job)
+            except asyncio.TimeoutError:
+                db.rollback()
+                automation_queue.fail(db, job, f"Timed out after {settings.AUTOMATION_RUN_TIMEOUT_SECONDS}s")
+            except asyncio.CancelledError:
+                db.rollback()
+                automation_queue.release(db, job)
+                logger.warning(f"[Worker] Job {job_id} cancelled — released back to the queue")
+                raise
+            except Exception as e:
+                db.rollback()
+                automation_queue.fail(db, job, f"{type(e).__name__}: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[Worker] Job {job_id} crashed: {e}")
+        finally:
+            db.close()
+            self._in_flight.pop(job_id, None)
+
+    def _heartbeat(self, job_ids: List[int], stats: dict):
+        db = SessionLocal()
+        try:
+            automation_queue.heartbeat(db, self.worker_id, job_ids)
+            automation_queue.report_worker(db, self.worker_id, len(job_ids), stats)
+        finally:
+            db.close()
+
+    def _stats(self) -> dict:
+        return {
+            "browser_pool": browser_pool.stats(),
+            "form_templates": dict(form_templates.stats),
+            "preflight": dict(form_preflight.stats),
+            "screenshots": dict(screenshots.stats),
+        }
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(settings.AUTOMATION_HEARTBEAT_SECONDS)
+            job_ids = list(self._in_flight)
+            stats = self._stats()
+            if job_ids:
+                logger.info(f"[Worker] {len(job_ids)} in flight; {stats}")
+            try:
+                await asyncio.to_thread(self._heartbeat, job_ids, stats)
+            except Exception as e:
+                logger.error(f"[Worker] Heartbeat failed: {e}")
+
+    def _remove_status(self):
+        db = SessionLocal()
+        try:
+            automation_queue.remove_worker(db, self.worker_id)
+        finally:
+            db.close()
+
+    def _poll(self, free: int) -> List[int]:
+        """Reap expired leases (periodically) and claim up to `free` jobs."""
+        db = SessionLocal()
+        try:
+            if time.monotonic() - self._last_reap >= settings.AUTOMATION_HEARTBEAT_SECONDS:
+                automation_queue.reap_expired_leases(db)
+                self._last_reap = time.monotonic()
+            return automation_queue.claim_jobs(db, self.worker_id, free)
+        finally:
+            db.close()
+
+    def _prune_screenshots(self):
+        db = SessionLocal()
+        try:
+            screenshots.prune_screenshots(db)
+        finally:
+            db.close()
+
+    async def _maybe_prune(self):
+        if time.monotonic() - self._last_prune < settings.SCREENSHOT_PRUNE_INTERVAL_HOURS * 3600:
+            return
+        self._last_prune = time.monotonic()
+        try:
+            await asyncio.to_thread(self._prune_screenshots)
+        except Exception as e:
+            logger.error(f"[Worker] Screenshot pruning failed: {e}")
+
+    async def _drain(self):
+        tasks = list(self._in_flight.values())
+        if not tasks:
+            return
+        logger.info(f"[Worker] Stopping — waiting up to {settings.AUTOMATION_SHUTDOWN_GRACE_SECONDS}s "
+                    f"for {len(tasks)} in-flight job(s)")
+        _, pending = await asyncio.wait(tasks, timeout=settings.AUTOMATION_SHUTDOWN_GRACE_SECONDS)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def run(self):
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        logger.info(f"[Worker] {self.worker_id} started (concurrency={self.concurrency})")
+        await browser_pool.start()
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        try:
+            while not self.stopping.is_set():
+                free = self.concurrency - len(self._in_flight)
+                try:
+                    claimed = await asyncio.to_thread(self._poll, free)
+                except Exception as e:
+                    logger.error(f"[Worker] Queue poll failed: {e}")
+                    claimed = []
+
+                for job_id in claimed:
+                    self._in_flight[job_id] = asyncio.create_task(self._execute(job_id))
+
+                await self._maybe_prune()
+
+                if not claimed:
+                    try:
+                        await asyncio.wait_for(self.stopping.wait(), timeout=settings.AUTOMATION_POLL_INTERVAL)
+                    except asyncio.TimeoutError:
+                        pass
+
+            await self._drain()
+        finally:
+            heartbeat_task.cancel()
+            await browser_pool.close()
+            await form_preflight.aclose()
+            try:
+                await asyncio.to_thread(self._remove_status)
+            except Exception as e:
+                logger.error(f"[Worker] Could not remove worker status: {e}")
+        logger.info(f"[Worker] {self.worker_id} stopped")
+
+    def stop(self, *_):
+        self.stopping.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued browser automations.")
+    parser.add_argument("--concurrency", type=int, default=settings.AUTOMATION_WORKER_CONCURRENCY,
+                        help="Automations to run at once in this process")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    asyncio.run(AutomationWorker(args.concurrency).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -28,9 +28,90 @@ class Settings(BaseSettings):
 
     # External APIs
     THEIRSTACK_API_KEY: Optional[str] = None
+    THEIRSTACK_CONNECT_TIMEOUT: float = 5.0
+    THEIRSTACK_READ_TIMEOUT: float = 30.0
+    THEIRSTACK_MAX_CONNECTIONS: int = 10
+    THEIRSTACK_MAX_RETRIES: int = 3
+    THEIRSTACK_BACKOFF_BASE: float = 0.5  # seconds, doubled per attempt
+    THEIRSTACK_MAX_BACKOFF: float = 30.0
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-small"
 
+    # Job retention — postings older than either limit are archived
+    JOB_TTL_DAYS: int = 14  # days since we fetched the posting
+    JOB_MAX_POSTING_AGE_DAYS: int = 45  # days since the employer posted it
+    JOB_ARCHIVE_BATCH_SIZE: int = 500
+
+    # Job description storage
+    JOB_DESCRIPTION_EXCERPT_CHARS: int = 3000
+    JOB_DESCRIPTION_ZLIB_LEVEL: int = 6
+
+    # Near-duplicate detection — max SimHash bit difference (<= 5 keeps band lookup exact)
+    JOB_DEDUP_MAX_HAMMING: int = 5
+
+    # Bulk job feed import
+    JOB_IMPORT_BATCH_SIZE: int = 1000
+    JOB_IMPORT_COMPANY_CACHE_SIZE: int = 100000
+    JOB_IMPORT_UPLOAD_DIR: str = "uploads/imports"
+
+    # Location matching — offline gazetteer + geohash grid cells
+    GEO_DEFAULT_RADIUS_KM: float = 50.0  # radius around a desired city when none is given
+    GEO_CELL_PRECISION: int = 4  # geohash chars in the indexed cell column (~39km x 20km)
+    GEO_MAX_CELLS: int = 64  # larger radii fall back to the latitude index
+
+    # Dead-link validation for job posting URLs
+    LINK_CHECK_INTERVAL_HOURS: int = 12  # recheck a posting at most this often
+    LINK_CHECK_DEAD_RECHECK_HOURS: int = 72  # recheck dead postings this often so false positives clear
+    LINK_CHECK_BATCH_SIZE: int = 500  # postings per validation run
+    LINK_CHECK_CONCURRENCY: int = 20
+    LINK_CHECK_PER_HOST_CONCURRENCY: int = 2
+    LINK_CHECK_PER_HOST_INTERVAL: float = 0.5  # seconds between requests to one host
+    LINK_CHECK_CONNECT_TIMEOUT: float = 5.0
+    LINK_CHECK_TIMEOUT: float = 15.0
+    LINK_CHECK_MAX_BYTES: int = 262144  # body prefix scanned for closed-posting markers
+
+    # Automation queue / workers (python -m app.automation_worker)
+    AUTOMATION_WORKER_CONCURRENCY: int = 24  # concurrent automations (asyncio tasks) per worker process
+    AUTOMATION_POLL_INTERVAL: float = 2.0  # seconds between queue polls when idle
+    AUTOMATION_LEASE_SECONDS: int = 300  # a claimed job is reaped if not heartbeated within this
+    AUTOMATION_HEARTBEAT_SECONDS: int = 30
+    AUTOMATION_MAX_ATTEMPTS: int = 3
+    AUTOMATION_RETRY_DELAY_SECONDS: int = 60  # doubled per attempt
+    AUTOMATION_RUN_TIMEOUT_SECONDS: int = 180  # one application's run is cancelled after this
+    AUTOMATION_SHUTDOWN_GRACE_SECONDS: int = 30  # in-flight runs get this long to finish on SIGTERM
+    BROWSER_POOL_SIZE: int = 2  # warm Chromium processes per worker; applications get contexts on them
+    BROWSER_MAX_USES: int = 50  # applications per warm Chromium before it is relaunched
+    BROWSER_MAX_RSS_MB: int = 1024  # relaunch a browser once Chromium memory per browser exceeds this
+    BROWSER_RSS_SAMPLE_SECONDS: int = 30  # how often the pool re-measures Chromium memory (walks /proc)
+    AUTOMATION_BLOCKED_RESOURCE_TYPES: list[str] = ["image", "media", "font"]  # aborted on automation pages
+    AUTOMATION_BLOCK_TRACKERS: bool = True  # abort analytics/ad/tracker domains
+    FORM_TEMPLATE_MAX_PER_HOST: int = 50  # cached form layouts per ATS host (least recently used evicted)
+    AUTOMATION_PREFLIGHT_ENABLED: bool = True  # fetch the page over HTTP first; skip the browser for closed/captcha/no-form pages
+    AUTOMATION_PREFLIGHT_TIMEOUT: float = 10.0
+    AUTOMATION_PREFLIGHT_MAX_BYTES: int = 2000000  # HTML prefix parsed by the pre-flight
+    PAGE_READY_DEFAULT_TIMEOUT_MS: int = 10000  # readiness wait for hosts with no history
+    PAGE_READY_MIN_TIMEOUT_MS: int = 3000
+    PAGE_READY_MAX_TIMEOUT_MS: int = 20000
+    PAGE_READY_TIMEOUT_FACTOR: float = 3.0  # learned timeout = host's average ready time x this
+    PAGE_READY_EWMA_ALPHA: float = 0.3  # weight of the newest sample in the per-host average
+    SUBMIT_CONFIRM_TIMEOUT_MS: int = 10000  # wait for confirmation/navigation after clicking submit
+    SCREENSHOT_FULL_PAGE: bool = False  # viewport-only capture unless set
+    SCREENSHOT_FORMAT: str = "jpeg"  # jpeg, png, or webp (webp needs Pillow)
+    SCREENSHOT_QUALITY: int = 70  # jpeg/webp quality, 0-100
+    SCREENSHOT_UNREFERENCED_HOURS: int = 24  # superseded intermediate shots are deleted after this
+    SCREENSHOT_RETENTION_DAYS: int = 30  # every screenshot is deleted after this
+    SCREENSHOT_PRUNE_INTERVAL_HOURS: float = 6  # how often each automation worker prunes its own screenshot dir
+    AUTOMATION_TIMING_RETENTION_DAYS: int = 30  # per-step run timings are purged after this
+
+    # Periodic-job worker (python -m app.worker) — one leader cluster-wide via a DB lease
+    SCHEDULER_LEASE_SECONDS: int = 60  # a leader that stops renewing is replaced after this
+    SCHEDULER_RENEW_SECONDS: int = 20
+    GMAIL_POLL_INTERVAL_MINUTES: int = 15
+
+    # Batch swipes
+    SWIPE_BATCH_MAX_SIZE: int = 200
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24  # stored responses are replayed within this window
+
     # Gmail OAuth
     GMAIL_REDIRECT_URI: Optional[str] = None
     GMAIL_SCOPES: list[str] = ["https://www.googleapis.com/auth/gmail.readonly"]
@@ -0,0 +1,38 @@
+"""
+Bulk job feed import CLI.
+
+Usage:
+    python -m app.import_jobs feed.ndjson
+    python -m app.import_jobs dump.csv --batch-size 5000
+    python -m app.import_jobs export.txt --format ndjson
+"""
+
+import argparse
+import logging
+
+from app.db.base import Base
+from app.db.session import engine, SessionLocal
+from app.services import bulk_import
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import an offline job feed (NDJSON or CSV).")
+    parser.add_argument("path", help="Path to the feed file")
+    parser.add_argument("--format", choices=bulk_import.SUPPORTED_FORMATS,
+                        help="Feed format (detected from the extension if omitted)")
+    parser.add_argument("--batch-size", type=int, help="Rows per INSERT batch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        stats = bulk_import.import_file(db, args.path, args.format, args.batch_size)
+    finally:
+        db.close()
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,60 +11,27 @@ from slowapi.errors import RateLimitExceeded
 from app.core.config import settings
 from app.api.api import api_router
 from app.db.base import Base
-from app.db.session import engine, SessionLocal
+from app.db.session import engine
 
 logger = logging.getLogger(__name__)
 
 # Rate limiter — keyed by client IP
 limiter = Limiter(key_func=get_remote_address, default_limits=[settings.RATE_LIMIT_PER_USER])
 
-# APScheduler for periodic Gmail polling
-scheduler = None
-
-
-def poll_all_users_job():
-    """Background job: poll Gmail for all connected users."""
-    from app.services.gmail import poll_all_users
-    db = SessionLocal()
-    try:
-        poll_all_users(db)
-    except Exception as e:
-        logger.error(f"[Scheduler] Gmail poll error: {e}")
-    finally:
-        db.close()
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """App lifespan: start scheduler on startup, shut down on exit."""
-    global scheduler
-
+    """App lifespan: create tables on startup, close pooled clients on exit.
+    Periodic jobs run in the separate worker process (python -m app.worker)."""
     # Create tables
     Base.metadata.create_all(bind=engine)
 
-    # Start APScheduler
-    try:
-        from apscheduler.schedulers.background import BackgroundScheduler
-        scheduler = BackgroundScheduler()
-        scheduler.add_job(
-            poll_all_users_job,
-            "interval",
-            minutes=15,
-            id="gmail_poll",
-            name="Poll Gmail for all connected users",
-            replace_existing=True,
-        )
-        scheduler.start()
-        logger.info("[Scheduler] Started — Gmail polling every 15 minutes")
-    except Exception as e:
-        logger.warning(f"[Scheduler] Failed to start: {e}")
-
     yield
 
     # Shutdown
-    if scheduler:
-        scheduler.shutdown(wait=False)
-        logger.info("[Scheduler] Shut down")
+    from app.services.theirstack import theirstack_service
+    theirstack_service.close()
+    await theirstack_service.aclose()
 
 
 app = FastAPI(
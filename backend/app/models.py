@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Float, Enum, Text, ARRAY, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, ForeignKey, DateTime, Float, Enum, Text, ARRAY, JSON, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.db.base import Base
 import enum
@@ -21,6 +21,12 @@ class ApplicationStatus(str, enum.Enum):
     MANUAL_INTERVENTION_REQUIRED = "MANUAL_INTERVENTION_REQUIRED"
     USER_INPUT_NEEDED = "USER_INPUT_NEEDED"
 
+class AutomationJobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
 class User(Base):
     __tablename__ = "users"
 
@@ -69,12 +75,38 @@ class Resume(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
     file_path = Column(String, nullable=False)
+    file_data = deferred(Column(LargeBinary))  # Uploaded file bytes — automation workers don't share the API's disk
     raw_text = Column(Text)
     embedding_vector = Column(JSON)  # Stores 1536-dim float array as JSON (migrate to pgvector Vector(1536) with Postgres)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="resume")
 
+class Company(Base):
+    __tablename__ = "companies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)  # Display name as first seen
+    name_key = Column(String, unique=True, index=True, nullable=False)  # Normalized, legal suffixes stripped
+    domain = Column(String)
+    industry = Column(String)
+    employee_count = Column(Integer)
+    size_bucket = Column(String, index=True)  # STARTUP, SMALL, MID, ENTERPRISE
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    aliases = relationship("CompanyAlias", back_populates="company")
+    job_postings = relationship("JobPosting", back_populates="company")
+
+class CompanyAlias(Base):
+    __tablename__ = "company_aliases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    alias_key = Column(String, unique=True, index=True, nullable=False)
+
+    company = relationship("Company", back_populates="aliases")
+
 class JobPosting(Base):
     __tablename__ = "job_postings"
 
@@ -82,18 +114,71 @@ class JobPosting(Base):
     external_id = Column(String, unique=True, index=True)
     title = Column(String, nullable=False)
     company_name = Column(String, nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id"), index=True)
     location = Column(String)
     salary_range = Column(String)
-    description = Column(Text)
+    description_raw = Column("description", Text)  # Legacy uncompressed text; new rows use description_zlib
+    description_zlib = Column(LargeBinary)  # Cleaned description, zlib-compressed
+    description_excerpt = Column(Text)  # Plain-text excerpt for embeddings and prompts
     employment_type = Column(String)
     url = Column(String)
-    fetched_at = Column(DateTime(timezone=True), server_default=func.now())
+    posted_at = Column(DateTime(timezone=True))  # date_posted reported by TheirStack
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    expired_at = Column(DateTime(timezone=True), index=True)  # Set when past TTL but still referenced
+    url_checked_at = Column(DateTime(timezone=True), index=True)  # Last dead-link validation
+    url_status = Column(Integer)  # HTTP status seen at last validation
+    dead_at = Column(DateTime(timezone=True), index=True)  # Set when the posting URL is closed/gone
+    # Near-duplicate detection: 64-bit SimHash split into six indexed bands
+    simhash = Column(BigInteger)
+    simhash_band_0 = Column(Integer, index=True)
+    simhash_band_1 = Column(Integer, index=True)
+    simhash_band_2 = Column(Integer, index=True)
+    simhash_band_3 = Column(Integer, index=True)
+    simhash_band_4 = Column(Integer, index=True)
+    simhash_band_5 = Column(Integer, index=True)
+    canonical_id = Column(Integer, ForeignKey("job_postings.id"), index=True)  # Set on duplicates
+    # Location resolved against the offline gazetteer (coordinates only for city matches)
+    latitude = Column(Float, index=True)
+    longitude = Column(Float)
+    geohash = Column(String)
+    geo_cell = Column(String, index=True)  # Geohash prefix used for radius lookups
+    region_code = Column(String, index=True)  # ISO 3166-2, e.g. US-CA
+    country_code = Column(String, index=True)  # ISO 3166-1 alpha-2
+    is_remote = Column(Boolean, index=True)  # NULL until the location has been resolved
 
     applications = relationship("Application", back_populates="job_posting")
     swipes = relationship("SwipeAction", back_populates="job_posting")
+    company = relationship("Company", back_populates="job_postings")
+
+    @property
+    def description(self):
+        """Full cleaned description, decompressed on access."""
+        if self.description_zlib:
+            from app.services.job_text import decompress_text  # job_text imports this module
+            return decompress_text(self.description_zlib)
+        return self.description_raw
+
+class ArchivedJobPosting(Base):
+    """Cold storage for expired job postings no application or swipe refers to."""
+    __tablename__ = "job_postings_archive"
+
+    id = Column(Integer, primary_key=True)  # Same id the posting had in job_postings
+    external_id = Column(String, index=True)
+    title = Column(String, nullable=False)
+    company_name = Column(String, nullable=False)
+    location = Column(String)
+    salary_range = Column(String)
+    description = Column(Text)
+    description_zlib = Column(LargeBinary)
+    employment_type = Column(String)
+    url = Column(String)
+    posted_at = Column(DateTime(timezone=True))
+    fetched_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class SwipeAction(Base):
     __tablename__ = "swipe_actions"
+    __table_args__ = (UniqueConstraint("user_id", "job_posting_id", name="uq_swipe_actions_user_job"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -106,6 +191,7 @@ class SwipeAction(Base):
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (UniqueConstraint("user_id", "job_posting_id", name="uq_applications_user_job"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -113,7 +199,8 @@ class Application(Base):
     status = Column(Enum(ApplicationStatus), default=ApplicationStatus.PENDING_AUTOMATION)
     screenshot_path = Column(String)
     cover_letter_text = Column(Text)
-    automation_state = Column(JSON)  # Stores filled_fields, missing_fields, page_url for resume
+    automation_state = Column(JSON)  # Stores filled_fields, missing_fields, page_url, browser session and field snapshot for resume
+    submit_started_at = Column(DateTime(timezone=True))  # Set just before the submit click; a retry never re-submits
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -131,3 +218,93 @@ class ApplicationStatusEvent(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     application = relationship("Application", back_populates="events")
+
+class AutomationJob(Base):
+    """Durable queue entry for browser automation, claimed by automation workers."""
+    __tablename__ = "automation_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False, index=True)
+    kind = Column(String, nullable=False, default="apply")  # apply, resume
+    payload = Column(JSON)  # e.g. user-provided fields for a resume
+    status = Column(Enum(AutomationJobStatus), nullable=False, default=AutomationJobStatus.QUEUED, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # Retry backoff
+    locked_by = Column(String)  # Worker id holding the lease
+    locked_until = Column(DateTime(timezone=True), index=True)  # Lease expiry, extended by heartbeats
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    application = relationship("Application")
+
+class AutomationWorkerStatus(Base):
+    """Latest in-process stats (browser pool, caches) reported by each automation worker's heartbeat."""
+    __tablename__ = "automation_worker_status"
+
+    worker_id = Column(String, primary_key=True)
+    in_flight = Column(Integer, nullable=False, default=0)
+    stats = Column(JSON)  # { browser_pool: {...}, form_templates: {...}, preflight: {...}, screenshots: {...} }
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+class IdempotencyKey(Base):
+    """Stored response for a client-supplied Idempotency-Key, replayed on retries."""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String, nullable=False)
+    endpoint = Column(String, nullable=False)
+    response = Column(JSON)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+class SchedulerLease(Base):
+    """Leader-election lease: only the holder of a named lease runs its periodic jobs."""
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    acquired_at = Column(DateTime(timezone=True))
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+class PageLoadStat(Base):
+    """Per-host page readiness history; sizes the adaptive readiness timeout for that host."""
+    __tablename__ = "page_load_stats"
+
+    host = Column(String, primary_key=True)
+    samples = Column(Integer, nullable=False, default=0)
+    ready_ms_avg = Column(Float, nullable=False, default=0)  # Exponential moving average of ready time
+    last_ready_ms = Column(Integer)
+    timeouts = Column(Integer, nullable=False, default=0)  # Waits that hit the timeout before a ready signal
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class FormTemplate(Base):
+    """Resolved selectors for one application-form layout on an ATS host, reused to skip detection."""
+    __tablename__ = "form_templates"
+    __table_args__ = (UniqueConstraint("host", "fingerprint", name="uq_form_templates_host_fingerprint"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    host = Column(String, nullable=False, index=True)
+    fingerprint = Column(String, nullable=False)  # Hash of the form's visible input/button signature
+    field_selectors = Column(JSON, nullable=False)  # { field_type: css selector }
+    submit_selector = Column(String)
+    unknown_fields = Column(JSON)  # [{ key, label, type }] the bot can't fill on this form
+    hits = Column(Integer, nullable=False, default=0)
+    stale_count = Column(Integer, nullable=False, default=0)  # Fingerprint matched but a selector no longer resolved
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+class AutomationStepTiming(Base):
+    """Time spent in one step of one automation run, tagged by host and the run's outcome."""
+    __tablename__ = "automation_step_timings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False, index=True)
+    kind = Column(String, nullable=False)  # apply, resume
+    host = Column(String, index=True)
+    outcome = Column(String, nullable=False, index=True)  # Application status after the run, or error/cancelled
+    step = Column(String, nullable=False)  # cover_letter, preflight, browser_context, navigate, ..., total
+    duration_ms = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
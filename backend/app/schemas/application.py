@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
 from app.models import ApplicationStatus
 from app.schemas.job import JobPosting
@@ -23,5 +23,13 @@ class Application(BaseModel):
     updated_at: Optional[datetime] = None
     events: List[ApplicationStatusEvent] = []
 
+    @field_validator("automation_state")
+    @classmethod
+    def hide_browser_state(cls, state: Optional[dict]) -> Optional[dict]:
+        # The saved browser session and selectors are only for the resume worker
+        if not state:
+            return state
+        return {k: v for k, v in state.items() if k not in ("browser_state", "form_snapshot")}
+
     class Config:
         from_attributes = True
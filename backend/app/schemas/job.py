@@ -25,3 +25,16 @@ class JobPosting(JobPostingBase):
 class SwipeActionCreate(BaseModel):
     job_posting_id: int
     direction: str # LEFT, RIGHT
+
+class SwipeBatchCreate(BaseModel):
+    swipes: List[SwipeActionCreate]  # Applied in order
+
+class SwipeResult(BaseModel):
+    job_posting_id: int
+    direction: str
+    status: str  # recorded, duplicate, invalid, not_found
+    application_id: Optional[int] = None
+    detail: Optional[str] = None
+
+class SwipeBatchResult(BaseModel):
+    results: List[SwipeResult]
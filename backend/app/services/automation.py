@@ -1,7 +1,9 @@
 """
 Playwright-based browser automation engine for job applications.
 
-Launches headless Chromium, navigates to job posting URLs, detects form fields,
+Runs on asyncio with Playwright's async API so one worker process drives
+many applications at once. Borrows a warm headless Chromium from the
+browser pool, navigates to job posting URLs, detects form fields,
 fills them from user profile data, uploads resumes, and captures screenshots.
 
 Supports pause-and-resume: when the bot can't fill a field, it saves progress
@@ -9,20 +11,22 @@ and marks the application as USER_INPUT_NEEDED. The user provides missing values
 via the API, and the bot resumes with all fields filled.
 """
 
-import os
+import asyncio
 import logging
-from typing import Tuple, Dict, List
-from datetime import datetime
+import time
+from typing import Callable, NamedTuple, Optional, Tuple, Dict, List
+from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import Locator, TimeoutError as PlaywrightTimeout
 
+from app.core.config import settings
 from app.models import Application, ApplicationStatus, ApplicationStatusEvent
-from app.services import cover_letter, form_detector
+from app.services import automation_timing, cover_letter, form_detector, job_dedup, form_preflight, form_templates, job_text, page_readiness, resource_policy, resume_files, screenshots
+from app.services.browser_pool import browser_pool
 
 logger = logging.getLogger(__name__)
 
-SCREENSHOT_DIR = "uploads/screenshots"
 # dry_run=True fills forms but does NOT click Submit (safe for development)
 DRY_RUN = True
 
@@ -33,17 +37,33 @@ KNOWN_FIELD_TYPES = {
 }
 
 
-def run_automation(application_id: int, db: Session):
+async def run_automation(application_id: int, db: Session, dry_run: Optional[bool] = None,
+                         on_detect: Optional[Callable[[int, "_FormDetection"], None]] = None):
     """
-    Main automation entry point. Called as a BackgroundTask from the swipe endpoint.
+    Main automation entry point. Awaited by an automation worker for a queued job,
+    which bounds it with a timeout and may cancel it.
+
+    `dry_run` overrides the module-level DRY_RUN for this run; `on_detect` is
+    called with (application_id, detection) once the form has been detected.
 
     1. Loads application, user profile, resume, job posting
-    2. Generates cover letter
-    3. Launches Playwright, navigates to job URL
-    4. Detects and fills form fields
-    5. If missing fields → saves state, sets USER_INPUT_NEEDED
-    6. If all filled → captures screenshot, updates status
+    2. Pre-flights the job URL over plain HTTP; closed, CAPTCHA and
+       form-less pages are settled without a browser
+    3. Starts generating the cover letter in the background
+    4. Opens a pooled browser context, navigates to job URL
+    5. Detects form fields; waits for the cover letter only if the form has
+       a cover letter field (otherwise it is cancelled), then fills them
+    6. If missing fields → saves state, sets USER_INPUT_NEEDED
+    7. If all filled → captures screenshot, updates status
+
+    Each step's duration is recorded in `automation_step_timings`.
     """
+    with automation_timing.track(db, application_id, "apply"):
+        await _run_automation(application_id, db, dry_run, on_detect)
+
+
+async def _run_automation(application_id: int, db: Session, dry_run: Optional[bool],
+                          on_detect: Optional[Callable]):
     logger.info(f"[Automation] Starting for application {application_id}")
 
     application = db.query(Application).filter(Application.id == application_id).first()
@@ -56,9 +76,21 @@ def run_automation(application_id: int, db: Session):
     profile = user.profile
     resume = user.resume
 
-    # --- Step 1: Generate cover letter ---
+    # Link validator already found the posting closed — don't spend an LLM call or a browser on it
+    if job_posting.dead_at:
+        _mark_status(db, application, ApplicationStatus.FAILED,
+                     f"Job posting is no longer available: {job_posting.url}")
+        return
+
+    # --- Step 1: Check if job has a URL ---
+    if not job_posting.url:
+        _mark_status(db, application, ApplicationStatus.MANUAL_INTERVENTION_REQUIRED,
+                     "No job URL available. Please apply manually.")
+        return
+
+    # Cover letter inputs are read now, while the session is on this task
     resume_text = resume.raw_text if resume else "No resume uploaded"
-    job_desc = job_posting.description or "No description available"
+    job_desc = job_text.description_excerpt(job_posting) or "No description available"
 
     user_profile_dict = None
     if profile:
@@ -68,20 +100,37 @@ def run_automation(application_id: int, db: Session):
             "field_of_work": profile.field_of_work,
         }
 
-    letter = cover_letter.generate_cover_letter(resume_text, job_desc, user_profile_dict)
-    application.cover_letter_text = letter
-    db.commit()
-    logger.info(f"[Automation] Cover letter generated ({len(letter)} chars)")
+    db.commit()  # End the read transaction before slow awaits
+
+    # --- Step 2: Browserless pre-flight ---
+    if settings.AUTOMATION_PREFLIGHT_ENABLED:
+        with automation_timing.step("preflight"):
+            check = await form_preflight.preflight(job_posting.url)
+        if check.verdict == "closed":
+            job_posting.dead_at = job_posting.url_checked_at = datetime.now(timezone.utc)
+            job_posting.url_status = check.status_code
+            db.flush()
+            job_dedup.release_duplicates(db, [job_posting.id])
+            _mark_status(db, application, ApplicationStatus.FAILED,
+                         f"Job posting is no longer available: {job_posting.url}")
+            return
+        if check.verdict == "captcha":
+            _mark_status(db, application, ApplicationStatus.MANUAL_INTERVENTION_REQUIRED,
+                         f"CAPTCHA detected. Please apply manually at: {job_posting.url}")
+            return
+        if check.verdict == "no_form":
+            _mark_status(db, application, ApplicationStatus.MANUAL_INTERVENTION_REQUIRED,
+                         f"No application form detected. Apply manually at: {job_posting.url}")
+            return
 
-    # --- Step 2: Check if job has a URL ---
-    if not job_posting.url:
-        _mark_status(db, application, ApplicationStatus.MANUAL_INTERVENTION_REQUIRED,
-                     "No job URL available. Please apply manually.")
-        return
+    # --- Step 3: Cover letter, generated while the browser launches and navigates ---
+    letter_task = asyncio.create_task(
+        cover_letter.generate_cover_letter_async(resume_text, job_desc, user_profile_dict)
+    )
 
-    # --- Step 3: Launch Playwright ---
+    # --- Step 4: Launch Playwright ---
     try:
-        _run_browser_automation(application, db, profile, resume, letter)
+        await _run_browser_automation(application, db, profile, resume, letter_task, dry_run, on_detect)
     except PlaywrightTimeout:
         logger.error(f"[Automation] Timeout navigating to {job_posting.url}")
         _capture_error_screenshot(application)
@@ -92,15 +141,24 @@ def run_automation(application_id: int, db: Session):
         _capture_error_screenshot(application)
         _mark_status(db, application, ApplicationStatus.FAILED,
                      f"Automation error: {str(e)[:200]}")
+    finally:
+        # No cover letter field, CAPTCHA, no form, error or cancelled run — stop the LLM call
+        letter_task.cancel()
 
 
-def resume_automation(application_id: int, user_fields: dict, db: Session):
+async def resume_automation(application_id: int, user_fields: dict, db: Session):
     """
     Resume automation after user provides missing field values.
 
-    Re-launches Playwright, navigates to the saved page URL,
-    fills ALL fields (saved + user-provided), and submits.
+    Opens a pooled browser context with the paused run's saved session,
+    navigates to the saved page URL, fills ALL fields (saved + user-provided)
+    from the saved field snapshot, and submits.
     """
+    with automation_timing.track(db, application_id, "resume"):
+        await _resume_automation(application_id, user_fields, db)
+
+
+async def _resume_automation(application_id: int, user_fields: dict, db: Session):
     logger.info(f"[Automation] Resuming for application {application_id}")
 
     application = db.query(Application).filter(Application.id == application_id).first()
@@ -122,9 +180,11 @@ def resume_automation(application_id: int, user_fields: dict, db: Session):
 
     # Merge user-provided fields into filled fields
     all_fields = {**filled_fields, **user_fields}
+    db.commit()  # End the read transaction before the browser awaits
 
     try:
-        _run_resume_browser(application, db, page_url, all_fields, cover_letter_text, resume)
+        await _run_resume_browser(application, db, page_url, all_fields, cover_letter_text, resume,
+                                  state.get("browser_state"), state.get("form_snapshot"))
     except PlaywrightTimeout:
         logger.error(f"[Automation] Timeout during resume for {page_url}")
         _mark_status(db, application, ApplicationStatus.FAILED,
@@ -135,80 +195,131 @@ def resume_automation(application_id: int, user_fields: dict, db: Session):
                      f"Resume automation error: {str(e)[:200]}")
 
 
-def _run_browser_automation(application: Application, db: Session,
-                            profile, resume, cover_letter_text: str):
-    """Core browser automation logic — initial run."""
+class _FormDetection(NamedTuple):
+    captcha: bool
+    fields: Dict[str, str]  # field key -> CSS selector
+    unknown_fields: List[dict]
+    submit: Optional[Locator]
+
+
+async def _detect_form(page, db: Session) -> _FormDetection:
+    """Use a validated template for known host/form layouts; otherwise detect from a snapshot and learn one."""
+    host = page_readiness.host_of(page.url)
+    templates = form_templates.candidates(db, host)
+    if templates:
+        check = await form_templates.check_page(page, templates)
+        if check["captcha"]:
+            return _FormDetection(True, {}, [], None)
+        template = form_templates.resolve(db, host, templates, check)
+        if template is not None:
+            return _FormDetection(
+                captcha=False,
+                fields=dict(template.field_selectors),
+                unknown_fields=list(template.unknown_fields or []),
+                submit=page.locator(template.submit_selector).first if template.submit_selector else None,
+            )
+
+    # One DOM snapshot drives CAPTCHA, field and submit-button detection
+    snapshot = await form_detector.snapshot_page(page)
+    if form_detector.detect_captcha(snapshot):
+        return _FormDetection(True, {}, [], None)
+
+    elements = form_detector.detect_form_fields(snapshot)
+    if not elements:
+        return _FormDetection(False, {}, [], None)
+
+    known_keys = set()
+    for field_key, el in elements.items():
+        known_keys.add(el["attrs"].get("name") or "")
+        known_keys.add(el["attrs"].get("id") or "")
+        known_keys.add(field_key)
+    unknown_fields = form_detector.get_all_visible_inputs(snapshot, known_keys)
+    submit_btn = form_detector.detect_apply_button(snapshot)
+
+    form_templates.store(db, host, snapshot, elements, submit_btn, unknown_fields)
+    return _FormDetection(
+        captcha=False,
+        fields={key: form_detector.selector_for(el) for key, el in elements.items()},
+        unknown_fields=unknown_fields,
+        submit=form_detector.locator_for(page, submit_btn) if submit_btn else None,
+    )
+
+
+async def _run_browser_automation(application: Application, db: Session,
+                            profile, resume, letter_task: asyncio.Task,
+                            dry_run: Optional[bool] = None, on_detect: Optional[Callable] = None):
+    """Core browser automation logic — initial run. `letter_task` is awaited only if the form takes a cover letter."""
     job_url = application.job_posting.url
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            viewport={"width": 1280, "height": 900},
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-        )
-        page = context.new_page()
+    # Warm browser from the pool; the fresh context isolates this application's cookies/storage
+    started = time.monotonic()
+    async with browser_pool.context() as context:
+        requests = await resource_policy.apply(context)  # Abort images/fonts/media and trackers
+        page = await context.new_page()
+        automation_timing.add_since("browser_context", started)
 
         try:
             # Navigate to job posting
             logger.info(f"[Automation] Navigating to {job_url}")
-            page.goto(job_url, wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(2000)  # Let dynamic content load
+            with automation_timing.step("navigate"):
+                await page.goto(job_url, wait_until="domcontentloaded", timeout=30000)
+            with automation_timing.step("page_ready"):
+                await page_readiness.wait_until_ready(page, db)  # Form visible / network quiet, adaptive per host
+
+            with automation_timing.step("detect"):
+                detection = await _detect_form(page, db)
+            if on_detect is not None:
+                on_detect(application.id, detection)
 
             # Check for CAPTCHA
-            if form_detector.detect_captcha(page):
-                screenshot_path = _capture_screenshot(page, application, "captcha")
+            if detection.captcha:
+                screenshot_path = await _capture_screenshot(page, application, "captcha")
                 application.screenshot_path = screenshot_path
                 _mark_status(db, application, ApplicationStatus.MANUAL_INTERVENTION_REQUIRED,
                              f"CAPTCHA detected. Please apply manually at: {job_url}")
                 return
 
-            # Detect form fields using known patterns
-            fields = form_detector.detect_form_fields(page)
-
-            if not fields:
+            if not detection.fields:
                 # No form found — external ATS link or info-only page
-                screenshot_path = _capture_screenshot(page, application, "no_form")
+                screenshot_path = await _capture_screenshot(page, application, "no_form")
                 application.screenshot_path = screenshot_path
                 _mark_status(db, application, ApplicationStatus.MANUAL_INTERVENTION_REQUIRED,
                              f"No application form detected. Apply manually at: {job_url}")
                 return
 
+            cover_letter_text = ""
+            if "cover_letter" in detection.fields:
+                with automation_timing.step("cover_letter"):  # Only the wait not hidden behind navigation
+                    cover_letter_text = await letter_task
+                application.cover_letter_text = cover_letter_text
+                db.commit()
+                logger.info(f"[Automation] Cover letter generated ({len(cover_letter_text)} chars)")
+
             # Fill detected fields and track what was filled vs missing
-            filled_report, missing_from_profile = _fill_form_fields_with_report(
-                page, fields, profile, resume, cover_letter_text
-            )
+            with automation_timing.step("fill"):
+                filled_report, missing_from_profile = await _fill_form_fields_with_report(
+                    page, detection.fields, profile, resume, cover_letter_text
+                )
             logger.info(f"[Automation] Filled: {list(filled_report.keys())}, "
                         f"Missing (no profile data): {[m['key'] for m in missing_from_profile]}")
 
-            # Detect unknown fields (custom employer questions not in our patterns)
-            known_keys = set()
-            for field_key, locator in fields.items():
-                try:
-                    name = locator.get_attribute("name") or ""
-                    el_id = locator.get_attribute("id") or ""
-                    known_keys.add(name)
-                    known_keys.add(el_id)
-                    known_keys.add(field_key)
-                except Exception:
-                    known_keys.add(field_key)
-
-            unknown_fields = form_detector.get_all_visible_inputs(page, known_keys)
-
-            # Combine all missing fields
-            all_missing = missing_from_profile + unknown_fields
+            # Combine profile gaps with unknown fields (custom employer questions not in our patterns)
+            all_missing = missing_from_profile + detection.unknown_fields
 
             if all_missing:
                 # PAUSE: save state and ask user for input
-                screenshot_path = _capture_screenshot(page, application, "needs_input")
+                screenshot_path = await _capture_screenshot(page, application, "needs_input")
                 application.screenshot_path = screenshot_path
 
+                # Browser session and field selectors let resume skip detection
+                snapshot = await form_detector.snapshot_page(page)
                 application.automation_state = {
                     "filled_fields": filled_report,
                     "missing_fields": all_missing,
                     "page_url": job_url,
                     "cover_letter_text": cover_letter_text,
+                    "browser_state": await context.storage_state(),
+                    "form_snapshot": _form_snapshot(snapshot, all_missing),
                 }
                 db.commit()
 
@@ -219,114 +330,166 @@ def _run_browser_automation(application: Application, db: Session,
                 return
 
             # All fields filled — proceed
-            screenshot_path = _capture_screenshot(page, application, "filled")
+            screenshot_path = await _capture_screenshot(page, application, "filled")
             application.screenshot_path = screenshot_path
 
-            _complete_submission(page, application, db, job_url, len(filled_report))
+            await _complete_submission(page, detection.submit, application, db, job_url, len(filled_report),
+                                       dry_run)
 
         finally:
-            browser.close()
+            await page.close()
+            logger.info(f"[Automation] Network for application {application.id}: {requests.summary()}")
 
 
-def _run_resume_browser(application: Application, db: Session,
+def _form_snapshot(snapshot: List[dict], missing_fields: List[dict]) -> Optional[dict]:
+    """
+    Stable selectors for every field and the submit button, saved when pausing.
+    None unless every field (known and custom) can be found again without detection.
+    """
+    fields = {}
+    for field_key, el in form_detector.detect_form_fields(snapshot).items():
+        fields[field_key] = form_templates.stable_selector(el)
+    for field in missing_fields:
+        if field["key"] not in fields:
+            el = form_detector.find_by_name_or_id(snapshot, field["key"])
+            fields[field["key"]] = form_templates.stable_selector(el) if el is not None else None
+    if not fields or None in fields.values():
+        return None
+
+    submit_btn = form_detector.detect_apply_button(snapshot)
+    return {"fields": fields, "submit": form_templates.stable_selector(submit_btn) if submit_btn else None}
+
+
+async def _restore_form(page, db: Session, saved: dict) -> Optional[_FormDetection]:
+    """The paused run's field snapshot, or None if the page no longer matches it."""
+    selectors = list(saved["fields"].values())
+    try:
+        await page.locator(selectors[0]).first.wait_for(
+            state="visible", timeout=page_readiness.timeout_ms(db, page_readiness.host_of(page.url)))
+    except PlaywrightTimeout:
+        logger.info("[Automation] Saved form did not appear — falling back to detection")
+        return None
+
+    check = await form_detector.check_selectors(page, selectors + ([saved["submit"]] if saved["submit"] else []))
+    if check["captcha"]:
+        return _FormDetection(True, {}, [], None)
+    if check["missing"]:
+        logger.info(f"[Automation] Saved selectors no longer resolve: {check['missing']} — falling back to detection")
+        return None
+    return _FormDetection(
+        captcha=False,
+        fields=dict(saved["fields"]),
+        unknown_fields=[],
+        submit=page.locator(saved["submit"]).first if saved["submit"] else None,
+    )
+
+
+async def _detect_resume_form(page, all_fields: dict) -> _FormDetection:
+    """Full detection on resume: pattern fields plus the user's custom fields by name/id."""
+    snapshot = await form_detector.snapshot_page(page)
+    if form_detector.detect_captcha(snapshot):
+        return _FormDetection(True, {}, [], None)
+
+    fields = {key: form_detector.selector_for(el) for key, el in form_detector.detect_form_fields(snapshot).items()}
+    for key in all_fields:
+        if key in KNOWN_FIELD_TYPES:
+            continue
+        # Find by name, then by id
+        el = form_detector.find_by_name_or_id(snapshot, key)
+        if el is not None:
+            fields[key] = form_detector.selector_for(el)
+
+    submit_btn = form_detector.detect_apply_button(snapshot)
+    return _FormDetection(False, fields, [], form_detector.locator_for(page, submit_btn) if submit_btn else None)
+
+
+async def _run_resume_browser(application: Application, db: Session,
                         page_url: str, all_fields: dict,
-                        cover_letter_text: str, resume):
-    """Browser automation for resumed applications — re-fill everything and submit."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            viewport={"width": 1280, "height": 900},
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-        )
-        page = context.new_page()
+                        cover_letter_text: str, resume,
+                        browser_state: Optional[dict] = None, saved_form: Optional[dict] = None):
+    """
+    Browser automation for resumed applications — re-fill everything and submit.
+    Restores the paused run's cookies/storage and fills from its saved field
+    snapshot; full detection only runs if that snapshot no longer matches.
+    """
+    overrides = {"storage_state": browser_state} if browser_state else {}
+    started = time.monotonic()
+    async with browser_pool.context(**overrides) as context:
+        requests = await resource_policy.apply(context)  # Abort images/fonts/media and trackers
+        page = await context.new_page()
+        automation_timing.add_since("browser_context", started)
 
         try:
             logger.info(f"[Automation] Resuming — navigating to {page_url}")
-            page.goto(page_url, wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(2000)
-
-            if form_detector.detect_captcha(page):
-                screenshot_path = _capture_screenshot(page, application, "captcha_resume")
+            with automation_timing.step("navigate"):
+                await page.goto(page_url, wait_until="domcontentloaded", timeout=30000)
+
+            with automation_timing.step("detect"):
+                form = await _restore_form(page, db, saved_form) if saved_form else None
+            if form is None:
+                if not saved_form:
+                    with automation_timing.step("page_ready"):
+                        await page_readiness.wait_until_ready(page, db)
+                with automation_timing.step("detect"):
+                    form = await _detect_resume_form(page, all_fields)
+
+            if form.captcha:
+                screenshot_path = await _capture_screenshot(page, application, "captcha_resume")
                 application.screenshot_path = screenshot_path
                 _mark_status(db, application, ApplicationStatus.MANUAL_INTERVENTION_REQUIRED,
                              f"CAPTCHA detected on resume. Apply manually at: {page_url}")
                 return
 
-            # Re-detect form fields
-            fields = form_detector.detect_form_fields(page)
-
-            # Fill known pattern fields with saved values
-            filled_count = 0
-            for field_key, locator in fields.items():
-                if field_key in all_fields:
-                    if field_key == "resume_upload" and resume and resume.file_path:
-                        try:
-                            abs_path = os.path.abspath(resume.file_path)
-                            if os.path.exists(abs_path):
-                                locator.set_input_files(abs_path)
-                                filled_count += 1
-                        except Exception as e:
-                            logger.warning(f"[Automation] Resume upload failed on resume: {e}")
-                    else:
-                        _safe_fill(locator, str(all_fields[field_key]))
-                        filled_count += 1
-
-            # Fill user-provided custom fields by name/id
-            for key, value in all_fields.items():
-                if key in KNOWN_FIELD_TYPES:
-                    continue  # Already handled above
-                # Try to find by name, then by id
-                for selector in [f'[name="{key}"]', f'[id="{key}"]']:
+            # Fill saved profile values and user-provided answers
+            values = {key: str(all_fields[key]) for key in form.fields
+                      if key in all_fields and key not in ("cover_letter", "resume_upload")}
+            if "cover_letter" in form.fields:
+                values["cover_letter"] = cover_letter_text
+            with automation_timing.step("fill"):
+                await _fill_all(page, form.fields, values)
+                filled_count = len(values)
+
+                if "resume_upload" in form.fields and "resume_upload" in all_fields and resume:
                     try:
-                        locator = page.locator(selector).first
-                        if locator.count() > 0 and locator.is_visible():
-                            _safe_fill(locator, str(value))
+                        abs_path = resume_files.local_path(resume)
+                        if abs_path:
+                            await page.locator(form.fields["resume_upload"]).first.set_input_files(abs_path)
                             filled_count += 1
-                            break
-                    except Exception:
-                        continue
-
-            # Fill cover letter textarea if present
-            cover_letter_fields = form_detector.FIELD_PATTERNS.get("cover_letter", [])
-            for selector in cover_letter_fields:
-                try:
-                    locator = page.locator(selector).first
-                    if locator.count() > 0 and locator.is_visible():
-                        _safe_fill(locator, cover_letter_text)
-                        filled_count += 1
-                        break
-                except Exception:
-                    continue
-
-            screenshot_path = _capture_screenshot(page, application, "resumed_filled")
+                    except Exception as e:
+                        logger.warning(f"[Automation] Resume upload failed on resume: {e}")
+
+            screenshot_path = await _capture_screenshot(page, application, "resumed_filled")
             application.screenshot_path = screenshot_path
 
             # Clear saved state
             application.automation_state = None
             db.commit()
 
-            _complete_submission(page, application, db, page_url, filled_count)
+            await _complete_submission(page, form.submit, application, db, page_url, filled_count)
 
         finally:
-            browser.close()
+            await page.close()
+            logger.info(f"[Automation] Network for application {application.id}: {requests.summary()}")
 
 
-def _complete_submission(page, application: Application, db: Session,
-                         job_url: str, fields_filled: int):
+async def _complete_submission(page, submit: Optional[Locator], application: Application, db: Session,
+                               job_url: str, fields_filled: int, dry_run: Optional[bool] = None):
     """Handle the final submission step (or dry run)."""
-    if DRY_RUN:
+    if DRY_RUN if dry_run is None else dry_run:
         logger.info("[Automation] DRY RUN — skipping form submission")
         _mark_status(db, application, ApplicationStatus.APPLIED,
                      f"Form filled successfully (dry run). {fields_filled} fields completed.")
     else:
-        submit_btn = form_detector.detect_apply_button(page)
-        if submit_btn:
-            submit_btn.click()
-            page.wait_for_timeout(3000)
+        if submit is not None:
+            # Committed before the click: a run cut off from here on may have submitted,
+            # so the queue settles it for manual review instead of retrying
+            application.submit_started_at = datetime.now(timezone.utc)
+            db.commit()
+            with automation_timing.step("submit"):
+                await submit.click()
+                await page_readiness.wait_for_submission(page)
 
-            screenshot_path = _capture_screenshot(page, application, "submitted")
+            screenshot_path = await _capture_screenshot(page, application, "submitted")
             application.screenshot_path = screenshot_path
             _mark_status(db, application, ApplicationStatus.APPLIED,
                          f"Application submitted successfully. {fields_filled} fields filled.")
@@ -335,7 +498,7 @@ def _complete_submission(page, application: Application, db: Session,
                          f"Form filled but no submit button found. Apply manually at: {job_url}")
 
 
-def _fill_form_fields_with_report(page, fields: dict, profile, resume,
+async def _fill_form_fields_with_report(page, fields: Dict[str, str], profile, resume,
                                    cover_letter_text: str) -> Tuple[Dict, List]:
     """
     Fill detected form fields with user data.
@@ -359,7 +522,6 @@ def _fill_form_fields_with_report(page, fields: dict, profile, resume,
     ]:
         if field_key in fields:
             if value:
-                _safe_fill(fields[field_key], value)
                 filled_report[field_key] = value
             else:
                 missing_fields.append({"key": field_key, "label": label, "type": "text"})
@@ -370,7 +532,6 @@ def _fill_form_fields_with_report(page, fields: dict, profile, resume,
         email = profile.user.email or ""
     if "email" in fields:
         if email:
-            _safe_fill(fields["email"], email)
             filled_report["email"] = email
         else:
             missing_fields.append({"key": "email", "label": "Email Address", "type": "email"})
@@ -379,7 +540,6 @@ def _fill_form_fields_with_report(page, fields: dict, profile, resume,
     phone = profile.phone_number if profile and profile.phone_number else ""
     if "phone" in fields:
         if phone:
-            _safe_fill(fields["phone"], phone)
             filled_report["phone"] = phone
         else:
             missing_fields.append({"key": "phone", "label": "Phone Number", "type": "tel"})
@@ -388,7 +548,6 @@ def _fill_form_fields_with_report(page, fields: dict, profile, resume,
     address = profile.address if profile and profile.address else ""
     if "address" in fields:
         if address:
-            _safe_fill(fields["address"], address)
             filled_report["address"] = address
         else:
             missing_fields.append({"key": "address", "label": "Address", "type": "text"})
@@ -397,7 +556,6 @@ def _fill_form_fields_with_report(page, fields: dict, profile, resume,
     city = profile.location if profile and profile.location else ""
     if "city" in fields:
         if city:
-            _safe_fill(fields["city"], city)
             filled_report["city"] = city
         else:
             missing_fields.append({"key": "city", "label": "City", "type": "text"})
@@ -409,21 +567,23 @@ def _fill_form_fields_with_report(page, fields: dict, profile, resume,
     # Cover letter
     if "cover_letter" in fields:
         if cover_letter_text:
-            _safe_fill(fields["cover_letter"], cover_letter_text)
             filled_report["cover_letter"] = cover_letter_text
         else:
             missing_fields.append({"key": "cover_letter", "label": "Cover Letter", "type": "textarea"})
 
+    # All text fields in one page script
+    await _fill_all(page, fields, filled_report)
+
     # Resume upload
-    if "resume_upload" in fields and resume and resume.file_path:
+    if "resume_upload" in fields and resume:
         try:
-            abs_path = os.path.abspath(resume.file_path)
-            if os.path.exists(abs_path):
-                fields["resume_upload"].set_input_files(abs_path)
+            abs_path = resume_files.local_path(resume)
+            if abs_path:
+                await page.locator(fields["resume_upload"]).first.set_input_files(abs_path)
                 filled_report["resume_upload"] = abs_path
                 logger.info(f"[Automation] Uploaded resume: {abs_path}")
             else:
-                logger.warning(f"[Automation] Resume file not found: {abs_path}")
+                logger.warning(f"[Automation] Resume file not found for user {resume.user_id}")
                 missing_fields.append({"key": "resume_upload", "label": "Resume File", "type": "file"})
         except Exception as e:
             logger.error(f"[Automation] Resume upload failed: {e}")
@@ -434,29 +594,42 @@ def _fill_form_fields_with_report(page, fields: dict, profile, resume,
     return filled_report, missing_fields
 
 
-def _safe_fill(locator, value: str):
-    """Safely fill a form field, clearing existing content first."""
+async def _fill_all(page, fields: Dict[str, str], values: Dict[str, str]):
+    """
+    Fill {field key: value} with one page script; only fields that reject
+    scripted input (contenteditable widgets, inputs that revert the value) are
+    filled individually through Playwright.
+    """
+    targets = {fields[key]: value for key, value in values.items()}
+    if not targets:
+        return
     try:
-        locator.click()
-        locator.fill(value)
+        results = await form_detector.fill_fields(page, targets)
     except Exception as e:
-        logger.warning(f"[Automation] Failed to fill field: {e}")
+        logger.warning(f"[Automation] Bulk fill failed, filling fields one by one: {e}")
+        results = {}
 
+    rejected = [selector for selector in targets if not results.get(selector)]
+    if rejected:
+        logger.info(f"[Automation] Bulk-filled {len(targets) - len(rejected)}/{len(targets)} fields; "
+                    f"filling {len(rejected)} individually")
+    for selector in rejected:
+        await _safe_fill(page.locator(selector).first, targets[selector])
 
-def _capture_screenshot(page, application: Application, suffix: str) -> str:
-    """Capture a screenshot and save it to the screenshots directory."""
-    os.makedirs(SCREENSHOT_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"app_{application.id}_{suffix}_{timestamp}.png"
-    filepath = os.path.join(SCREENSHOT_DIR, filename)
 
+async def _safe_fill(locator, value: str):
+    """Safely fill a form field, clearing existing content first."""
     try:
-        page.screenshot(path=filepath, full_page=True)
-        logger.info(f"[Automation] Screenshot saved: {filepath}")
-        return filepath
+        await locator.click()
+        await locator.fill(value)
     except Exception as e:
-        logger.error(f"[Automation] Screenshot failed: {e}")
-        return ""
+        logger.warning(f"[Automation] Failed to fill field: {e}")
+
+
+async def _capture_screenshot(page, application: Application, suffix: str) -> str:
+    """Capture a screenshot (skipped if the page is unchanged since the last one) and return its path."""
+    with automation_timing.step("screenshot"):
+        return await screenshots.capture(page, application.id, suffix)
 
 
 def _capture_error_screenshot(application: Application):
@@ -0,0 +1,283 @@
+"""
+Durable queue for browser automation.
+
+The API only inserts `AutomationJob` rows (in the same transaction as the
+Application they belong to); automation workers (`python -m
+app.automation_worker`) claim and run them. A claim is a lease: the worker
+sets `locked_by`/`locked_until` and extends the lease with heartbeats while
+Chromium runs. If a worker dies, the reaper returns its expired leases to
+the queue, so queued work survives restarts of either process.
+
+Each heartbeat also writes the worker's in-process stats (browser pool,
+template cache, preflight verdicts) to `automation_worker_status`, which is
+how the API reports on workers it shares no memory with.
+
+Claiming uses `SELECT ... FOR UPDATE SKIP LOCKED` on Postgres so concurrent
+workers never block on each other. SQLite has no row locks; there a claim is
+a compare-and-set UPDATE on `status`, which SQLite's single writer makes safe.
+
+Retries cover runs that time out or raise out of the automation. Failures
+the automation settles itself (navigation errors, CAPTCHA, closed postings)
+set the application status and are not retried. Before every attempt
+`ready_to_run` re-checks the application, so a retry never runs for an
+application that was settled meanwhile, or one an earlier attempt may
+already have submitted.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import (
+    Application, ApplicationStatus, ApplicationStatusEvent, AutomationJob, AutomationJobStatus,
+    AutomationWorkerStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("apply", "resume")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue(db: Session, application_id: int, kind: str = "apply", payload: Optional[dict] = None) -> AutomationJob:
+    """Add an automation job; the caller commits it with the rest of its transaction."""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown automation job kind '{kind}'")
+    job = AutomationJob(
+        application_id=application_id,
+        kind=kind,
+        payload=payload,
+        status=AutomationJobStatus.QUEUED,
+        attempts=0,
+        run_after=_now(),
+    )
+    db.add(job)
+    return job
+
+
+def enqueue_many(db: Session, application_ids: List[int], kind: str = "apply") -> int:
+    """Bulk variant of `enqueue`: one INSERT for all applications, committed by the caller."""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown automation job kind '{kind}'")
+    if not application_ids:
+        return 0
+    now = _now()
+    db.execute(insert(AutomationJob), [
+        {"application_id": application_id, "kind": kind, "status": AutomationJobStatus.QUEUED,
+         "attempts": 0, "run_after": now}
+        for application_id in application_ids
+    ])
+    return len(application_ids)
+
+
+def _ready_filter(now: datetime):
+    return (
+        AutomationJob.status == AutomationJobStatus.QUEUED,
+        AutomationJob.run_after <= now,
+    )
+
+
+def claim_jobs(db: Session, worker_id: str, limit: int) -> List[int]:
+    """Lease up to `limit` ready jobs for `worker_id`; returns the claimed ids."""
+    if limit <= 0:
+        return []
+    now = _now()
+    lease = {
+        "status": AutomationJobStatus.RUNNING,
+        "locked_by": worker_id,
+        "locked_until": now + timedelta(seconds=settings.AUTOMATION_LEASE_SECONDS),
+        "started_at": now,
+        "attempts": AutomationJob.attempts + 1,
+    }
+
+    if db.get_bind().dialect.name == "postgresql":
+        ids = [
+            job_id for (job_id,) in
+            db.query(AutomationJob.id)
+            .filter(*_ready_filter(now))
+            .order_by(AutomationJob.run_after, AutomationJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ]
+        if ids:
+            db.execute(update(AutomationJob).where(AutomationJob.id.in_(ids)).values(**lease))
+        db.commit()
+        return ids
+
+    claimed = []
+    candidates = (
+        db.query(AutomationJob.id)
+        .filter(*_ready_filter(now))
+        .order_by(AutomationJob.run_after, AutomationJob.id)
+        .limit(limit)
+        .all()
+    )
+    for (job_id,) in candidates:
+        result = db.execute(
+            update(AutomationJob)
+            .where(AutomationJob.id == job_id, AutomationJob.status == AutomationJobStatus.QUEUED)
+            .values(**lease)
+        )
+        if result.rowcount == 1:
+            claimed.append(job_id)
+        db.commit()
+    return claimed
+
+
+def heartbeat(db: Session, worker_id: str, job_ids: List[int]) -> int:
+    """Extend the leases `worker_id` still holds; returns how many were extended."""
+    if not job_ids:
+        return 0
+    result = db.execute(
+        update(AutomationJob)
+        .where(
+            AutomationJob.id.in_(job_ids),
+            AutomationJob.locked_by == worker_id,
+            AutomationJob.status == AutomationJobStatus.RUNNING,
+        )
+        .values(locked_until=_now() + timedelta(seconds=settings.AUTOMATION_LEASE_SECONDS))
+    )
+    db.commit()
+    return result.rowcount
+
+
+def complete(db: Session, job: AutomationJob):
+    job.status = AutomationJobStatus.DONE
+    job.locked_by = None
+    job.locked_until = None
+    job.finished_at = _now()
+    db.commit()
+
+
+def ready_to_run(db: Session, job: AutomationJob) -> bool:
+    """
+    Whether a claimed job should run: its application must still be
+    PENDING_AUTOMATION with no earlier attempt past the submit click.
+    Otherwise the job is closed out here and False is returned.
+    """
+    application = db.query(Application).filter(Application.id == job.application_id).first()
+    if application is None or application.status != ApplicationStatus.PENDING_AUTOMATION:
+        state = application.status.value if application else "deleted"
+        job.last_error = f"Application already settled ({state}); not run"
+        logger.info(f"[Queue] Job {job.id} skipped: application {job.application_id} is {state}")
+        complete(db, job)
+        return False
+
+    if application.submit_started_at is not None:
+        message = ("An earlier automation attempt was interrupted after clicking submit. "
+                   "Check whether the application went through before applying again.")
+        application.status = ApplicationStatus.MANUAL_INTERVENTION_REQUIRED
+        db.add(ApplicationStatusEvent(
+            application_id=application.id,
+            status=ApplicationStatus.MANUAL_INTERVENTION_REQUIRED,
+            message=message,
+        ))
+        job.last_error = message
+        job.status = AutomationJobStatus.FAILED
+        job.locked_by = None
+        job.locked_until = None
+        job.finished_at = _now()
+        db.commit()
+        logger.warning(f"[Queue] Job {job.id} not retried: application {application.id} may already be submitted")
+        return False
+    return True
+
+
+def _give_up(db: Session, job: AutomationJob, error: str):
+    """Mark a job permanently failed, surfacing it on the application."""
+    job.status = AutomationJobStatus.FAILED
+    job.finished_at = _now()
+    application = db.query(Application).filter(Application.id == job.application_id).first()
+    if application and application.status == ApplicationStatus.PENDING_AUTOMATION:
+        application.status = ApplicationStatus.FAILED
+        db.add(ApplicationStatusEvent(
+            application_id=application.id,
+            status=ApplicationStatus.FAILED,
+            message=f"Automation failed after {job.attempts} attempt(s): {error[:200]}",
+        ))
+
+
+def fail(db: Session, job: AutomationJob, error: str):
+    """Record a failed run: retry with exponential backoff, or give up after max attempts."""
+    job.last_error = error[:2000]
+    job.locked_by = None
+    job.locked_until = None
+    if job.attempts >= settings.AUTOMATION_MAX_ATTEMPTS:
+        _give_up(db, job, error)
+        logger.error(f"[Queue] Job {job.id} failed permanently: {error[:200]}")
+    else:
+        delay = settings.AUTOMATION_RETRY_DELAY_SECONDS * (2 ** (job.attempts - 1))
+        job.status = AutomationJobStatus.QUEUED
+        job.run_after = _now() + timedelta(seconds=delay)
+        logger.warning(f"[Queue] Job {job.id} failed (attempt {job.attempts}), retrying in {delay}s: {error[:200]}")
+    db.commit()
+
+
+def release(db: Session, job: AutomationJob):
+    """Return an interrupted job to the queue without counting the attempt (worker shutdown)."""
+    job.status = AutomationJobStatus.QUEUED
+    job.attempts = max(job.attempts - 1, 0)
+    job.locked_by = None
+    job.locked_until = None
+    job.run_after = _now()
+    db.commit()
+
+
+def reap_expired_leases(db: Session) -> int:
+    """Requeue (or fail) running jobs whose worker stopped heartbeating."""
+    expired = (
+        db.query(AutomationJob)
+        .filter(
+            AutomationJob.status == AutomationJobStatus.RUNNING,
+            AutomationJob.locked_until < _now(),
+        )
+        .all()
+    )
+    for job in expired:
+        logger.warning(f"[Queue] Reaping job {job.id}: lease held by {job.locked_by} expired")
+        fail(db, job, f"Lease expired (worker {job.locked_by} stopped heartbeating)")
+    return len(expired)
+
+
+def queue_stats(db: Session) -> Dict[str, int]:
+    """Job counts per status, plus how many queued jobs are ready to run now."""
+    stats = {status.value: 0 for status in AutomationJobStatus}
+    for status, count in (
+        db.query(AutomationJob.status, func.count(AutomationJob.id)).group_by(AutomationJob.status)
+    ):
+        stats[status.value] = count
+    stats["ready"] = db.query(AutomationJob).filter(*_ready_filter(_now())).count()
+    return stats
+
+
+def report_worker(db: Session, worker_id: str, in_flight: int, stats: dict):
+    """Record a worker's current stats, and forget workers silent for a day."""
+    now = _now()
+    db.merge(AutomationWorkerStatus(worker_id=worker_id, in_flight=in_flight, stats=stats, updated_at=now))
+    db.execute(delete(AutomationWorkerStatus).where(AutomationWorkerStatus.updated_at < now - timedelta(days=1)))
+    db.commit()
+
+
+def remove_worker(db: Session, worker_id: str):
+    """Drop a worker's status row on clean shutdown."""
+    db.execute(delete(AutomationWorkerStatus).where(AutomationWorkerStatus.worker_id == worker_id))
+    db.commit()
+
+
+def worker_stats(db: Session) -> List[dict]:
+    """Latest stats of every worker that reported within the last few heartbeats."""
+    cutoff = _now() - timedelta(seconds=3 * settings.AUTOMATION_HEARTBEAT_SECONDS)
+    return [
+        {"worker_id": row.worker_id, "in_flight": row.in_flight, "updated_at": row.updated_at, **(row.stats or {})}
+        for row in
+        db.query(AutomationWorkerStatus)
+        .filter(AutomationWorkerStatus.updated_at >= cutoff)
+        .order_by(AutomationWorkerStatus.worker_id)
+    ]
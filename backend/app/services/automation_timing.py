@@ -0,0 +1,144 @@
+"""
+Per-step timing for automation runs.
+
+`run_automation` and `resume_automation` each open a run (`track`). Code
+inside the run wraps its steps in `step("navigate")` etc., or calls
+`add_since` for steps that can't be a `with` block. The current run lives
+in a context variable, so each concurrent asyncio task records its own
+steps without threading a timer through every helper. Repeated steps
+(e.g. several screenshots) add up.
+
+When the run ends, one row per step plus a "total" row is written to
+`automation_step_timings`. Rows are tagged with the posting's host and the
+run's outcome: the application status it left behind, or "error" /
+"cancelled". `summary` reports count, p50, p95 and mean per step.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Application, AutomationStepTiming
+from app.services.page_readiness import host_of
+
+logger = logging.getLogger(__name__)
+
+STEPS = [
+    "cover_letter", "preflight", "browser_context", "navigate", "page_ready",
+    "detect", "fill", "screenshot", "submit", "total",
+]
+
+_current: ContextVar[Optional[Dict[str, float]]] = ContextVar("automation_run_steps", default=None)
+
+
+def add_since(name: str, started: float):
+    """Add the time since `started` (time.monotonic()) to step `name` of the current run."""
+    steps = _current.get()
+    if steps is not None:
+        steps[name] = steps.get(name, 0.0) + (time.monotonic() - started)
+
+
+@contextmanager
+def step(name: str):
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        add_since(name, started)
+
+
+@contextmanager
+def track(db: Session, application_id: int, kind: str):
+    """Time one automation run and record its steps when it ends."""
+    steps: Dict[str, float] = {}
+    token = _current.set(steps)
+    started = time.monotonic()
+    outcome = None
+    try:
+        yield
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        _current.reset(token)
+        steps["total"] = time.monotonic() - started
+        _record(db, application_id, kind, outcome, steps)
+
+
+def _record(db: Session, application_id: int, kind: str, outcome: Optional[str], steps: Dict[str, float]):
+    try:
+        db.rollback()  # Discard anything a failed run left half-done
+        application = db.query(Application).filter(Application.id == application_id).first()
+        if application is None:
+            return
+        outcome = outcome or application.status.value
+        host = host_of(application.job_posting.url) if application.job_posting.url else None
+        db.add_all([
+            AutomationStepTiming(application_id=application_id, kind=kind, host=host, outcome=outcome,
+                                 step=name, duration_ms=int(seconds * 1000))
+            for name, seconds in steps.items()
+        ])
+        db.commit()
+        logger.info(f"[Timing] Application {application_id} ({kind}, {outcome}): "
+                    + ", ".join(f"{name}={int(seconds * 1000)}ms" for name, seconds in steps.items()))
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[Timing] Could not record timings for application {application_id}: {e}")
+
+
+def _percentile(values: List[int], q: float) -> int:
+    """Nearest-rank percentile of sorted values."""
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+def summary(db: Session, hours: int = 24, host: Optional[str] = None,
+            outcome: Optional[str] = None, kind: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """Per-step {count, p50_ms, p95_ms, avg_ms} over runs recorded in the last `hours`."""
+    query = db.query(AutomationStepTiming.step, AutomationStepTiming.duration_ms).filter(
+        AutomationStepTiming.created_at >= datetime.now(timezone.utc) - timedelta(hours=hours)
+    )
+    if host:
+        query = query.filter(AutomationStepTiming.host == host)
+    if outcome:
+        query = query.filter(AutomationStepTiming.outcome == outcome)
+    if kind:
+        query = query.filter(AutomationStepTiming.kind == kind)
+
+    durations: Dict[str, List[int]] = {}
+    for name, duration_ms in query.order_by(AutomationStepTiming.step, AutomationStepTiming.duration_ms):
+        durations.setdefault(name, []).append(duration_ms)
+
+    order = {name: i for i, name in enumerate(STEPS)}
+    return {
+        name: {
+            "count": len(values),
+            "p50_ms": _percentile(values, 0.50),
+            "p95_ms": _percentile(values, 0.95),
+            "avg_ms": int(sum(values) / len(values)),
+        }
+        for name, values in sorted(durations.items(), key=lambda item: order.get(item[0], len(order)))
+    }
+
+
+def purge_old_timings(db: Session) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.AUTOMATION_TIMING_RETENTION_DAYS)
+    deleted = (
+        db.query(AutomationStepTiming)
+        .filter(AutomationStepTiming.created_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    if deleted:
+        logger.info(f"[Timing] Purged {deleted} step timings older than {settings.AUTOMATION_TIMING_RETENTION_DAYS} days")
+    return deleted
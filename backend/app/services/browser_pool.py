@@ -0,0 +1,223 @@
+"""
+Warm Chromium pool for browser automation.
+
+Launching Chromium costs one to two seconds and ~150 MB per application.
+The pool keeps up to `BROWSER_POOL_SIZE` browsers running for the life of
+the automation worker and hands each application a fresh, isolated
+`BrowserContext` (own cookies, storage and cache) on the least-busy one, so
+the per-application cost drops to creating a context.
+
+A browser is retired after `BROWSER_MAX_USES` contexts, and the oldest
+browser is retired when Chromium's memory grows past `BROWSER_MAX_RSS_MB`
+per browser: it takes no new contexts and is closed once its in-flight
+applications finish. Crashed browsers are dropped and replaced on the next
+acquire. Measuring memory walks /proc, so it is sampled at most every
+`BROWSER_RSS_SAMPLE_SECONDS` rather than on every release; one sample
+retires at most one browser, and closing a browser forces a fresh sample.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from playwright.async_api import Browser, async_playwright
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 900},
+    "user_agent": USER_AGENT,
+}
+
+
+def _child_pids(pid: int) -> Dict[int, int]:
+    """pid -> parent pid for every process on the host (Linux /proc only)."""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Fields after the parenthesised command name: state, ppid, ...
+                fields = f.read().rsplit(")", 1)[1].split()
+            parents[int(entry)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return parents
+
+
+def browser_rss_mb() -> Optional[float]:
+    """Resident memory of all processes spawned by this one (Playwright driver + Chromium)."""
+    if not os.path.isdir("/proc"):
+        return None
+    parents = _child_pids(os.getpid())
+    descendants, frontier = set(), {os.getpid()}
+    while frontier:
+        frontier = {pid for pid, ppid in parents.items() if ppid in frontier} - descendants
+        descendants |= frontier
+
+    total_kb = 0
+    for pid in descendants:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+class _PooledBrowser:
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.uses = 0
+        self.active = 0
+        self.retiring = False
+
+    @property
+    def available(self) -> bool:
+        return not self.retiring and self.browser.is_connected()
+
+
+class BrowserPool:
+    def __init__(self):
+        self._playwright = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._browsers: List[_PooledBrowser] = []
+        self._stats = {"launches": 0, "recycles": 0, "contexts": 0, "wait_total": 0.0, "wait_max": 0.0}
+        self._rss_mb: Optional[float] = None
+        self._rss_sampled_at: Optional[float] = None
+        self._rss_acted = False  # The current sample already retired a browser
+
+    async def start(self):
+        """Start Playwright; browsers themselves launch lazily on first use."""
+        if self._playwright is None:
+            self._lock = asyncio.Lock()
+            self._playwright = await async_playwright().start()
+
+    async def close(self):
+        for pooled in self._browsers:
+            await self._close_browser(pooled)
+        self._browsers = []
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _close_browser(self, pooled: _PooledBrowser):
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.warning(f"[BrowserPool] Browser close failed: {e}")
+
+    async def _acquire(self) -> _PooledBrowser:
+        await self.start()
+        async with self._lock:
+            for pooled in [b for b in self._browsers if not b.browser.is_connected()]:
+                logger.warning("[BrowserPool] Browser disconnected — dropping it")
+                self._browsers.remove(pooled)
+
+            available = [b for b in self._browsers if b.available]
+            if len(available) < settings.BROWSER_POOL_SIZE and (
+                not available or min(b.active for b in available) > 0
+            ):
+                pooled = _PooledBrowser(await self._playwright.chromium.launch(headless=True))
+                self._browsers.append(pooled)
+                self._stats["launches"] += 1
+                available.append(pooled)
+
+            pooled = min(available, key=lambda b: b.active)
+            pooled.active += 1
+            return pooled
+
+    def _sampled_rss_mb(self) -> Optional[float]:
+        """`browser_rss_mb`, re-measured at most every `BROWSER_RSS_SAMPLE_SECONDS`."""
+        now = time.monotonic()
+        if self._rss_sampled_at is None or now - self._rss_sampled_at >= settings.BROWSER_RSS_SAMPLE_SECONDS:
+            self._rss_mb = browser_rss_mb()
+            self._rss_sampled_at = now
+            self._rss_acted = False
+        return self._rss_mb
+
+    def _retire(self, pooled: _PooledBrowser, reason: str):
+        logger.info(f"[BrowserPool] Retiring browser after {reason}")
+        pooled.retiring = True
+        self._stats["recycles"] += 1
+
+    def _check_memory(self):
+        """Retire the oldest live browser if the current sample is over the per-browser limit."""
+        rss = self._sampled_rss_mb()
+        if rss is None or self._rss_acted:
+            return
+        live = max(len(self._browsers), 1)
+        available = [b for b in self._browsers if b.available]  # Launch order, oldest first
+        if available and rss / live > settings.BROWSER_MAX_RSS_MB:
+            self._retire(available[0], f"RSS {rss:.0f} MB across {live} browser(s)")
+            self._rss_acted = True
+
+    async def _release(self, pooled: _PooledBrowser):
+        pooled.active -= 1
+        pooled.uses += 1
+        if not pooled.retiring and pooled.uses >= settings.BROWSER_MAX_USES:
+            self._retire(pooled, f"{pooled.uses} uses")
+        self._check_memory()
+
+        idle = [b for b in self._browsers if b.retiring and b.active == 0]
+        for retired in idle:
+            self._browsers.remove(retired)
+        for retired in idle:
+            await self._close_browser(retired)
+        if idle:
+            self._rss_sampled_at = None  # Memory just dropped; measure again on the next check
+
+    @asynccontextmanager
+    async def context(self, **overrides):
+        """Yield a fresh isolated context on the least-busy warm browser."""
+        started = time.monotonic()
+        pooled = await self._acquire()
+        waited = time.monotonic() - started
+        self._stats["contexts"] += 1
+        self._stats["wait_total"] += waited
+        self._stats["wait_max"] = max(self._stats["wait_max"], waited)
+
+        try:
+            context = await pooled.browser.new_context(**{**CONTEXT_OPTIONS, **overrides})
+        except BaseException:
+            await self._release(pooled)
+            raise
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.warning(f"[BrowserPool] Context close failed: {e}")
+            await self._release(pooled)
+
+    def stats(self) -> Dict[str, float]:
+        contexts = self._stats["contexts"]
+        return {
+            "browsers": len(self._browsers),
+            "active_contexts": sum(b.active for b in self._browsers),
+            "launches": self._stats["launches"],
+            "recycles": self._stats["recycles"],
+            "contexts": contexts,
+            "acquire_wait_avg_ms": round(1000 * self._stats["wait_total"] / contexts, 1) if contexts else 0.0,
+            "acquire_wait_max_ms": round(1000 * self._stats["wait_max"], 1),
+            "rss_mb": round(self._sampled_rss_mb() or 0.0, 1),
+        }
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,158 @@
+"""
+Streaming bulk importer for offline job feeds.
+
+Reads NDJSON or CSV job dumps row by row and maps each record onto
+`JobPosting` through the same normalization as live TheirStack fetches
+(`job_ingestion.job_columns`: description cleaning/compression, SimHash
+fingerprint, company resolution). Rows are written in batches with a
+single executemany INSERT per batch, so memory stays bounded by the batch
+size regardless of feed length.
+
+Records use TheirStack field names (`id`, `job_title`, `company`,
+`location`, `salary_string`, `description`, `url`, `date_posted`, ...);
+CSV feeds may flatten company data into `company_domain`,
+`company_employee_count` and `company_industry` columns.
+"""
+
+import csv
+import json
+import logging
+import time
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import JobPosting
+from app.services import job_dedup, job_ingestion
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+
+def detect_format(filename: str) -> str:
+    """Guess the feed format from a file name."""
+    lowered = filename.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    raise ValueError(f"Cannot detect feed format from '{filename}'. Use one of: {SUPPORTED_FORMATS}")
+
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[dict]:
+    """Yield job dicts from a text stream without loading it into memory."""
+    if fmt == "ndjson":
+        for line_no, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"[Import] Skipping malformed NDJSON line {line_no}: {e}")
+    elif fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if value not in ("", None)}
+    else:
+        raise ValueError(f"Unsupported feed format '{fmt}'. Use one of: {SUPPORTED_FORMATS}")
+
+
+def _batched(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _import_batch(db: Session, records: List[dict], company_ids: Dict[str, Optional[int]]) -> Dict[str, int]:
+    """Normalize and insert one batch; returns per-batch counts."""
+    stats = {"inserted": 0, "skipped": 0, "invalid": 0, "duplicates": 0}
+
+    rows = {}
+    for record in records:
+        if record.get("id") in (None, "") or not (record.get("job_title") or record.get("title")):
+            stats["invalid"] += 1
+            continue
+        record.setdefault("job_title", record.get("title"))
+        columns = job_ingestion.job_columns(record)
+        if columns["external_id"] in rows:
+            stats["skipped"] += 1
+            continue
+
+        # Company resolution is cached per import so repeated names cost one lookup
+        name = columns["company_name"]
+        if name not in company_ids:
+            company = job_ingestion.resolve_company(db, record)
+            company_ids[name] = company.id if company else None
+        columns["company_id"] = company_ids[name]
+        rows[columns["external_id"]] = columns
+
+    if rows:
+        existing = {
+            external_id for (external_id,) in
+            db.query(JobPosting.external_id).filter(JobPosting.external_id.in_(list(rows)))
+        }
+        stats["skipped"] += len(existing)
+        new_rows = [columns for external_id, columns in rows.items() if external_id not in existing]
+
+        if new_rows:
+            db.execute(insert(JobPosting), new_rows)
+            new_ids = [
+                job_id for (job_id,) in
+                db.query(JobPosting.id).filter(
+                    JobPosting.external_id.in_([r["external_id"] for r in new_rows])
+                )
+            ]
+            stats["duplicates"] = job_dedup.link_duplicates_for_ids(db, new_ids)
+            stats["inserted"] = len(new_rows)
+
+    db.commit()
+    return stats
+
+
+def import_jobs(db: Session, stream: IO[str], fmt: str, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    Import a job feed from a text stream.
+
+    Returns counts of inserted, skipped (already present), invalid and
+    near-duplicate rows.
+    """
+    batch_size = batch_size or settings.JOB_IMPORT_BATCH_SIZE
+    totals = {"inserted": 0, "skipped": 0, "invalid": 0, "duplicates": 0}
+    company_ids: Dict[str, Optional[int]] = {}
+    started = time.monotonic()
+
+    for batch_no, batch in enumerate(_batched(iter_records(stream, fmt), batch_size), start=1):
+        stats = _import_batch(db, batch, company_ids)
+        for key, value in stats.items():
+            totals[key] += value
+
+        if batch_no % 10 == 0:
+            rate = totals["inserted"] / max(time.monotonic() - started, 1e-6)
+            logger.info(f"[Import] {totals['inserted']} inserted so far ({rate:.0f} rows/s)")
+
+        # Bound the identity map / company cache on very large feeds
+        db.expunge_all()
+        if len(company_ids) > settings.JOB_IMPORT_COMPANY_CACHE_SIZE:
+            company_ids.clear()
+
+    logger.info(
+        f"[Import] Done in {time.monotonic() - started:.1f}s — {totals['inserted']} inserted, "
+        f"{totals['skipped']} skipped, {totals['invalid']} invalid, {totals['duplicates']} near-duplicates"
+    )
+    return totals
+
+
+def import_file(db: Session, path: str, fmt: Optional[str] = None, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Import a job feed from a file on disk."""
+    fmt = fmt or detect_format(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return import_jobs(db, f, fmt, batch_size)
+
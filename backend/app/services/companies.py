@@ -0,0 +1,168 @@
+"""
+Normalized company records.
+
+Every job posting links to a `Company` row keyed by a normalized name
+(lowercased, punctuation and legal suffixes such as Inc/LLC stripped).
+Alternative spellings are stored as `CompanyAlias` rows, so resolving
+"Acme, Inc." or "ACME LLC" is a single indexed lookup. Attributes such as
+employee count and size bucket are cached from TheirStack's company data
+and drive the `company_size_prefs` filter.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models import Company, CompanyAlias, JobPosting
+
+logger = logging.getLogger(__name__)
+
+# Legal-entity suffixes ignored when comparing company names
+LEGAL_SUFFIXES = {
+    "inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company",
+    "plc", "gmbh", "ag", "sa", "srl", "bv", "pty", "lp", "llp",
+}
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Size buckets by employee count (upper bound exclusive)
+SIZE_BUCKETS = [
+    ("STARTUP", 50),
+    ("SMALL", 200),
+    ("MID", 1000),
+    ("ENTERPRISE", None),
+]
+
+# Free-text profile preferences -> size buckets
+SIZE_PREF_KEYWORDS = {
+    "startup": "STARTUP",
+    "early": "STARTUP",
+    "small": "SMALL",
+    "mid": "MID",
+    "medium": "MID",
+    "large": "ENTERPRISE",
+    "big": "ENTERPRISE",
+    "enterprise": "ENTERPRISE",
+    "corporate": "ENTERPRISE",
+}
+
+
+def normalize_company_name(name: Optional[str]) -> str:
+    """Normalized lookup key: lowercase alphanumerics without legal suffixes."""
+    if not name:
+        return ""
+    tokens = _NON_ALNUM.sub(" ", name.lower()).split()
+    # Strip trailing suffixes only ("Co-op Co" keeps its first "co")
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def size_bucket(employee_count: Optional[int]) -> Optional[str]:
+    if employee_count is None:
+        return None
+    for bucket, upper in SIZE_BUCKETS:
+        if upper is None or employee_count < upper:
+            return bucket
+    return None
+
+
+def size_buckets_for_prefs(prefs) -> List[str]:
+    """Map profile `company_size_prefs` strings onto size buckets."""
+    if not prefs:
+        return []
+    if isinstance(prefs, str):
+        prefs = [p.strip() for p in prefs.split(",") if p.strip()]
+
+    buckets = []
+    for pref in prefs:
+        pref_lower = pref.lower()
+        for keyword, bucket in SIZE_PREF_KEYWORDS.items():
+            if keyword in pref_lower and bucket not in buckets:
+                buckets.append(bucket)
+    return buckets
+
+
+def find_company(db: Session, name: Optional[str]) -> Optional[Company]:
+    """Resolve a company by any known alias of its name."""
+    key = normalize_company_name(name)
+    if not key:
+        return None
+    alias = db.query(CompanyAlias).filter(CompanyAlias.alias_key == key).first()
+    return alias.company if alias else None
+
+
+def _apply_attributes(company: Company, attributes: Dict):
+    """Cache TheirStack company attributes on the record."""
+    employee_count = attributes.get("employee_count")
+    if employee_count is not None:
+        try:
+            company.employee_count = int(employee_count)
+            company.size_bucket = size_bucket(company.employee_count)
+        except (TypeError, ValueError):
+            pass
+    if attributes.get("domain"):
+        company.domain = attributes["domain"]
+    if attributes.get("industry"):
+        company.industry = attributes["industry"]
+
+
+def get_or_create_company(
+    db: Session, name: str, attributes: Optional[Dict] = None
+) -> Optional[Company]:
+    """
+    Return the company for `name`, creating it (and its alias) if needed.
+    Newly supplied attributes overwrite cached ones.
+    """
+    key = normalize_company_name(name)
+    if not key:
+        return None
+
+    company = find_company(db, name)
+    if company is None:
+        company = Company(name=name.strip(), name_key=key)
+        company.aliases.append(CompanyAlias(alias_key=key))
+        db.add(company)
+
+    if attributes:
+        _apply_attributes(company, attributes)
+
+    db.flush()
+    return company
+
+
+def add_alias(db: Session, company: Company, name: str):
+    """Record an alternative spelling for an existing company."""
+    key = normalize_company_name(name)
+    if key and not db.query(CompanyAlias).filter(CompanyAlias.alias_key == key).first():
+        db.add(CompanyAlias(company_id=company.id, alias_key=key))
+        db.flush()
+
+
+def backfill_job_companies(db: Session, batch_size: int = 500) -> int:
+    """Link postings created before the companies table existed."""
+    linked = 0
+    last_id = 0
+    while True:
+        jobs = (
+            db.query(JobPosting)
+            .filter(JobPosting.company_id.is_(None), JobPosting.id > last_id)
+            .order_by(JobPosting.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not jobs:
+            break
+        for job in jobs:
+            company = get_or_create_company(db, job.company_name)
+            if company:
+                job.company_id = company.id
+                linked += 1
+        last_id = jobs[-1].id
+        db.commit()
+
+    if linked:
+        logger.info(f"[Companies] Linked {linked} job postings to companies")
+    return linked
@@ -1,7 +1,7 @@
 import logging
 from typing import Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from app.core.config import settings
 
@@ -22,6 +22,9 @@ def generate_cover_letter(
     """
     Generate a tailored cover letter using OpenAI GPT-4o-mini.
 
+    `job_description` is the posting's precomputed excerpt
+    (`job_text.description_excerpt`), already bounded at ingestion.
+
     Falls back to a basic template if the API key is missing or the call fails,
     so the application flow never breaks.
     """
@@ -31,18 +34,37 @@ def generate_cover_letter(
 
     try:
         client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        response = client.chat.completions.create(**_completion_request(resume_text, job_description, user_profile))
+
+        cover_letter = response.choices[0].message.content.strip()
+        logger.info("Successfully generated cover letter via OpenAI.")
+        return cover_letter
+
+    except Exception as e:
+        logger.error(f"OpenAI cover letter generation failed: {e}")
+        return _fallback_cover_letter(resume_text, job_description)
+
+
+async def generate_cover_letter_async(
+    resume_text: str,
+    job_description: str,
+    user_profile: Optional[dict] = None
+) -> str:
+    """
+    Async variant of `generate_cover_letter` for the automation engine.
 
-        user_message = _build_user_prompt(resume_text, job_description, user_profile)
+    Runs as a task alongside browser navigation; cancelling the task aborts
+    the in-flight OpenAI request instead of leaving it running in a thread.
+    """
+    if not settings.OPENAI_API_KEY:
+        logger.warning("OPENAI_API_KEY is not set — using fallback cover letter template.")
+        return _fallback_cover_letter(resume_text, job_description)
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            max_tokens=800
-        )
+    try:
+        async with AsyncOpenAI(api_key=settings.OPENAI_API_KEY) as client:
+            response = await client.chat.completions.create(
+                **_completion_request(resume_text, job_description, user_profile)
+            )
 
         cover_letter = response.choices[0].message.content.strip()
         logger.info("Successfully generated cover letter via OpenAI.")
@@ -53,6 +75,23 @@ def generate_cover_letter(
         return _fallback_cover_letter(resume_text, job_description)
 
 
+def _completion_request(
+    resume_text: str,
+    job_description: str,
+    user_profile: Optional[dict] = None
+) -> dict:
+    """Chat completion arguments shared by the sync and async generators."""
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": _build_user_prompt(resume_text, job_description, user_profile)}
+        ],
+        "temperature": 0.7,
+        "max_tokens": 800,
+    }
+
+
 def _build_user_prompt(
     resume_text: str,
     job_description: str,
@@ -63,7 +102,7 @@ def _build_user_prompt(
         "Write a cover letter for the following job based on the candidate's resume.\n"
     ]
 
-    prompt_parts.append(f"## Job Description\n{job_description[:3000]}\n")
+    prompt_parts.append(f"## Job Description\n{job_description}\n")
     prompt_parts.append(f"## Candidate Resume\n{resume_text[:4000]}\n")
 
     if user_profile:
@@ -1,13 +1,20 @@
 """
 Form field detection heuristics for job application pages.
 
-Scans a Playwright page for common form inputs by inspecting
-name, id, placeholder, label, and aria-label attributes.
+Detection is a single round trip: one `page.evaluate` returns a compact
+snapshot of every input, textarea, button, link, iframe and CAPTCHA
+container (attributes, resolved label, text and visibility) and tags each
+element with a `data-jinder-uid`. Classification into field types, CAPTCHA
+and submit button then runs in Python by matching the CSS patterns below
+against the snapshot, and `locator_for` turns a classified element back
+into a Playwright locator. Text fields are filled in bulk by one page
+script (`fill_fields`) that takes a {selector: value} map.
 """
 
 import logging
-from typing import Optional
-from playwright.sync_api import Page, Locator
+import re
+from typing import Dict, List, Optional, Tuple
+from playwright.async_api import Page, Locator
 
 logger = logging.getLogger(__name__)
 
@@ -111,56 +118,227 @@ CAPTCHA_SELECTORS = [
 ]
 
 
-def detect_form_fields(page: Page) -> dict:
+# One pass over the DOM; marks each element so it can be addressed later
+SNAPSHOT_SCRIPT = """
+() => {
+  const SELECTOR = 'input, textarea, button, a, iframe, .g-recaptcha, .h-captcha, #captcha';
+  const ATTRS = ['type', 'name', 'id', 'placeholder', 'aria-label', 'accept', 'class', 'src', 'title', 'value'];
+  const text = (el) => (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim().slice(0, 200);
+  return Array.from(document.querySelectorAll(SELECTOR)).map((el, uid) => {
+    el.setAttribute('data-jinder-uid', String(uid));
+    const tag = el.tagName.toLowerCase();
+    const attrs = {};
+    for (const name of ATTRS) {
+      const value = el.getAttribute(name);
+      if (value !== null) attrs[name] = value;
+    }
+    let label = '';
+    if (el.labels && el.labels.length) {
+      label = text(el.labels[0]);
+    } else if (el.getAttribute('aria-labelledby')) {
+      const ref = document.getElementById(el.getAttribute('aria-labelledby').split(' ')[0]);
+      if (ref) label = text(ref);
+    }
+    const rect = el.getBoundingClientRect();
+    const visible = rect.width > 0 && rect.height > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+    return {uid, tag, attrs, label, text: (tag === 'button' || tag === 'a') ? text(el) : '', visible};
+  });
+}
+"""
+
+# Validate saved selectors on a fresh load: which no longer resolve to a visible element, and is there a CAPTCHA
+CHECK_SELECTORS_SCRIPT = """
+({selectors, captcha}) => {
+  const visible = (el) => {
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+  };
+  const hasCaptcha = captcha.some((sel) => {
+    try { return document.querySelector(sel) !== null; } catch (e) { return false; }
+  });
+  const missing = selectors.filter((sel) => {
+    try { const el = document.querySelector(sel); return !el || !visible(el); } catch (e) { return true; }
+  });
+  return {captcha: hasCaptcha, missing};
+}
+"""
+
+# Set many text fields in one call. The native value setter is used so framework-controlled
+# inputs (React, Vue) see the change, and input/change/blur fire as they would for typing.
+# Values are re-read after a tick: a field that reverted or truncated its value is reported as failed.
+FILL_SCRIPT = """
+async (values) => {
+  const applied = {};
+  for (const [selector, value] of Object.entries(values)) {
+    let el = null;
+    try { el = document.querySelector(selector); } catch (e) {}
+    const isText = el instanceof HTMLTextAreaElement ||
+      (el instanceof HTMLInputElement && !['file', 'checkbox', 'radio', 'submit', 'button', 'hidden'].includes(el.type));
+    if (!isText || el.disabled || el.readOnly) { applied[selector] = null; continue; }
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+    applied[selector] = el;
+  }
+  await new Promise((resolve) => setTimeout(resolve, 0));
+  const result = {};
+  for (const [selector, el] of Object.entries(applied)) {
+    result[selector] = el !== null && el.isConnected && el.value === values[selector];
+  }
+  return result;
+}
+"""
+
+_SELECTOR_TOKEN = re.compile(
+    r'\[(?P<attr>[\w-]+)(?:(?P<op>[*^$]?=)"(?P<value>[^"]*)"(?P<flag> i)?)?\]'
+    r'|#(?P<id>[\w-]+)'
+    r'|\.(?P<cls>[\w-]+)'
+    r'|:has-text\("(?P<text>[^"]*)"\)'
+)
+
+
+def _compile_selector(selector: str):
+    """Parse the simple CSS subset used in this module into (tag, conditions)."""
+    tag_match = re.match(r"[a-z]+", selector)
+    tag = tag_match.group(0) if tag_match else None
+    rest = selector[tag_match.end():] if tag_match else selector
+    conditions = []
+    for token in _SELECTOR_TOKEN.finditer(rest):
+        if token.group("attr"):
+            conditions.append(("attr", token.group("attr"), token.group("op"), token.group("value"), bool(token.group("flag"))))
+        elif token.group("id"):
+            conditions.append(("attr", "id", "=", token.group("id"), False))
+        elif token.group("cls"):
+            conditions.append(("class", token.group("cls")))
+        else:
+            conditions.append(("text", token.group("text")))
+    return tag, conditions
+
+
+def _attr_matches(actual: Optional[str], op: Optional[str], expected: str, ignore_case: bool) -> bool:
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if ignore_case:
+        actual, expected = actual.lower(), expected.lower()
+    if op == "=":
+        return actual == expected
+    if op == "*=":
+        return bool(expected) and expected in actual
+    if op == "^=":
+        return bool(expected) and actual.startswith(expected)
+    return bool(expected) and actual.endswith(expected)
+
+
+def matches(element: dict, compiled) -> bool:
+    """Whether a snapshot element satisfies a compiled selector."""
+    tag, conditions = compiled
+    if tag and element["tag"] != tag:
+        return False
+    attrs = element["attrs"]
+    for condition in conditions:
+        if condition[0] == "attr":
+            _, name, op, value, ignore_case = condition
+            if not _attr_matches(attrs.get(name), op, value, ignore_case):
+                return False
+        elif condition[0] == "class":
+            if condition[1] not in (attrs.get("class") or "").split():
+                return False
+        elif condition[1].lower() not in element["text"].lower():
+            return False
+    return True
+
+
+_FIELD_MATCHERS: Dict[str, List[Tuple[str, tuple]]] = {
+    field_type: [(selector, _compile_selector(selector)) for selector in selectors]
+    for field_type, selectors in FIELD_PATTERNS.items()
+}
+_APPLY_MATCHERS = [(selector, _compile_selector(selector)) for selector in APPLY_BUTTON_SELECTORS]
+_CAPTCHA_MATCHERS = [(selector, _compile_selector(selector)) for selector in CAPTCHA_SELECTORS]
+
+
+async def snapshot_page(page: Page) -> List[dict]:
+    """Collect every form-relevant element on the page in a single evaluate."""
+    return await page.evaluate(SNAPSHOT_SCRIPT)
+
+
+async def check_selectors(page: Page, selectors: List[str]) -> dict:
+    """{captcha, missing} for selectors saved from an earlier load of this page."""
+    return await page.evaluate(CHECK_SELECTORS_SCRIPT, {"selectors": selectors, "captcha": CAPTCHA_SELECTORS})
+
+
+async def fill_fields(page: Page, values: Dict[str, str]) -> Dict[str, bool]:
+    """Fill {selector: value} in one evaluate; returns per-selector success."""
+    return await page.evaluate(FILL_SCRIPT, values)
+
+
+def selector_for(element: dict) -> str:
+    """CSS selector for an element from the current snapshot."""
+    return f'[data-jinder-uid="{element["uid"]}"]'
+
+
+def locator_for(page: Page, element: dict) -> Locator:
+    """Playwright locator for an element from the current snapshot."""
+    return page.locator(selector_for(element))
+
+
+def detect_form_fields(snapshot: List[dict]) -> Dict[str, dict]:
     """
-    Scan the page for common job application form fields.
-    Returns a dict mapping field type -> first matching Locator.
+    Classify snapshot elements into common job application form fields.
+    Returns a dict mapping field type -> first visible matching element.
     """
     detected = {}
+    visible = [el for el in snapshot if el["visible"]]
 
-    for field_type, selectors in FIELD_PATTERNS.items():
-        for selector in selectors:
-            try:
-                locator = page.locator(selector).first
-                if locator.count() > 0 and locator.is_visible():
-                    detected[field_type] = locator
-                    logger.info(f"Detected form field: {field_type} via '{selector}'")
-                    break
-            except Exception:
-                continue
+    for field_type, matchers in _FIELD_MATCHERS.items():
+        for selector, compiled in matchers:
+            element = next((el for el in visible if matches(el, compiled)), None)
+            if element is not None:
+                detected[field_type] = element
+                logger.info(f"Detected form field: {field_type} via '{selector}'")
+                break
 
     logger.info(f"Total detected fields: {list(detected.keys())}")
     return detected
 
 
-def detect_captcha(page: Page) -> bool:
+def detect_captcha(snapshot: List[dict]) -> bool:
     """Check if the page contains a CAPTCHA challenge."""
-    for selector in CAPTCHA_SELECTORS:
-        try:
-            if page.locator(selector).count() > 0:
-                logger.warning(f"CAPTCHA detected via '{selector}'")
-                return True
-        except Exception:
-            continue
+    for selector, compiled in _CAPTCHA_MATCHERS:
+        if any(matches(el, compiled) for el in snapshot):
+            logger.warning(f"CAPTCHA detected via '{selector}'")
+            return True
     return False
 
 
-def detect_apply_button(page: Page) -> Optional[Locator]:
+def detect_apply_button(snapshot: List[dict]) -> Optional[dict]:
     """Find the apply/submit button on the page."""
-    for selector in APPLY_BUTTON_SELECTORS:
-        try:
-            locator = page.locator(selector).first
-            if locator.count() > 0 and locator.is_visible():
-                logger.info(f"Found apply button via '{selector}'")
-                return locator
-        except Exception:
-            continue
+    visible = [el for el in snapshot if el["visible"]]
+    for selector, compiled in _APPLY_MATCHERS:
+        element = next((el for el in visible if matches(el, compiled)), None)
+        if element is not None:
+            logger.info(f"Found apply button via '{selector}'")
+            return element
 
     logger.warning("No apply/submit button found")
     return None
 
 
-def get_all_visible_inputs(page: Page, known_field_keys: set) -> list:
+def find_by_name_or_id(snapshot: List[dict], key: str) -> Optional[dict]:
+    """First visible input/textarea whose name (or else id) equals `key`."""
+    candidates = [el for el in snapshot if el["visible"] and el["tag"] in ("input", "textarea")]
+    for attr in ("name", "id"):
+        for element in candidates:
+            if element["attrs"].get(attr) == key:
+                return element
+    return None
+
+
+def get_all_visible_inputs(snapshot: List[dict], known_field_keys: set) -> list:
     """
     Find all visible input/textarea fields on the page that were NOT
     already matched by our pattern-based detection.
@@ -171,56 +349,40 @@ def get_all_visible_inputs(page: Page, known_field_keys: set) -> list:
     unknown_fields = []
     seen_keys = set()
 
-    for tag in ["input", "textarea"]:
-        try:
-            elements = page.locator(tag).all()
-            for el in elements:
-                try:
-                    if not el.is_visible():
-                        continue
-
-                    input_type = el.get_attribute("type") or "text"
-                    # Skip hidden, submit, button, checkbox, radio — not text fields
-                    if input_type in ("hidden", "submit", "button", "checkbox", "radio", "file"):
-                        continue
-
-                    name = el.get_attribute("name") or ""
-                    el_id = el.get_attribute("id") or ""
-                    placeholder = el.get_attribute("placeholder") or ""
-                    aria_label = el.get_attribute("aria-label") or ""
-
-                    key = name or el_id or placeholder.lower().replace(" ", "_")[:30]
-                    if not key or key in seen_keys:
-                        continue
-
-                    # Skip if this field was already matched by pattern detection
-                    if key in known_field_keys:
-                        continue
-
-                    # Try to find a label
-                    label = aria_label or placeholder
-                    if not label and el_id:
-                        try:
-                            label_el = page.locator(f'label[for="{el_id}"]').first
-                            if label_el.count() > 0:
-                                label = label_el.inner_text().strip()
-                        except Exception:
-                            pass
-                    if not label:
-                        label = name.replace("_", " ").replace("-", " ").title()
-
-                    field_type = "textarea" if tag == "textarea" else input_type
-                    unknown_fields.append({
-                        "key": key,
-                        "label": label,
-                        "type": field_type,
-                    })
-                    seen_keys.add(key)
-
-                except Exception:
-                    continue
-        except Exception:
+    for el in snapshot:
+        if el["tag"] not in ("input", "textarea") or not el["visible"]:
+            continue
+
+        attrs = el["attrs"]
+        input_type = attrs.get("type") or "text"
+        # Skip hidden, submit, button, checkbox, radio — not text fields
+        if input_type in ("hidden", "submit", "button", "checkbox", "radio", "file"):
             continue
 
+        name = attrs.get("name") or ""
+        el_id = attrs.get("id") or ""
+        placeholder = attrs.get("placeholder") or ""
+        aria_label = attrs.get("aria-label") or ""
+
+        key = name or el_id or placeholder.lower().replace(" ", "_")[:30]
+        if not key or key in seen_keys:
+            continue
+
+        # Skip if this field was already matched by pattern detection
+        if key in known_field_keys:
+            continue
+
+        label = aria_label or placeholder or el["label"]
+        if not label:
+            label = name.replace("_", " ").replace("-", " ").title()
+
+        field_type = "textarea" if el["tag"] == "textarea" else input_type
+        unknown_fields.append({
+            "key": key,
+            "label": label,
+            "type": field_type,
+        })
+        seen_keys.add(key)
+
     logger.info(f"Found {len(unknown_fields)} unknown fields: {[f['key'] for f in unknown_fields]}")
     return unknown_fields
@@ -0,0 +1,194 @@
+"""
+Browserless pre-flight for application pages.
+
+Before spending a browser context on an application, the posting URL is
+fetched over a pooled async HTTP client and parsed with BeautifulSoup. The
+parsed page is turned into the same element snapshot `form_detector`
+builds in the browser, so the same `FIELD_PATTERNS`, CAPTCHA and button
+rules classify it.
+
+Verdicts:
+  - "closed":  404/410, or a closed-posting marker in the visible text of
+    a page with no form — no browser
+  - "captcha": a CAPTCHA widget is in the served HTML — apply manually
+  - "no_form": a static, fully server-rendered page with no form fields
+  - "browser": fields were found (filling needs the browser), or the page
+    needs JavaScript (SPA shell, embedded iframe, blocked/failed fetch),
+    a closed marker sits next to a live form, or anything is inconclusive
+
+Only "closed", "captcha" and "no_form" skip the browser, and each requires
+positive evidence from a successful fetch of real HTML. Parsing runs in a
+thread so a large page never stalls the worker's event loop.
+"""
+
+import asyncio
+import logging
+import re
+from collections import Counter
+from typing import List, NamedTuple, Optional
+
+import httpx
+from bs4 import BeautifulSoup
+
+from app.core.config import settings
+from app.services import form_detector
+from app.services.browser_pool import USER_AGENT
+from app.services.link_validator import DEAD_STATUS_CODES, find_closed_marker, visible_text
+
+logger = logging.getLogger(__name__)
+
+# In-process verdict counters, logged by the automation worker heartbeat
+stats: Counter = Counter()
+
+_client: Optional[httpx.AsyncClient] = None
+
+# Mount points of client-rendered apps: an empty one means the form is built by JavaScript
+SPA_ROOT_SELECTORS = ["#root", "#app", "#__next", "#__nuxt", "[ng-app]", "[data-reactroot]", "#grnhse_app"]
+# Hosts whose application pages are always client-rendered
+JS_ONLY_HOSTS = ("myworkdayjobs.com", "myworkdaysite.com", "ashbyhq.com", "icims.com", "taleo.net", "successfactors.com")
+MIN_STATIC_TEXT_CHARS = 500  # A server-rendered posting has real text in its HTML
+
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+
+
+class Preflight(NamedTuple):
+    verdict: str  # closed, captcha, no_form, browser
+    reason: str
+    status_code: Optional[int] = None
+    fields: List[str] = []
+
+
+def client() -> httpx.AsyncClient:
+    """Persistent async client — connections are reused across applications."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.AUTOMATION_PREFLIGHT_TIMEOUT),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+        )
+    return _client
+
+
+async def aclose():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _hidden(tag) -> bool:
+    """Hidden by attribute or inline style on the element or an ancestor (stylesheets aren't evaluated)."""
+    if tag.name == "input" and (tag.get("type") or "").lower() == "hidden":
+        return True
+    for node in [tag, *tag.parents]:
+        if getattr(node, "attrs", None) is None:
+            continue
+        if node.has_attr("hidden") or _HIDDEN_STYLE.search(node.get("style") or ""):
+            return True
+    return False
+
+
+def _text(tag) -> str:
+    return " ".join(tag.get_text(" ").split())[:200]
+
+
+def snapshot_html(soup: BeautifulSoup) -> List[dict]:
+    """The `form_detector.snapshot_page` element format, built from static HTML."""
+    labels = {label["for"]: _text(label) for label in soup.find_all("label") if label.get("for")}
+    snapshot = []
+    for uid, tag in enumerate(soup.select("input, textarea, button, a, iframe, .g-recaptcha, .h-captcha, #captcha")):
+        attrs = {}
+        for name in ("type", "name", "id", "placeholder", "aria-label", "accept", "class", "src", "title", "value"):
+            value = tag.get(name)
+            if value is not None:
+                attrs[name] = " ".join(value) if isinstance(value, list) else value
+        label = labels.get(attrs.get("id", ""), "")
+        if not label:
+            wrapping = tag.find_parent("label")
+            label = _text(wrapping) if wrapping else ""
+        snapshot.append({
+            "uid": uid,
+            "tag": tag.name,
+            "attrs": attrs,
+            "label": label,
+            "text": _text(tag) if tag.name in ("button", "a") else "",
+            "visible": not _hidden(tag),
+        })
+    return snapshot
+
+
+def _needs_javascript(url: str, soup: BeautifulSoup, snapshot: List[dict]) -> Optional[str]:
+    """Why this page can't be judged from its HTML alone, or None if it is plainly static."""
+    host = (httpx.URL(url).host or "").lower()
+    if any(host == h or host.endswith("." + h) for h in JS_ONLY_HOSTS):
+        return f"{host} renders applications client-side"
+    if any(el["tag"] == "iframe" for el in snapshot):
+        return "page embeds an iframe"
+    for selector in SPA_ROOT_SELECTORS:
+        root = soup.select_one(selector)
+        if root is not None and len(root.get_text(strip=True)) < 50:
+            return f"empty app root {selector}"
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    if len(soup.get_text(" ", strip=True)) < MIN_STATIC_TEXT_CHARS:
+        return "little server-rendered text"
+    return None
+
+
+def classify(url: str, status_code: int, html: str) -> Preflight:
+    """Verdict for a fetched page (pure; see module docstring)."""
+    if status_code in DEAD_STATUS_CODES:
+        return Preflight("closed", f"HTTP {status_code}", status_code)
+    if status_code >= 400:
+        return Preflight("browser", f"HTTP {status_code}", status_code)
+
+    soup = BeautifulSoup(html, "html.parser")
+    snapshot = snapshot_html(soup)
+    fields = form_detector.detect_form_fields(snapshot)
+
+    marker = find_closed_marker(visible_text(soup))
+    if marker:
+        # A form next to the marker means the page may still take applications
+        if fields or soup.find("form") is not None:
+            return Preflight("browser", f"Closed marker '{marker}' beside a form", status_code, sorted(fields))
+        return Preflight("closed", f"Closed marker: '{marker}'", status_code)
+
+    if form_detector.detect_captcha(snapshot):
+        return Preflight("captcha", "CAPTCHA in served HTML", status_code)
+
+    if fields:
+        return Preflight("browser", "form fields found", status_code, sorted(fields))
+
+    js_reason = _needs_javascript(url, soup, snapshot)
+    if js_reason:
+        return Preflight("browser", js_reason, status_code)
+    if soup.find("form") is not None:
+        return Preflight("browser", "form without recognised fields", status_code)
+    return Preflight("no_form", "static page without an application form", status_code)
+
+
+async def preflight(url: str) -> Preflight:
+    """Fetch and classify `url`; any fetch problem defers to the browser."""
+    try:
+        async with client().stream("GET", url) as response:
+            content_type = response.headers.get("content-type", "")
+            if response.status_code < 400 and "html" not in content_type:
+                result = Preflight("browser", f"non-HTML content ({content_type or 'unknown'})", response.status_code)
+            else:
+                body = b""
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= settings.AUTOMATION_PREFLIGHT_MAX_BYTES:
+                        break
+                result = await asyncio.to_thread(
+                    classify, str(response.url), response.status_code,
+                    body.decode(response.encoding or "utf-8", errors="ignore"),
+                )
+    except httpx.HTTPError as e:
+        result = Preflight("browser", f"{type(e).__name__}: {e}")
+
+    stats[result.verdict] += 1
+    logger.info(f"[Preflight] {url} → {result.verdict} ({result.reason})")
+    return result
@@ -0,0 +1,180 @@
+"""
+Per-host form template cache.
+
+Most applications land on a handful of ATS hosts whose forms repeat from
+posting to posting. After heuristic detection succeeds, the resolved result
+is stored as a template keyed by (host, form fingerprint): a stable CSS
+selector per field type, the submit selector, and the fields the bot could
+not fill. The fingerprint is an FNV-1a hash of the visible inputs/buttons
+(`tag:type:name`), computed identically in Python (from a snapshot) and in
+the page.
+
+On the next application to that host, one cheap `page.evaluate` computes the
+page's fingerprint, checks for CAPTCHAs and validates the matching
+template's selectors. A hit skips the DOM snapshot and classification
+entirely; a stale template (fingerprint matched but a selector no longer
+resolves) falls back to detection, which refreshes it.
+"""
+
+import logging
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import FormTemplate
+from app.services import form_detector
+
+logger = logging.getLogger(__name__)
+
+# In-process counters, logged by the automation worker heartbeat
+stats: Counter = Counter()
+
+# One evaluate: page fingerprint, CAPTCHA presence, and validation of the matching template
+CHECK_SCRIPT = """
+({templates, captcha}) => {
+  const visible = (el) => {
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+  };
+  const parts = [];
+  for (const el of document.querySelectorAll('input, textarea, button')) {
+    const type = el.getAttribute('type') || '';
+    if (type === 'hidden' || !visible(el)) continue;
+    parts.push(`${el.tagName.toLowerCase()}:${type}:${el.getAttribute('name') || el.getAttribute('id') || ''}`);
+  }
+  const signature = parts.join('|');
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < signature.length; i++) {
+    hash ^= signature.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193) >>> 0;
+  }
+  const fingerprint = hash.toString(16).padStart(8, '0');
+  const hasCaptcha = captcha.some((sel) => {
+    try { return document.querySelector(sel) !== null; } catch (e) { return false; }
+  });
+  const template = templates.find((t) => t.fingerprint === fingerprint);
+  let missing = null;
+  if (template) {
+    missing = Object.entries(template.selectors)
+      .filter(([, sel]) => { const el = document.querySelector(sel); return !el || !visible(el); })
+      .map(([field]) => field);
+  }
+  return {fingerprint, captcha: hasCaptcha, template_id: template ? template.id : null, missing};
+}
+"""
+
+# Framework-generated ids (React ":r3:", "input-1234") change between page loads
+_GENERATED_ID = re.compile(r":|\d{3,}")
+
+
+def fingerprint(snapshot: List[dict]) -> str:
+    """FNV-1a (32-bit, over UTF-16 code units like JS) of the visible input/button signature."""
+    parts = []
+    for el in snapshot:
+        if el["tag"] not in ("input", "textarea", "button") or not el["visible"]:
+            continue
+        attrs = el["attrs"]
+        input_type = attrs.get("type") or ""
+        if input_type == "hidden":
+            continue
+        parts.append(f'{el["tag"]}:{input_type}:{attrs.get("name") or attrs.get("id") or ""}')
+
+    h = 0x811C9DC5
+    for unit in memoryview("|".join(parts).encode("utf-16-le")).cast("H"):
+        h ^= unit
+        h = (h * 0x01000193) & 0xFFFFFFFF
+    return f"{h:08x}"
+
+
+def stable_selector(element: dict) -> Optional[str]:
+    """A CSS selector that finds this element again on a fresh load, or None."""
+    tag, attrs = element["tag"], element["attrs"]
+    el_id = attrs.get("id")
+    if el_id and not _GENERATED_ID.search(el_id) and '"' not in el_id and "\\" not in el_id:
+        return f'{tag}[id="{el_id}"]'
+    name = attrs.get("name")
+    if name and '"' not in name and "\\" not in name:
+        return f'{tag}[name="{name}"]'
+    return None
+
+
+def candidates(db: Session, host: str) -> List[FormTemplate]:
+    templates = (
+        db.query(FormTemplate)
+        .filter(FormTemplate.host == host)
+        .order_by(FormTemplate.last_used_at.desc())
+        .limit(settings.FORM_TEMPLATE_MAX_PER_HOST)
+        .all()
+    )
+    db.commit()  # Don't hold the read transaction across the page check
+    return templates
+
+
+async def check_page(page, templates: List[FormTemplate]) -> dict:
+    return await page.evaluate(CHECK_SCRIPT, {
+        "templates": [{"id": t.id, "fingerprint": t.fingerprint, "selectors": t.field_selectors} for t in templates],
+        "captcha": form_detector.CAPTCHA_SELECTORS,
+    })
+
+
+def resolve(db: Session, host: str, templates: List[FormTemplate], check: dict) -> Optional[FormTemplate]:
+    """Turn a page check into a usable template (hit) or None (miss/stale), recording the outcome."""
+    template = next((t for t in templates if t.id == check["template_id"]), None)
+    if template is None:
+        stats["misses"] += 1
+        return None
+
+    if check["missing"]:
+        stats["stale"] += 1
+        template.stale_count += 1
+        db.commit()
+        logger.info(f"[Templates] Stale template {template.id} on {host}: {check['missing']} no longer resolve")
+        return None
+
+    stats["hits"] += 1
+    template.hits += 1
+    template.last_used_at = datetime.now(timezone.utc)
+    db.commit()
+    logger.info(f"[Templates] Hit on {host} (template {template.id}, fingerprint {template.fingerprint})")
+    return template
+
+
+def store(db: Session, host: str, snapshot: List[dict], elements: Dict[str, dict],
+          submit: Optional[dict], unknown_fields: List[dict]):
+    """Save (or refresh) the template for this page's form; skipped if any field lacks a stable selector."""
+    selectors = {field: stable_selector(el) for field, el in elements.items()}
+    if not host or not selectors or None in selectors.values():
+        return
+
+    now = datetime.now(timezone.utc)
+    values = {
+        "field_selectors": selectors,
+        "submit_selector": stable_selector(submit) if submit else None,
+        "unknown_fields": unknown_fields,
+        "last_used_at": now,
+    }
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(FormTemplate).values(
+        host=host, fingerprint=fingerprint(snapshot), hits=0, stale_count=0, created_at=now, **values,
+    ).on_conflict_do_update(index_elements=["host", "fingerprint"], set_=values)
+    try:
+        db.execute(stmt)
+        evicted = [
+            template_id for (template_id,) in
+            db.query(FormTemplate.id)
+            .filter(FormTemplate.host == host)
+            .order_by(FormTemplate.last_used_at.desc())
+            .offset(settings.FORM_TEMPLATE_MAX_PER_HOST)
+        ]
+        if evicted:
+            db.query(FormTemplate).filter(FormTemplate.id.in_(evicted)).delete(synchronize_session=False)
+        db.commit()
+        stats["stored"] += 1
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[Templates] Could not store template for {host}: {e}")
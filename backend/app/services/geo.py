@@ -0,0 +1,389 @@
+"""
+Offline location resolution and radius matching.
+
+Free-text locations ("San Francisco, CA", "Remote - US", "Berlin, Germany")
+are resolved against a bundled gazetteer (`app/data/gazetteer.csv`) plus
+region and country tables, without any API calls. City matches get
+coordinates, a geohash and an indexed geohash-prefix cell; region and
+country matches only get their ISO codes.
+
+`desired_locations_filter` turns a profile's `desired_locations` and
+`remote_preference` into a SQL clause: cities become radius filters (cell
+IN-list narrowed by a bounding box and an equirectangular distance check),
+regions/countries become code equality, and anything unresolvable falls
+back to a substring match on the raw location.
+"""
+
+import csv
+import logging
+import math
+import os
+import re
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import JobPosting, RemotePreference
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "gazetteer.csv")
+
+KM_PER_DEGREE = 111.32
+MILES_TO_KM = 1.609344
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+US_STATES = {
+    "AL": "alabama", "AK": "alaska", "AZ": "arizona", "AR": "arkansas", "CA": "california",
+    "CO": "colorado", "CT": "connecticut", "DE": "delaware", "DC": "district of columbia",
+    "FL": "florida", "GA": "georgia", "HI": "hawaii", "ID": "idaho", "IL": "illinois",
+    "IN": "indiana", "IA": "iowa", "KS": "kansas", "KY": "kentucky", "LA": "louisiana",
+    "ME": "maine", "MD": "maryland", "MA": "massachusetts", "MI": "michigan", "MN": "minnesota",
+    "MS": "mississippi", "MO": "missouri", "MT": "montana", "NE": "nebraska", "NV": "nevada",
+    "NH": "new hampshire", "NJ": "new jersey", "NM": "new mexico", "NY": "new york",
+    "NC": "north carolina", "ND": "north dakota", "OH": "ohio", "OK": "oklahoma", "OR": "oregon",
+    "PA": "pennsylvania", "RI": "rhode island", "SC": "south carolina", "SD": "south dakota",
+    "TN": "tennessee", "TX": "texas", "UT": "utah", "VT": "vermont", "VA": "virginia",
+    "WA": "washington", "WV": "west virginia", "WI": "wisconsin", "WY": "wyoming",
+}
+
+CA_PROVINCES = {
+    "AB": "alberta", "BC": "british columbia", "MB": "manitoba", "NB": "new brunswick",
+    "NL": "newfoundland and labrador", "NS": "nova scotia", "ON": "ontario",
+    "PE": "prince edward island", "QC": "quebec", "SK": "saskatchewan",
+}
+
+OTHER_REGIONS = {
+    "england": "GB-ENG", "scotland": "GB-SCT", "wales": "GB-WLS", "northern ireland": "GB-NIR",
+    "bavaria": "DE-BY", "ile de france": "FR-IDF", "catalonia": "ES-CT",
+    "new south wales": "AU-NSW", "victoria": "AU-VIC", "queensland": "AU-QLD",
+    "karnataka": "IN-KA", "maharashtra": "IN-MH",
+}
+
+COUNTRIES = {
+    "united states": "US", "united states of america": "US", "usa": "US", "us": "US", "america": "US",
+    "canada": "CA", "mexico": "MX", "brazil": "BR", "argentina": "AR", "chile": "CL",
+    "colombia": "CO", "peru": "PE", "united kingdom": "GB", "uk": "GB", "great britain": "GB",
+    "ireland": "IE", "france": "FR", "germany": "DE", "netherlands": "NL", "the netherlands": "NL",
+    "belgium": "BE", "luxembourg": "LU", "switzerland": "CH", "austria": "AT", "spain": "ES",
+    "portugal": "PT", "italy": "IT", "sweden": "SE", "denmark": "DK", "norway": "NO",
+    "finland": "FI", "poland": "PL", "czech republic": "CZ", "czechia": "CZ", "hungary": "HU",
+    "romania": "RO", "greece": "GR", "turkey": "TR", "estonia": "EE", "ukraine": "UA",
+    "israel": "IL", "united arab emirates": "AE", "uae": "AE", "egypt": "EG", "nigeria": "NG",
+    "kenya": "KE", "south africa": "ZA", "india": "IN", "singapore": "SG", "hong kong": "HK",
+    "china": "CN", "taiwan": "TW", "south korea": "KR", "korea": "KR", "japan": "JP",
+    "philippines": "PH", "indonesia": "ID", "malaysia": "MY", "thailand": "TH", "vietnam": "VN",
+    "australia": "AU", "new zealand": "NZ", "europe": None, "emea": None, "worldwide": None,
+}
+
+_REMOTE = re.compile(r"\b(remote|anywhere|work from home|wfh|distributed|telecommute)\b", re.IGNORECASE)
+_RADIUS = re.compile(
+    r"(?:within\s+)?(\d+(?:\.\d+)?)\s*(km|kilometers?|kilometres?|mi|miles?)\b(?:\s+(?:of|from|around))?",
+    re.IGNORECASE,
+)
+_PART_SEPARATORS = re.compile(r"[,;/|()\[\]]|\s[-–]\s")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+class Place(NamedTuple):
+    name: str
+    kind: str  # "city", "region" or "country"
+    region_code: Optional[str] = None
+    country_code: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    population: int = 0
+
+
+def _key(text: str) -> str:
+    """Lowercase ASCII lookup key ("Zürich" -> "zurich", "St. Louis" -> "st louis")."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def _region_index() -> Dict[str, str]:
+    index = {}
+    for prefix, table in (("US", US_STATES), ("CA", CA_PROVINCES)):
+        for abbr, name in table.items():
+            index[abbr.lower()] = f"{prefix}-{abbr}"
+            index[name] = f"{prefix}-{abbr}"
+    index.update(OTHER_REGIONS)
+    return index
+
+
+_REGIONS = _region_index()
+_CITIES: Optional[Dict[str, List[Place]]] = None
+
+
+def load_gazetteer() -> Dict[str, List[Place]]:
+    """Lookup key -> candidate places, loaded once from the bundled CSV."""
+    global _CITIES
+    if _CITIES is None:
+        cities: Dict[str, List[Place]] = {}
+        with open(GAZETTEER_PATH, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                place = Place(
+                    name=row["name"],
+                    kind="city",
+                    region_code=row["region_code"],
+                    country_code=row["country_code"],
+                    latitude=float(row["latitude"]),
+                    longitude=float(row["longitude"]),
+                    population=int(row["population"] or 0),
+                )
+                aliases = [a for a in (row.get("aliases") or "").split(";") if a]
+                for name in [row["name"], *aliases]:
+                    cities.setdefault(_key(name), []).append(place)
+        _CITIES = cities
+        logger.info(f"[Geo] Loaded {len(cities)} gazetteer keys")
+    return _CITIES
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 6) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """(lat_degrees, lon_degrees) spanned by one geohash cell."""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def covering_cells(min_lat: float, max_lat: float, min_lon: float, max_lon: float, precision: int) -> List[str]:
+    """Geohash cells at `precision` that together cover a bounding box."""
+    lat_step, lon_step = _cell_size(precision)
+    cells = set()
+    lat = max(min_lat, -90.0)
+    while True:
+        lon = max(min_lon, -180.0)
+        while True:
+            cells.add(geohash_encode(lat, lon, precision))
+            if lon >= max_lon:
+                break
+            lon = min(lon + lon_step, max_lon)
+        if lat >= max_lat:
+            break
+        lat = min(lat + lat_step, max_lat)
+    return sorted(cells)
+
+
+def _pick_city(candidates: List[Place], regions: set, countries: set) -> Optional[Place]:
+    """Most populous candidate consistent with any region/country mentioned alongside it."""
+    if regions:
+        candidates = [p for p in candidates if p.region_code in regions]
+    if countries:
+        candidates = [p for p in candidates if p.country_code in countries]
+    return max(candidates, key=lambda p: p.population) if candidates else None
+
+
+def resolve_location(text: Optional[str]) -> Optional[Place]:
+    """Resolve free text to the most specific known place, or None."""
+    if not text:
+        return None
+    cities = load_gazetteer()
+    parts = [_key(p) for p in _PART_SEPARATORS.split(_REMOTE.sub(" ", text))]
+    parts = [p for p in parts if p]
+    if not parts:
+        return None
+
+    regions = {_REGIONS[p] for p in parts if p in _REGIONS}
+    countries = {COUNTRIES[p] for p in parts if COUNTRIES.get(p)}
+    countries |= {code.split("-")[0] for code in regions}
+
+    for part in parts:
+        if part in cities:
+            place = _pick_city(cities[part], regions, countries)
+            if place:
+                return place
+            continue
+        # "San Francisco CA" without a comma: longest leading city name wins
+        tokens = part.split()
+        for end in range(len(tokens) - 1, 0, -1):
+            head, tail = " ".join(tokens[:end]), " ".join(tokens[end:])
+            if head in cities and (tail in _REGIONS or tail in COUNTRIES):
+                context_regions = regions | ({_REGIONS[tail]} if tail in _REGIONS else set())
+                context_countries = countries | ({COUNTRIES[tail]} if COUNTRIES.get(tail) else set())
+                place = _pick_city(cities[head], context_regions, context_countries)
+                if place:
+                    return place
+
+    for part in parts:
+        if part in _REGIONS:
+            code = _REGIONS[part]
+            return Place(name=part, kind="region", region_code=code, country_code=code.split("-")[0])
+    for part in parts:
+        if COUNTRIES.get(part):
+            return Place(name=part, kind="country", country_code=COUNTRIES[part])
+    return None
+
+
+def _truthy(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+
+def location_columns(location: Optional[str], remote=None, country_code: Optional[str] = None) -> Dict[str, object]:
+    """
+    JobPosting column values for a raw location string.
+    `remote` and `country_code` are TheirStack's own hints, used when present.
+    """
+    place = resolve_location(location)
+    columns = {
+        "latitude": None,
+        "longitude": None,
+        "geohash": None,
+        "geo_cell": None,
+        "region_code": place.region_code if place else None,
+        "country_code": (place.country_code if place else None) or (country_code or "").upper() or None,
+        "is_remote": _truthy(remote) or bool(location and _REMOTE.search(location)),
+    }
+    if place and place.latitude is not None:
+        geohash = geohash_encode(place.latitude, place.longitude)
+        columns.update(
+            latitude=place.latitude,
+            longitude=place.longitude,
+            geohash=geohash,
+            geo_cell=geohash[:settings.GEO_CELL_PRECISION],
+        )
+    return columns
+
+
+def parse_desired_location(text: str) -> Tuple[str, float]:
+    """Split "Austin, TX (25 mi)" / "within 30km of Denver" into (place text, radius km)."""
+    match = _RADIUS.search(text)
+    if not match:
+        return text.strip(), settings.GEO_DEFAULT_RADIUS_KM
+    value, unit = float(match.group(1)), match.group(2).lower()
+    radius_km = value * MILES_TO_KM if unit.startswith("mi") else value
+    place_text = (text[:match.start()] + " " + text[match.end():]).strip(" ,()")
+    return place_text, radius_km
+
+
+def radius_filter(latitude: float, longitude: float, radius_km: float):
+    """
+    Postings within `radius_km` of a point. The geohash-cell IN-list (or the
+    latitude index for very large radii) narrows candidates; the distance
+    check uses an equirectangular approximation, accurate well within the
+    radii used for job search.
+    """
+    lat_span = radius_km / KM_PER_DEGREE
+    lon_scale = max(math.cos(math.radians(latitude)), 0.01)
+    lon_span = lat_span / lon_scale
+    min_lat, max_lat = latitude - lat_span, latitude + lat_span
+    min_lon, max_lon = longitude - lon_span, longitude + lon_span
+
+    dlat = JobPosting.latitude - latitude
+    dlon = (JobPosting.longitude - longitude) * lon_scale
+    clauses = [
+        JobPosting.latitude.between(min_lat, max_lat),
+        JobPosting.longitude.between(min_lon, max_lon),
+        dlat * dlat + dlon * dlon <= lat_span * lat_span,
+    ]
+    lat_step, lon_step = _cell_size(settings.GEO_CELL_PRECISION)
+    estimated_cells = (2 * lat_span / lat_step + 2) * (2 * lon_span / lon_step + 2)
+    if estimated_cells <= settings.GEO_MAX_CELLS:
+        cells = covering_cells(min_lat, max_lat, min_lon, max_lon, settings.GEO_CELL_PRECISION)
+        clauses.insert(0, JobPosting.geo_cell.in_(cells))
+    return and_(*clauses)
+
+
+def _as_list(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return [v for v in value if v]
+
+
+def desired_locations_filter(desired_locations, remote_preference=None):
+    """
+    SQL clause matching a profile's desired locations and remote preference,
+    or None when the profile doesn't constrain location.
+
+    Postings not yet resolved (`is_remote` NULL) always pass, so rows awaiting
+    the backfill don't vanish from the feed.
+    """
+    clauses, countries = [], set()
+    for text in _as_list(desired_locations):
+        place_text, radius_km = parse_desired_location(text)
+        place = resolve_location(place_text)
+        if place is None:
+            clauses.append(JobPosting.location.ilike(f"%{place_text}%"))
+            continue
+        countries.add(place.country_code)
+        if place.kind == "city":
+            clauses.append(radius_filter(place.latitude, place.longitude, radius_km))
+        elif place.kind == "region":
+            clauses.append(JobPosting.region_code == place.region_code)
+        else:
+            clauses.append(JobPosting.country_code == place.country_code)
+
+    preference = RemotePreference(remote_preference) if remote_preference else None
+    located = or_(*clauses) if clauses else None
+
+    if preference == RemotePreference.ON_SITE:
+        on_site = JobPosting.is_remote.is_(False)
+        match = and_(on_site, located) if located is not None else on_site
+    else:
+        remote = JobPosting.is_remote.is_(True)
+        if countries:
+            # Remote roles restricted to another country don't count
+            remote = and_(remote, or_(JobPosting.country_code.is_(None), JobPosting.country_code.in_(countries)))
+        if preference == RemotePreference.REMOTE:
+            match = or_(remote, located) if located is not None else remote
+        elif located is None:
+            return None
+        elif preference == RemotePreference.HYBRID:
+            match = located
+        else:
+            match = or_(remote, located)
+
+    return or_(JobPosting.is_remote.is_(None), match)
+
+
+def backfill_job_locations(db: Session, batch_size: int = 500) -> int:
+    """Resolve locations for postings stored before geo columns existed."""
+    resolved = 0
+    last_id = 0
+    while True:
+        jobs = (
+            db.query(JobPosting)
+            .filter(JobPosting.is_remote.is_(None), JobPosting.id > last_id)
+            .order_by(JobPosting.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not jobs:
+            break
+        for job in jobs:
+            for column, value in location_columns(job.location).items():
+                setattr(job, column, value)
+            resolved += 1
+        last_id = jobs[-1].id
+        db.commit()
+
+    if resolved:
+        logger.info(f"[Geo] Resolved locations for {resolved} job postings")
+    return resolved
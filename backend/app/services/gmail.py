@@ -5,7 +5,7 @@ Replaces the mock implementation with:
 1. Authenticated Gmail API access via stored refresh tokens
 2. Fetching recent recruiter-like emails
 3. GPT-4 classification of email intent (confirmation, interview, rejection, etc.)
-4. Fuzzy company-name matching to existing applications
+4. Company matching to existing applications (indexed alias lookup, fuzzy fallback)
 5. Automatic status updates on the Kanban board
 """
 
@@ -14,7 +14,7 @@ import json
 import base64
 import re
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from sqlalchemy.orm import Session
 from google.oauth2.credentials import Credentials
@@ -23,6 +23,7 @@ from googleapiclient.errors import HttpError
 
 from app.core.config import settings
 from app.models import User, Application, ApplicationStatus, ApplicationStatusEvent
+from app.services import companies
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +65,9 @@ STATUS_MAP = {
     "other": ApplicationStatus.OTHER_UPDATE,
 }
 
+# Fuzzy matches scoring at least this (same words after normalisation) are saved as company aliases
+ALIAS_MIN_SCORE = 1.0
+
 
 def build_gmail_service(refresh_token: str):
     """
@@ -225,33 +229,64 @@ Rules:
 
 
 def match_to_application(
-    company_name: str, applications: List[Application]
+    company_name: str, applications: List[Application], db: Optional[Session] = None
 ) -> Optional[Application]:
     """
-    Fuzzy match a company name from an email to an existing application.
-    
-    Tries exact match first, then substring/contains matching, then
-    word-level overlap for fuzzy matching.
+    Match a company name from an email to an existing application.
+
+    Resolves the name through the companies table (an indexed alias lookup)
+    and matches on `company_id`. When no application shares that company
+    (e.g. "Google" vs a "Google Cloud" posting, or a posting whose
+    `company_id` is not backfilled yet) it falls back to fuzzy string
+    matching. A full-score fuzzy match (same words after normalisation) for
+    a name that resolved to no company is recorded as an alias so the next
+    email from it is an indexed lookup; weaker matches are used for this
+    email only, since an alias permanently merges two names into one company.
     """
     if not company_name or not applications:
         return None
 
-    company_lower = company_name.lower().strip()
+    company = None
+    if db is not None:
+        company = companies.find_company(db, company_name)
+        if company is not None:
+            for app in applications:
+                if app.job_posting.company_id == company.id:
+                    return app
+
+    match, score = _fuzzy_match_to_application(company_name, applications)
+    if (match and score >= ALIAS_MIN_SCORE and company is None
+            and db is not None and match.job_posting.company):
+        companies.add_alias(db, match.job_posting.company, company_name)
+    return match
+
+
+def _fuzzy_match_to_application(
+    company_name: str, applications: List[Application]
+) -> Tuple[Optional[Application], float]:
+    """
+    Fuzzy match on raw company strings: normalized key equality first, then
+    substring containment, then word-level overlap. Returns the best match
+    and its score (1.0 for equal names or word sets).
+    """
+    company_lower = companies.normalize_company_name(company_name)
     company_words = set(company_lower.split())
+    if not company_lower:
+        return None, 0
 
     best_match = None
     best_score = 0
 
     for app in applications:
-        app_company = (app.job_posting.company_name or "").lower().strip()
+        app_company = companies.normalize_company_name(app.job_posting.company_name)
         if not app_company:
             continue
 
         # Exact match
         if app_company == company_lower:
-            return app
+            return app, 1.0
 
-        # Contains match (e.g., "Google" in "Google LLC")
+        # Contains match (e.g., "Google" in "Google Cloud")
         if company_lower in app_company or app_company in company_lower:
             score = 0.8
             if score > best_score:
@@ -259,7 +294,7 @@ def match_to_application(
                 best_match = app
                 continue
 
-        # Word overlap (e.g., "Google Inc" vs "Google LLC")
+        # Word overlap (e.g., "Google Cloud" vs "Google Ads")
         app_words = set(app_company.split())
         overlap = company_words & app_words
         if overlap:
@@ -272,7 +307,7 @@ def match_to_application(
     if best_match:
         logger.info(f"[Gmail] Matched '{company_name}' → '{best_match.job_posting.company_name}' (score: {best_score:.2f})")
 
-    return best_match
+    return best_match, best_score
 
 
 def poll_user_gmail(user_id: int, db: Session) -> List[Dict]:
@@ -356,7 +391,7 @@ def poll_user_gmail(user_id: int, db: Session) -> List[Dict]:
             continue
 
         # Match to an application
-        matched_app = match_to_application(company_name, applications)
+        matched_app = match_to_application(company_name, applications, db)
         if not matched_app:
             logger.info(f"[Gmail] No application match for company '{company_name}'")
             continue
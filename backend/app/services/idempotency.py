@@ -0,0 +1,75 @@
+"""
+Idempotency-Key support for retry-prone endpoints.
+
+Clients on flaky mobile networks may resend the same request. When a
+request carries an `Idempotency-Key` header, its response is stored together
+with the work it did (same transaction); a retry with the same key gets the
+stored response back and does nothing new. Keys are per user and expire
+after `IDEMPOTENCY_KEY_TTL_HOURS`.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+
+
+def stored_response(db: Session, user_id: int, key: Optional[str], endpoint: str) -> Optional[Any]:
+    """Response previously stored for this key, or None if the request is new."""
+    if not key:
+        return None
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters")
+
+    record = (
+        db.query(IdempotencyKey)
+        .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        .first()
+    )
+    if record is None:
+        return None
+    if record.endpoint != endpoint:
+        raise HTTPException(status_code=409, detail="Idempotency-Key was already used for a different request")
+    return record.response
+
+
+def commit_with_response(db: Session, user_id: int, key: Optional[str], endpoint: str, response: Any) -> Any:
+    """
+    Commit the pending work, storing `response` under the key if one was sent.
+
+    If a concurrent request with the same key committed first, this request's
+    work is rolled back and the winner's response is returned instead.
+    """
+    if not key:
+        db.commit()
+        return response
+
+    db.add(IdempotencyKey(user_id=user_id, key=key, endpoint=endpoint, response=response))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing = stored_response(db, user_id, key, endpoint)
+        if existing is None:
+            raise
+        return existing
+    return response
+
+
+def purge_expired_keys(db: Session) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    deleted = db.query(IdempotencyKey).filter(IdempotencyKey.created_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    if deleted:
+        logger.info(f"[Idempotency] Purged {deleted} expired keys")
+    return deleted
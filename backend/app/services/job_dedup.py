@@ -0,0 +1,317 @@
+"""
+Near-duplicate job detection with SimHash.
+
+The same role often comes back from TheirStack under several external ids
+(reposts, aggregator copies). At ingestion each posting gets a 64-bit
+SimHash over its normalized title, company and description. The hash is
+split into six 10-11 bit bands stored in indexed columns: by pigeonhole,
+any two postings within `JOB_DEDUP_MAX_HAMMING` (<= 5) bits of each other
+must share at least one band exactly, so candidate lookup is an indexed
+equality query rather than a scan over the whole table.
+
+Duplicates are still stored (so the external_id check keeps skipping them)
+but point at their canonical posting via `canonical_id`, and are hidden
+from recommendations. Only live postings (not dead, expired or archived)
+serve as canonicals: when a canonical leaves the live pool,
+`release_duplicates` promotes its oldest live duplicate and relinks the
+rest, so the role doesn't vanish from the feed with it.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.models import JobPosting
+from app.services.companies import LEGAL_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+# Band widths must sum to SIMHASH_BITS; len(BAND_WIDTHS) - 1 is the largest
+# Hamming threshold the band lookup can guarantee to find.
+BAND_WIDTHS = [11, 11, 11, 11, 10, 10]
+NUM_BANDS = len(BAND_WIDTHS)
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+# Title and company carry more signal than boilerplate description text
+TITLE_WEIGHT = 3
+COMPANY_WEIGHT = 3
+SHINGLE_SIZE = 3
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def normalize_text(text: Optional[str]) -> List[str]:
+    """Lowercase, drop markup/punctuation and split into tokens."""
+    if not text:
+        return []
+    text = _HTML_TAG.sub(" ", text.lower())
+    return _NON_ALNUM.sub(" ", text).split()
+
+
+def _hash64(token: str) -> int:
+    # Stable across processes, unlike the builtin hash()
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def _features(title: str, company: str, description: str) -> Dict[str, int]:
+    """Weighted feature set: title/company tokens plus description word shingles."""
+    features: Dict[str, int] = {}
+    for token in normalize_text(title):
+        features[f"t:{token}"] = features.get(f"t:{token}", 0) + TITLE_WEIGHT
+    for token in normalize_text(company):
+        if token in LEGAL_SUFFIXES:
+            continue
+        features[f"c:{token}"] = features.get(f"c:{token}", 0) + COMPANY_WEIGHT
+
+    words = normalize_text(description)
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    for shingle in shingles:
+        features[f"d:{shingle}"] = features.get(f"d:{shingle}", 0) + 1
+    return features
+
+
+def simhash(title: str, company: str, description: str) -> int:
+    """Compute an unsigned 64-bit SimHash for a posting."""
+    features = _features(title, company, description)
+    if not features:
+        return 0
+
+    hashes = np.fromiter((_hash64(f) for f in features), dtype=np.uint64, count=len(features))
+    weights = np.fromiter(features.values(), dtype=np.int64, count=len(features))
+    # (features x 64) matrix of bits, mapped to +1/-1 and weighted per feature
+    bits = ((hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)).astype(np.int64)
+    totals = weights @ (2 * bits - 1)
+
+    value = 0
+    for bit in np.flatnonzero(totals > 0):
+        value |= 1 << int(bit)
+    return value
+
+
+def bands(value: int) -> List[int]:
+    """Split a 64-bit hash into NUM_BANDS band keys."""
+    keys, shift = [], 0
+    for width in BAND_WIDTHS:
+        keys.append((value >> shift) & ((1 << width) - 1))
+        shift += width
+    return keys
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count("1")
+
+
+def _to_signed(value: int) -> int:
+    """Store as a signed 64-bit integer so it fits a BIGINT column."""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << SIMHASH_BITS) if value < 0 else value
+
+
+def fingerprint_columns(title: str, company: str, description: str) -> Dict[str, int]:
+    """SimHash and band column values for a posting."""
+    value = simhash(title or "", company or "", description or "")
+    columns = {"simhash": _to_signed(value)}
+    for i, key in enumerate(bands(value)):
+        columns[f"simhash_band_{i}"] = key
+    return columns
+
+
+def fingerprint_job(job: JobPosting):
+    """Populate the SimHash and band columns on a posting."""
+    for column, value in fingerprint_columns(job.title, job.company_name, job.description).items():
+        setattr(job, column, value)
+
+
+def find_canonical(db: Session, job: JobPosting) -> Optional[JobPosting]:
+    """
+    Return the live canonical posting `job` duplicates, if any.
+
+    Candidates are canonical postings sharing at least one band; the closest
+    one within the Hamming threshold wins, ties going to the oldest.
+    """
+    if job.simhash is None:
+        return None
+
+    candidates = (
+        db.query(JobPosting)
+        .filter(
+            JobPosting.canonical_id.is_(None),
+            JobPosting.expired_at.is_(None),
+            JobPosting.dead_at.is_(None),
+            JobPosting.simhash.isnot(None),
+            or_(*[
+                getattr(JobPosting, f"simhash_band_{i}") == getattr(job, f"simhash_band_{i}")
+                for i in range(NUM_BANDS)
+            ]),
+        )
+        .order_by(JobPosting.id)
+        .all()
+    )
+
+    value = _to_unsigned(job.simhash)
+    best, best_distance = None, settings.JOB_DEDUP_MAX_HAMMING + 1
+    for candidate in candidates:
+        if candidate.id == job.id:
+            continue
+        distance = hamming_distance(value, _to_unsigned(candidate.simhash))
+        if distance < best_distance:
+            best, best_distance = candidate, distance
+    return best
+
+
+def link_duplicate(db: Session, job: JobPosting) -> bool:
+    """
+    Fingerprint `job` and point it at its canonical posting if it is a
+    near-duplicate. Returns True when `job` was marked as a duplicate.
+    """
+    if job.simhash is None:
+        fingerprint_job(job)
+    canonical = find_canonical(db, job)
+    if canonical is None:
+        return False
+
+    job.canonical_id = canonical.id
+    logger.info(
+        f"[Dedup] '{job.title}' @ {job.company_name} ({job.external_id}) "
+        f"duplicates job {canonical.id} ({canonical.external_id})"
+    )
+    return True
+
+
+def link_duplicates_for_ids(db: Session, job_ids: List[int]) -> int:
+    """
+    Batch variant of `link_duplicate` for freshly inserted, fingerprinted rows.
+
+    One candidate query covers the whole batch; rows are then resolved in id
+    order so earlier rows in the batch can serve as canonicals for later ones.
+    Returns the number of rows marked as duplicates.
+    """
+    if not job_ids:
+        return 0
+
+    new_rows = (
+        db.query(JobPosting.id, JobPosting.simhash, *[getattr(JobPosting, f"simhash_band_{i}") for i in range(NUM_BANDS)])
+        .filter(JobPosting.id.in_(job_ids), JobPosting.simhash.isnot(None))
+        .order_by(JobPosting.id)
+        .all()
+    )
+    if not new_rows:
+        return 0
+
+    band_values = [{row[2 + i] for row in new_rows} for i in range(NUM_BANDS)]
+    candidates = (
+        db.query(JobPosting.id, JobPosting.simhash, *[getattr(JobPosting, f"simhash_band_{i}") for i in range(NUM_BANDS)])
+        .filter(
+            JobPosting.canonical_id.is_(None),
+            JobPosting.expired_at.is_(None),
+            JobPosting.dead_at.is_(None),
+            JobPosting.simhash.isnot(None),
+            or_(*[
+                getattr(JobPosting, f"simhash_band_{i}").in_(band_values[i])
+                for i in range(NUM_BANDS)
+            ]),
+        )
+        .all()
+    )
+
+    # band index -> band value -> [(id, simhash)] of canonical rows
+    index: List[Dict[int, List]] = [{} for _ in range(NUM_BANDS)]
+    for row in candidates:
+        for i in range(NUM_BANDS):
+            index[i].setdefault(row[2 + i], []).append((row[0], _to_unsigned(row[1])))
+
+    duplicate_ids = set()
+    updates = []
+    for row in new_rows:
+        job_id, value = row[0], _to_unsigned(row[1])
+        best, best_distance = None, settings.JOB_DEDUP_MAX_HAMMING + 1
+        for i in range(NUM_BANDS):
+            for cand_id, cand_value in index[i].get(row[2 + i], []):
+                if cand_id >= job_id or cand_id in duplicate_ids:
+                    continue
+                distance = hamming_distance(value, cand_value)
+                if distance > settings.JOB_DEDUP_MAX_HAMMING:
+                    continue
+                if distance < best_distance or (distance == best_distance and cand_id < best):
+                    best, best_distance = cand_id, distance
+        if best is not None:
+            duplicate_ids.add(job_id)
+            updates.append({"id": job_id, "canonical_id": best})
+
+    if updates:
+        db.bulk_update_mappings(JobPosting, updates)
+    return len(updates)
+
+
+def release_duplicates(db: Session, canonical_ids: List[int]) -> int:
+    """
+    Re-home the duplicates of postings that just died, expired or are about
+    to be archived. Call after the canonicals' `dead_at`/`expired_at` is set.
+
+    Duplicates are unlinked and run back through the batch linker: the
+    oldest live one becomes canonical and the others link to it (or to any
+    other live canonical they are close to). Returns the number promoted.
+    """
+    if not canonical_ids:
+        return 0
+    duplicate_ids = [
+        row[0] for row in
+        db.query(JobPosting.id).filter(JobPosting.canonical_id.in_(canonical_ids))
+    ]
+    if not duplicate_ids:
+        return 0
+
+    db.query(JobPosting).filter(JobPosting.id.in_(duplicate_ids)).update(
+        {JobPosting.canonical_id: None}, synchronize_session=False
+    )
+    relinked = link_duplicates_for_ids(db, duplicate_ids)
+    promoted = len(duplicate_ids) - relinked
+    logger.info(
+        f"[Dedup] Released {len(duplicate_ids)} duplicates of {len(canonical_ids)} "
+        f"retired postings ({promoted} promoted to canonical)"
+    )
+    return promoted
+
+
+def release_stranded_duplicates(db: Session) -> int:
+    """
+    Daily sweep: release duplicates whose canonical already died or expired
+    (e.g. before `release_duplicates` was wired in). Returns the number promoted.
+    """
+    canonical = aliased(JobPosting)
+    retired_ids = [
+        row[0] for row in
+        db.query(canonical.id)
+        .join(JobPosting, JobPosting.canonical_id == canonical.id)
+        .filter(or_(canonical.dead_at.isnot(None), canonical.expired_at.isnot(None)))
+        .distinct()
+    ]
+    promoted = release_duplicates(db, retired_ids)
+    db.commit()
+    return promoted
+
+
+def duplicate_stats(db: Session) -> Dict[str, float]:
+    """Share of stored postings that collapsed onto another canonical posting."""
+    total = db.query(JobPosting).count()
+    duplicates = db.query(JobPosting).filter(JobPosting.canonical_id.isnot(None)).count()
+    return {
+        "total": total,
+        "duplicates": duplicates,
+        "canonical": total - duplicates,
+        "duplicate_rate": duplicates / total if total else 0.0,
+    }
@@ -8,12 +8,14 @@ and job description embeddings.
 
 import logging
 import numpy as np
+from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 
 from app.models import JobPosting, User
 from app.services.theirstack import theirstack_service
-from app.services import embedding
+from app.services import embedding, companies, geo, job_dedup, job_text
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,66 @@ def ingest_jobs(db: Session):
     pass
 
 
+def _parse_posted_at(value) -> Optional[datetime]:
+    """Parse TheirStack's `date_posted` (ISO date or datetime); None if absent/invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def job_columns(job_data: dict) -> dict:
+    """
+    Map a TheirStack-shaped job dict onto JobPosting column values.
+
+    Shared by live fetches and the bulk importer so every posting gets the
+    same cleaning, compression, fingerprinting and location resolution.
+    """
+    title = job_data.get("job_title") or "Unknown Title"
+    company_name = job_data.get("company") or "Unknown Company"
+    cleaned = job_text.clean_description(job_data.get("description") or job_data.get("Snippet"))
+
+    columns = {
+        "external_id": str(job_data.get("id")),
+        "title": title,
+        "company_name": company_name,
+        "location": job_data.get("location") or "",
+        "salary_range": job_data.get("salary_string"),
+        "url": job_data.get("url"),
+        "employment_type": "FULL_TIME",
+        "posted_at": _parse_posted_at(job_data.get("date_posted")),
+    }
+    columns.update(job_text.description_columns(cleaned))
+    columns.update(job_dedup.fingerprint_columns(title, company_name, cleaned))
+    columns.update(geo.location_columns(
+        job_data.get("location"), remote=job_data.get("remote"), country_code=job_data.get("country_code")
+    ))
+    return columns
+
+
+def company_attributes(job_data: dict) -> dict:
+    """Company attributes from TheirStack's nested `company_object` or flat CSV columns."""
+    company_object = job_data.get("company_object") or {}
+    return {
+        "employee_count": company_object.get("employee_count") or job_data.get("company_employee_count"),
+        "domain": company_object.get("domain") or job_data.get("company_domain"),
+        "industry": company_object.get("industry") or job_data.get("company_industry"),
+    }
+
+
+def resolve_company(db: Session, job_data: dict):
+    """Get or create the Company for a job dict, recording TheirStack's own name as an alias."""
+    company = companies.get_or_create_company(
+        db, job_data.get("company") or "Unknown Company", company_attributes(job_data)
+    )
+    company_object = job_data.get("company_object") or {}
+    if company and company_object.get("name"):
+        companies.add_alias(db, company, company_object["name"])
+    return company
+
+
 def cosine_similarity(vec_a: List[float], vec_b: List[float]) -> float:
     """
     Compute cosine similarity between two vectors using numpy.
@@ -74,9 +136,10 @@ def rank_jobs_by_embedding(
 
     for job in jobs:
         # Generate embedding for job description on-the-fly if not cached
-        if job.description:
+        excerpt = job_text.description_excerpt(job)
+        if excerpt:
             try:
-                job_vec = embedding.generate_embedding(job.description[:2000])
+                job_vec = embedding.generate_embedding(excerpt)
                 if job_vec:
                     score = cosine_similarity(resume_vec, job_vec)
                     scored_jobs.append((score, job))
@@ -142,30 +205,39 @@ def fetch_jobs_for_user(db: Session, user: User, limit: int = 20):
     logger.info(f"Fetched {len(jobs_data)} jobs from TheirStack for user {user.email}")
 
     new_jobs = []
+    duplicates = 0
     for job_data in jobs_data:
         # Avoid dupes
         external_id = str(job_data.get("id"))
         existing = db.query(JobPosting).filter(JobPosting.external_id == external_id).first()
         if existing:
+            # TheirStack still lists it: the TTL restarts, and an expired posting is live again
+            existing.fetched_at = func.now()
+            existing.expired_at = None
             continue
             
-        new_job = JobPosting(
-            external_id=external_id,
-            title=job_data.get("job_title", "Unknown Title"),
-            company_name=job_data.get("company", "Unknown Company"),
-            location=job_data.get("location", ""),
-            salary_range=job_data.get("salary_string"),
-            description=job_data.get("description") or job_data.get("Snippet") or "",
-            url=job_data.get("url"),
-            employment_type="FULL_TIME"
-        )
+        company = resolve_company(db, job_data)
+        new_job = JobPosting(**job_columns(job_data), company_id=company.id if company else None)
+        if job_dedup.link_duplicate(db, new_job):
+            duplicates += 1
         db.add(new_job)
+        db.flush()  # Make it visible to near-duplicate lookups for the rest of the batch
         new_jobs.append(new_job)
     
     db.commit()
+    if duplicates:
+        logger.info(f"[Dedup] {duplicates}/{len(new_jobs)} new jobs were near-duplicates")
 
     # Rank all available jobs for this user by embedding similarity
-    all_jobs = db.query(JobPosting).limit(limit * 2).all()
+    all_jobs = (
+        db.query(JobPosting)
+        .filter(
+            JobPosting.expired_at.is_(None),
+            JobPosting.dead_at.is_(None),
+            JobPosting.canonical_id.is_(None),
+        )
+        .limit(limit * 2).all()
+    )
     ranked_jobs = rank_jobs_by_embedding(user, all_jobs, db)
 
     return ranked_jobs[:limit]
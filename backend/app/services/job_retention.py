@@ -0,0 +1,193 @@
+"""
+Job posting retention — expiry, archival and table compaction.
+
+TheirStack results are only useful for a few weeks. Postings past the TTL
+(measured from `fetched_at`) or past the maximum posting age (measured from
+`posted_at`) are moved out of `job_postings`:
+
+- Unreferenced postings are copied to `job_postings_archive` and deleted
+  from the hot table.
+- Postings an application or swipe still points at stay in place (so the
+  dashboard and swipe history keep working) but get `expired_at` set, which
+  excludes them from recommendations. Later runs archive them once nothing
+  refers to them any more (e.g. the user deleted their account).
+
+Duplicates of a posting that expires or is archived are handed to
+`job_dedup.release_duplicates`, so a live copy takes over as canonical.
+
+Work runs in bounded batches with a commit per batch so a large backlog
+never holds one long transaction.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import or_, and_, insert, delete, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import JobPosting, ArchivedJobPosting, Application, SwipeAction
+from app.services import job_dedup
+
+logger = logging.getLogger(__name__)
+
+# Archive column name -> JobPosting attribute it is copied from
+ARCHIVE_COLUMNS = {
+    "id": "id", "external_id": "external_id", "title": "title",
+    "company_name": "company_name", "location": "location",
+    "salary_range": "salary_range", "description": "description_raw",
+    "description_zlib": "description_zlib", "employment_type": "employment_type",
+    "url": "url", "posted_at": "posted_at", "fetched_at": "fetched_at",
+}
+
+
+def _expiry_filter(now: datetime):
+    """SQL condition matching postings past either retention limit."""
+    fetched_cutoff = now - timedelta(days=settings.JOB_TTL_DAYS)
+    posted_cutoff = now - timedelta(days=settings.JOB_MAX_POSTING_AGE_DAYS)
+    return and_(
+        JobPosting.expired_at.is_(None),
+        or_(
+            JobPosting.fetched_at < fetched_cutoff,
+            JobPosting.posted_at < posted_cutoff,
+        ),
+    )
+
+
+def _referenced_ids(db: Session, job_ids: List[int]) -> set:
+    """Subset of job_ids that an application or swipe still refers to."""
+    referenced = {
+        row[0] for row in
+        db.query(Application.job_posting_id)
+        .filter(Application.job_posting_id.in_(job_ids))
+        .distinct()
+    }
+    referenced.update(
+        row[0] for row in
+        db.query(SwipeAction.job_posting_id)
+        .filter(SwipeAction.job_posting_id.in_(job_ids))
+        .distinct()
+    )
+    return referenced
+
+
+def _archive(db: Session, job_ids: List[int]):
+    """Copy postings to the archive table and delete them from the hot table."""
+    if not job_ids:
+        return
+    source = [getattr(JobPosting, attr) for attr in ARCHIVE_COLUMNS.values()]
+    db.execute(
+        insert(ArchivedJobPosting).from_select(
+            list(ARCHIVE_COLUMNS),
+            db.query(*source).filter(JobPosting.id.in_(job_ids)),
+        )
+    )
+    db.execute(delete(JobPosting).where(JobPosting.id.in_(job_ids)))
+
+
+def archive_expired_jobs(
+    db: Session,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Archive or flag every posting past its retention window.
+
+    Returns counts of archived (moved to cold storage) and expired
+    (kept hot because still referenced) postings.
+    """
+    batch_size = batch_size or settings.JOB_ARCHIVE_BATCH_SIZE
+    now = datetime.now(timezone.utc)
+    stats = {"archived": 0, "expired": 0, "batches": 0}
+
+    while max_batches is None or stats["batches"] < max_batches:
+        job_ids = [
+            row[0] for row in
+            db.query(JobPosting.id)
+            .filter(_expiry_filter(now))
+            .order_by(JobPosting.id)
+            .limit(batch_size)
+        ]
+        if not job_ids:
+            break
+
+        referenced = _referenced_ids(db, job_ids)
+        archivable = [job_id for job_id in job_ids if job_id not in referenced]
+
+        # Flag the whole batch first so none of it can be picked as a new canonical
+        db.query(JobPosting).filter(JobPosting.id.in_(job_ids)).update(
+            {JobPosting.expired_at: now}, synchronize_session=False
+        )
+        job_dedup.release_duplicates(db, job_ids)
+
+        _archive(db, archivable)
+        db.commit()
+        stats["archived"] += len(archivable)
+        stats["expired"] += len(referenced)
+        stats["batches"] += 1
+
+    logger.info(
+        f"[Retention] Archived {stats['archived']} postings, "
+        f"flagged {stats['expired']} referenced postings as expired "
+        f"({stats['batches']} batches)"
+    )
+    return stats
+
+
+def archive_released_jobs(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    Archive postings kept hot only because something referenced them when
+    they expired, now that nothing does. Walks the expired rows by id so
+    still-referenced ones are visited once per run. Returns the count archived.
+    """
+    batch_size = batch_size or settings.JOB_ARCHIVE_BATCH_SIZE
+    archived, last_id = 0, 0
+    while True:
+        job_ids = [
+            row[0] for row in
+            db.query(JobPosting.id)
+            .filter(JobPosting.expired_at.isnot(None), JobPosting.id > last_id)
+            .order_by(JobPosting.id)
+            .limit(batch_size)
+        ]
+        if not job_ids:
+            break
+        last_id = job_ids[-1]
+
+        referenced = _referenced_ids(db, job_ids)
+        released = [job_id for job_id in job_ids if job_id not in referenced]
+        if released:
+            job_dedup.release_duplicates(db, released)
+            _archive(db, released)
+            db.commit()
+            archived += len(released)
+
+    if archived:
+        logger.info(f"[Retention] Archived {archived} expired postings no longer referenced")
+    return archived
+
+
+def compact_job_tables(db: Session):
+    """
+    Reclaim space freed by archival.
+
+    VACUUM cannot run inside a transaction, so this uses a dedicated
+    autocommit connection from the session's engine.
+    """
+    engine = db.get_bind()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("VACUUM ANALYZE job_postings"))
+        elif engine.dialect.name == "sqlite":
+            conn.execute(text("VACUUM"))
+    logger.info(f"[Retention] Compacted job tables ({engine.dialect.name})")
+
+
+def run_retention(db: Session) -> Dict[str, int]:
+    """Archive expired postings, then compact if anything was removed."""
+    stats = archive_expired_jobs(db)
+    stats["archived"] += archive_released_jobs(db)
+    if stats["archived"]:
+        compact_job_tables(db)
+    return stats
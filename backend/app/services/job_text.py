@@ -0,0 +1,115 @@
+"""
+Job description normalization and compressed storage.
+
+TheirStack descriptions arrive as raw text or HTML, sometimes tens of KB.
+At ingestion they are cleaned once (HTML stripped, whitespace normalized),
+stored zlib-compressed in `JobPosting.description_zlib`, and a plain-text
+excerpt is precomputed for the embedding and cover-letter prompt builders.
+`JobPosting.description` decompresses on access.
+"""
+
+import logging
+import re
+import zlib
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+_LOOKS_LIKE_HTML = re.compile(r"<[a-zA-Z/!][^>]*>")
+_INLINE_WHITESPACE = re.compile(r"[ \t\r\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+# Block-level tags whose boundaries should become line breaks
+_BLOCK_TAGS = ["p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "section"]
+
+
+def clean_description(raw: Optional[str]) -> str:
+    """Strip HTML and normalize whitespace, keeping paragraph breaks."""
+    if not raw:
+        return ""
+
+    text = raw
+    if _LOOKS_LIKE_HTML.search(raw):
+        soup = BeautifulSoup(raw, "html.parser")
+        for tag in soup(["script", "style"]):
+            tag.decompose()
+        for tag in soup.find_all(_BLOCK_TAGS):
+            tag.insert_before("\n")
+            tag.insert_after("\n")
+        text = soup.get_text()
+
+    lines = [_INLINE_WHITESPACE.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def make_excerpt(text: str, max_chars: Optional[int] = None) -> str:
+    """Leading plain-text excerpt, cut at a word boundary."""
+    max_chars = max_chars or settings.JOB_DESCRIPTION_EXCERPT_CHARS
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars].rstrip()
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), settings.JOB_DESCRIPTION_ZLIB_LEVEL)
+
+
+def decompress_text(data: Optional[bytes]) -> str:
+    if not data:
+        return ""
+    return zlib.decompress(data).decode("utf-8")
+
+
+def description_columns(cleaned: str) -> Dict[str, Optional[object]]:
+    """Column values for an already-cleaned description."""
+    return {
+        "description_zlib": compress_text(cleaned) if cleaned else None,
+        "description_excerpt": make_excerpt(cleaned) if cleaned else None,
+        "description_raw": None,
+    }
+
+
+def store_description(job: JobPosting, raw: Optional[str]):
+    """Clean, compress and excerpt a raw description onto a posting."""
+    for column, value in description_columns(clean_description(raw)).items():
+        setattr(job, column, value)
+
+
+def description_excerpt(job: JobPosting) -> str:
+    """Precomputed excerpt, falling back to the full text for legacy rows."""
+    if job.description_excerpt:
+        return job.description_excerpt
+    return make_excerpt(job.description or "")
+
+
+def compress_legacy_descriptions(db: Session, batch_size: int = 500) -> int:
+    """
+    Move descriptions stored before compression into the compressed columns.
+    Returns the number of postings converted.
+    """
+    converted = 0
+    while True:
+        jobs = (
+            db.query(JobPosting)
+            .filter(JobPosting.description_raw.isnot(None))
+            .order_by(JobPosting.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not jobs:
+            break
+        for job in jobs:
+            store_description(job, job.description_raw)
+        db.commit()
+        converted += len(jobs)
+
+    if converted:
+        logger.info(f"[JobText] Compressed {converted} legacy job descriptions")
+    return converted
@@ -0,0 +1,76 @@
+"""
+Database-lease leader election.
+
+A lease is a row in `scheduler_leases` naming its current holder and an
+expiry. Acquiring or renewing is one conditional UPDATE (succeeds only if we
+already hold the lease or it has expired), falling back to an INSERT for a
+lease that doesn't exist yet — both atomic on Postgres and SQLite, so at
+most one process holds a given lease at a time. A holder that dies simply
+stops renewing and is replaced once the lease expires.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+
+def try_acquire(db: Session, name: str, holder: str, ttl_seconds: int) -> bool:
+    """Acquire or renew lease `name` for `holder`; True if we hold it afterwards."""
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=ttl_seconds)
+
+    result = db.execute(
+        update(SchedulerLease)
+        .where(
+            SchedulerLease.name == name,
+            or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now),
+        )
+        .values(
+            holder=holder,
+            expires_at=expires_at,
+            acquired_at=case((SchedulerLease.holder == holder, SchedulerLease.acquired_at), else_=now),
+        )
+    )
+    if result.rowcount == 1:
+        db.commit()
+        return True
+    db.rollback()
+
+    if db.query(SchedulerLease.name).filter(SchedulerLease.name == name).first():
+        return False  # Someone else holds a live lease
+
+    db.add(SchedulerLease(name=name, holder=holder, acquired_at=now, expires_at=expires_at))
+    try:
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()  # Another process created it first
+        return False
+
+
+def holds(db: Session, name: str, holder: str) -> bool:
+    """True if `holder` currently holds an unexpired lease `name` (read only)."""
+    now = datetime.now(timezone.utc)
+    return db.query(SchedulerLease.name).filter(
+        SchedulerLease.name == name,
+        SchedulerLease.holder == holder,
+        SchedulerLease.expires_at >= now,
+    ).first() is not None
+
+
+def release(db: Session, name: str, holder: str):
+    """Give up a lease we hold so another process can take over immediately."""
+    db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+        .values(expires_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+
@@ -0,0 +1,249 @@
+"""
+Background dead-link revalidation for job postings.
+
+Many TheirStack URLs are closed by the time a user swipes right, and
+automation would otherwise spend a full Chromium session finding that out.
+This validator periodically checks `JobPosting.url` over a pooled async
+HTTP client — one bounded GET whose visible text is searched for "position
+filled" style markers — with a global concurrency cap and a per-host rate
+limit.
+
+Postings that return 404/410 or show a closed-posting marker get `dead_at`
+set and drop out of recommendations. Dead postings are rechecked on a
+slower interval and `dead_at` is cleared if the page comes back live, so a
+false positive is not permanent. Transient failures (timeouts, 429, 5xx)
+never change a posting's state; it is simply rechecked after the next
+interval.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from bs4 import BeautifulSoup, Comment
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import JobPosting
+from app.services import job_dedup
+
+logger = logging.getLogger(__name__)
+
+DEAD_STATUS_CODES = {404, 410}
+
+# Lowercase phrases ATS pages show once a posting is closed. Only specific
+# wording belongs here: generic strings like "job not found" also appear in
+# the error copy of live pages.
+CLOSED_MARKERS = [
+    "position has been filled",
+    "no longer accepting applications",
+    "no longer accepting applicants",
+    "job is no longer available",
+    "job you are looking for is no longer",
+    "this job has expired",
+    "this posting has closed",
+    "this position is no longer",
+    "job posting is no longer",
+    "this job is closed",
+]
+
+# Elements whose text never renders on the page
+INVISIBLE_TAGS = {"script", "style", "noscript", "template"}
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class _HostLimiter:
+    """Caps concurrent requests per host and spaces them by a minimum interval."""
+
+    def __init__(self, concurrency: int, min_interval: float):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._last_request: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.concurrency)
+            self._locks[host] = asyncio.Lock()
+        return self._semaphores[host]
+
+    async def wait_turn(self, host: str):
+        async with self._locks[host]:
+            elapsed = time.monotonic() - self._last_request.get(host, 0.0)
+            if elapsed < self.min_interval:
+                await asyncio.sleep(self.min_interval - elapsed)
+            self._last_request[host] = time.monotonic()
+
+
+def visible_text(page) -> str:
+    """
+    Rendered text of an HTML string or an already parsed soup.
+
+    Script, style and template contents (bundled JS, i18n tables, JSON
+    state) are skipped, so markers only match copy a user would see. The
+    soup is not modified.
+    """
+    soup = page if isinstance(page, BeautifulSoup) else BeautifulSoup(page, "html.parser")
+    parts = [
+        text for text in soup.find_all(string=True)
+        if not isinstance(text, Comment) and text.parent.name not in INVISIBLE_TAGS
+    ]
+    return " ".join(" ".join(parts).split())
+
+
+def find_closed_marker(text: str) -> Optional[str]:
+    """First closed-posting marker in `text`, which should be visible page text."""
+    lowered = text.lower()
+    for marker in CLOSED_MARKERS:
+        if marker in lowered:
+            return marker
+    return None
+
+
+async def check_url(client: httpx.AsyncClient, url: str) -> Tuple[Optional[bool], Optional[int], str]:
+    """
+    Check one posting URL.
+
+    Returns (is_dead, status_code, reason); is_dead is None when the result
+    is inconclusive (network error, rate limited, server error).
+    """
+    try:
+        # A live status still needs the body to spot closed-posting pages,
+        # so a single streamed GET covers both checks.
+        async with client.stream("GET", url) as response:
+            if response.status_code in DEAD_STATUS_CODES:
+                return True, response.status_code, f"HTTP {response.status_code}"
+            if response.status_code >= 400:
+                return None, response.status_code, f"HTTP {response.status_code}"
+
+            body = b""
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= settings.LINK_CHECK_MAX_BYTES:
+                    break
+
+            marker = find_closed_marker(visible_text(body.decode("utf-8", errors="ignore")))
+            if marker:
+                return True, response.status_code, f"Closed marker: '{marker}'"
+            return False, response.status_code, "OK"
+
+    except httpx.HTTPError as e:
+        return None, None, f"{type(e).__name__}: {e}"
+
+
+async def check_urls(jobs: List[Tuple[int, str]]) -> Dict[int, Tuple[Optional[bool], Optional[int], str]]:
+    """Check many (job_id, url) pairs concurrently under global and per-host limits."""
+    limiter = _HostLimiter(
+        settings.LINK_CHECK_PER_HOST_CONCURRENCY, settings.LINK_CHECK_PER_HOST_INTERVAL
+    )
+    global_semaphore = asyncio.Semaphore(settings.LINK_CHECK_CONCURRENCY)
+    results = {}
+
+    timeout = httpx.Timeout(
+        settings.LINK_CHECK_TIMEOUT, connect=settings.LINK_CHECK_CONNECT_TIMEOUT
+    )
+    limits = httpx.Limits(
+        max_connections=settings.LINK_CHECK_CONCURRENCY,
+        max_keepalive_connections=settings.LINK_CHECK_CONCURRENCY,
+    )
+
+    async with httpx.AsyncClient(
+        timeout=timeout,
+        limits=limits,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+    ) as client:
+
+        async def run(job_id: int, url: str):
+            host = urlparse(url).netloc.lower()
+            # Per-host pacing first: URLs queued behind a slow host wait without holding global slots
+            async with limiter.semaphore(host):
+                await limiter.wait_turn(host)
+                async with global_semaphore:
+                    results[job_id] = await check_url(client, url)
+
+        await asyncio.gather(*(run(job_id, url) for job_id, url in jobs))
+
+    return results
+
+
+def _due_for_check(db: Session, limit: int) -> List[Tuple[int, str]]:
+    now = datetime.now(timezone.utc)
+    recheck_before = now - timedelta(hours=settings.LINK_CHECK_INTERVAL_HOURS)
+    dead_recheck_before = now - timedelta(hours=settings.LINK_CHECK_DEAD_RECHECK_HOURS)
+    rows = (
+        db.query(JobPosting.id, JobPosting.url)
+        .filter(
+            JobPosting.url.isnot(None),
+            JobPosting.expired_at.is_(None),
+            JobPosting.canonical_id.is_(None),
+            or_(
+                and_(
+                    JobPosting.dead_at.is_(None),
+                    or_(JobPosting.url_checked_at.is_(None), JobPosting.url_checked_at < recheck_before),
+                ),
+                # Dead postings come back round slowly so a false positive can clear
+                and_(
+                    JobPosting.dead_at.isnot(None),
+                    or_(JobPosting.url_checked_at.is_(None), JobPosting.url_checked_at < dead_recheck_before),
+                ),
+            ),
+        )
+        .order_by(JobPosting.url_checked_at.is_(None).desc(), JobPosting.url_checked_at)
+        .limit(limit)
+        .all()
+    )
+    return [(job_id, url) for job_id, url in rows if url.startswith(("http://", "https://"))]
+
+
+def validate_job_links(db: Session, limit: Optional[int] = None) -> Dict[str, int]:
+    """
+    Check the postings most overdue for validation and flag dead ones.
+    Synchronous entry point for the scheduler.
+    """
+    jobs = _due_for_check(db, limit or settings.LINK_CHECK_BATCH_SIZE)
+    if not jobs:
+        return {"checked": 0, "dead": 0, "revived": 0, "inconclusive": 0}
+
+    started = time.monotonic()
+    results = asyncio.run(check_urls(jobs))
+    now = datetime.now(timezone.utc)
+
+    stats = {"checked": len(results), "dead": 0, "revived": 0, "inconclusive": 0}
+    newly_dead = []
+    for job in db.query(JobPosting).filter(JobPosting.id.in_(list(results))):
+        is_dead, status_code, reason = results[job.id]
+        job.url_status = status_code
+        job.url_checked_at = now
+        if is_dead is None:
+            stats["inconclusive"] += 1
+        elif is_dead:
+            if job.dead_at is None:
+                job.dead_at = now
+                newly_dead.append(job.id)
+                stats["dead"] += 1
+                logger.info(f"[LinkCheck] Job {job.id} is dead ({reason}): {job.url}")
+        elif job.dead_at is not None:
+            job.dead_at = None
+            stats["revived"] += 1
+            logger.info(f"[LinkCheck] Job {job.id} is live again: {job.url}")
+    db.flush()
+    job_dedup.release_duplicates(db, newly_dead)
+    db.commit()
+
+    logger.info(
+        f"[LinkCheck] Checked {stats['checked']} URLs in {time.monotonic() - started:.1f}s — "
+        f"{stats['dead']} dead, {stats['revived']} revived, {stats['inconclusive']} inconclusive"
+    )
+    return stats
@@ -0,0 +1,142 @@
+"""
+Event-driven page readiness for browser automation.
+
+Instead of sleeping a fixed two seconds after navigation (too long for
+static pages, too short for SPAs), automation waits for whichever comes
+first: a visible application-form element or known ATS container, a CAPTCHA
+widget, or the network going quiet. The wait is bounded by a per-host
+timeout learned from past runs: each host's ready time is tracked as an
+exponential moving average in `page_load_stats`, and the timeout is that
+average times `PAGE_READY_TIMEOUT_FACTOR`, clamped to a sane range. Hosts
+never seen before get `PAGE_READY_DEFAULT_TIMEOUT_MS`.
+
+Every wait is recorded, so slow hosts earn longer timeouts and fast ones
+stop paying for the worst case.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import PageLoadStat
+from app.services import form_detector
+
+logger = logging.getLogger(__name__)
+
+# Visible any of these => the application form (or a CAPTCHA wall) has rendered
+READY_SELECTORS = [
+    'form input:not([type="hidden"]):not([type="submit"])',
+    "form textarea",
+    'input[type="email"]',
+    "#application_form",  # Greenhouse
+    "#application-form",
+    "#grnhse_app",  # Greenhouse embed
+    ".application-form",  # Lever
+    '[data-automation-id="jobPostingPage"]',  # Workday
+    ".ashby-application-form-container",  # Ashby
+] + form_detector.CAPTCHA_SELECTORS
+
+# After clicking submit: a confirmation message means we are done
+CONFIRMATION_SELECTOR = (
+    "text=/thank(s| you) for (applying|your application)|application (was |has been )?(submitted|received)/i"
+)
+
+
+def host_of(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def timeout_ms(db: Session, host: str) -> int:
+    """Readiness timeout for `host`, sized from its recorded ready times."""
+    stat = db.query(PageLoadStat).filter(PageLoadStat.host == host).first()
+    db.commit()  # Don't hold the read transaction across the wait
+    if stat is None or not stat.samples:
+        return settings.PAGE_READY_DEFAULT_TIMEOUT_MS
+    learned = int(stat.ready_ms_avg * settings.PAGE_READY_TIMEOUT_FACTOR)
+    return max(settings.PAGE_READY_MIN_TIMEOUT_MS, min(learned, settings.PAGE_READY_MAX_TIMEOUT_MS))
+
+
+def record(db: Session, host: str, waited_ms: int, timed_out: bool):
+    """Fold one observed wait into the host's moving average (atomic upsert)."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    alpha = settings.PAGE_READY_EWMA_ALPHA
+    stmt = dialect.insert(PageLoadStat).values(
+        host=host, samples=1, ready_ms_avg=float(waited_ms), last_ready_ms=waited_ms,
+        timeouts=1 if timed_out else 0,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["host"],
+        set_={
+            "samples": PageLoadStat.samples + 1,
+            "ready_ms_avg": PageLoadStat.ready_ms_avg + alpha * (stmt.excluded.ready_ms_avg - PageLoadStat.ready_ms_avg),
+            "last_ready_ms": stmt.excluded.last_ready_ms,
+            "timeouts": PageLoadStat.timeouts + stmt.excluded.timeouts,
+        },
+    )
+    try:
+        db.execute(stmt)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[Readiness] Could not record wait for {host}: {e}")
+
+
+async def _first_signal(waiters: Dict[asyncio.Future, str]) -> Optional[str]:
+    """Name of the first waiter to succeed, or None if all of them failed/timed out."""
+    pending = set(waiters)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return waiters[task]
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def wait_until_ready(page, db: Session) -> Tuple[int, Optional[str]]:
+    """
+    Wait until the current page is ready to inspect.
+    Returns (waited_ms, signal) where signal is "form", "network_idle", or None on timeout.
+    """
+    host = host_of(page.url)
+    limit = timeout_ms(db, host)
+    started = time.monotonic()
+
+    form_ready = page.locator(", ".join(READY_SELECTORS)).locator("visible=true").first
+    signal = await _first_signal({
+        asyncio.ensure_future(form_ready.wait_for(state="attached", timeout=limit)): "form",
+        asyncio.ensure_future(page.wait_for_load_state("networkidle", timeout=limit)): "network_idle",
+    })
+
+    waited_ms = int((time.monotonic() - started) * 1000)
+    record(db, host, waited_ms, timed_out=signal is None)
+    logger.info(f"[Readiness] {host} ready via {signal or 'timeout'} after {waited_ms}ms (limit {limit}ms)")
+    return waited_ms, signal
+
+
+async def wait_for_submission(page) -> Tuple[int, Optional[str]]:
+    """After clicking submit: wait for a confirmation message, a navigation, or the form POST's response."""
+    started = time.monotonic()
+    limit = settings.SUBMIT_CONFIRM_TIMEOUT_MS
+    url_before = page.url
+
+    signal = await _first_signal({
+        asyncio.ensure_future(page.locator(CONFIRMATION_SELECTOR).first.wait_for(state="visible", timeout=limit)): "confirmation",
+        asyncio.ensure_future(page.wait_for_url(lambda url: url != url_before, timeout=limit)): "navigation",
+        asyncio.ensure_future(page.wait_for_response(lambda r: r.request.method == "POST", timeout=limit)): "post_response",
+    })
+
+    waited_ms = int((time.monotonic() - started) * 1000)
+    logger.info(f"[Readiness] Submission settled via {signal or 'timeout'} after {waited_ms}ms")
+    return waited_ms, signal
@@ -0,0 +1,107 @@
+"""
+Request-routing policy for automation browser contexts.
+
+Automation only needs a job page's markup, styles and form scripts to fill
+and screenshot it. Every request goes through a context route: resource
+types listed in `AUTOMATION_BLOCKED_RESOURCE_TYPES` (images, media, fonts by
+default) and requests to known analytics/ad/tracker domains are aborted;
+documents, stylesheets, scripts and XHR/fetch continue. CAPTCHA providers
+are never blocked, so CAPTCHA detection still sees their widgets.
+
+`RequestStats` counts what was blocked and loaded per run. Blocked bodies are
+never downloaded, so bytes saved is an estimate from typical response sizes
+per resource type; loaded bytes come from Content-Length headers.
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TRACKER_DOMAINS = {
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "connect.facebook.net", "hotjar.com", "hotjar.io",
+    "segment.com", "segment.io", "mixpanel.com", "amplitude.com", "fullstory.com", "clarity.ms",
+    "bat.bing.com", "snap.licdn.com", "px.ads.linkedin.com", "ads-twitter.com", "analytics.tiktok.com",
+    "adsrvr.org", "quantserve.com", "scorecardresearch.com", "hs-analytics.net", "hs-banner.com",
+    "nr-data.net", "optimizely.com", "crazyegg.com", "mouseflow.com", "heap.io", "heapanalytics.com",
+}
+
+# Never block: CAPTCHA widgets must load for detection to work
+ALLOWED_DOMAINS = {"recaptcha.net", "hcaptcha.com", "challenges.cloudflare.com"}
+
+# Typical transfer sizes (bytes) used to estimate savings for aborted requests
+TYPICAL_BYTES = {
+    "image": 25_000,
+    "media": 400_000,
+    "font": 30_000,
+    "script": 35_000,
+    "stylesheet": 15_000,
+}
+DEFAULT_TYPICAL_BYTES = 5_000
+
+
+def _domain_in(host: str, domains) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def block_reason(resource_type: str, url: str) -> Optional[str]:
+    """Why a request should be aborted ("type" or "tracker"), or None to let it through."""
+    host = (urlparse(url).hostname or "").lower()
+    if _domain_in(host, ALLOWED_DOMAINS) or "/recaptcha/" in url:
+        return None
+    if resource_type in settings.AUTOMATION_BLOCKED_RESOURCE_TYPES:
+        return "type"
+    if settings.AUTOMATION_BLOCK_TRACKERS and _domain_in(host, TRACKER_DOMAINS):
+        return "tracker"
+    return None
+
+
+class RequestStats:
+    def __init__(self):
+        self.blocked: Counter = Counter()
+        self.bytes_saved_estimate = 0
+        self.loaded_requests = 0
+        self.loaded_bytes = 0
+
+    def record_block(self, resource_type: str, reason: str):
+        self.blocked[resource_type if reason == "type" else "tracker"] += 1
+        self.bytes_saved_estimate += TYPICAL_BYTES.get(resource_type, DEFAULT_TYPICAL_BYTES)
+
+    def on_response(self, response):
+        self.loaded_requests += 1
+        try:
+            self.loaded_bytes += int(response.headers.get("content-length") or 0)
+        except ValueError:
+            pass
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "blocked_requests": sum(self.blocked.values()),
+            **{f"blocked_{kind}": count for kind, count in sorted(self.blocked.items())},
+            "bytes_saved_estimate": self.bytes_saved_estimate,
+            "loaded_requests": self.loaded_requests,
+            "loaded_bytes": self.loaded_bytes,
+        }
+
+
+async def apply(context) -> RequestStats:
+    """Install the blocking route on a browser context; returns its live stats."""
+    stats = RequestStats()
+
+    async def handle(route):
+        request = route.request
+        reason = block_reason(request.resource_type, request.url)
+        if reason:
+            stats.record_block(request.resource_type, reason)
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
+    context.on("response", stats.on_response)
+    return stats
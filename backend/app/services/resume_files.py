@@ -0,0 +1,46 @@
+"""
+Resume file storage shared by the API and the automation workers.
+
+The API and the automation worker run as separate services with separate
+disks, so an uploaded resume is stored in the database (`Resume.file_data`)
+alongside the path it was saved under. Workers write the bytes to a local
+cache file the first time a form asks for an upload; rows from before the
+column existed fall back to `file_path`.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Optional
+
+from app.models import Resume
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "uploads/resume_cache"
+
+
+def local_path(resume: Optional[Resume]) -> Optional[str]:
+    """Absolute path of a local copy of the resume file, or None if there is none."""
+    if resume is None:
+        return None
+
+    data = resume.file_data
+    if data:
+        # One directory per content hash keeps the original filename (ATS forms show it)
+        # and never serves a stale copy after a re-upload.
+        name = os.path.basename(resume.file_path or f"{resume.user_id}_resume")
+        directory = os.path.join(CACHE_DIR, hashlib.sha256(data).hexdigest()[:16])
+        path = os.path.abspath(os.path.join(directory, name))
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            logger.info(f"[Resume] Cached resume for user {resume.user_id} at {path}")
+        return path
+
+    if resume.file_path and os.path.exists(resume.file_path):
+        return os.path.abspath(resume.file_path)
+    return None
@@ -0,0 +1,199 @@
+"""
+Automation screenshots — capture and retention.
+
+Capture is viewport-only by default (`SCREENSHOT_FULL_PAGE`) and encoded by
+Chromium as JPEG at `SCREENSHOT_QUALITY`. PNG is available for lossless
+shots. WebP output is transcoded from a lossless capture with Pillow when it
+is installed, in a worker thread so the event loop driving other
+applications never waits on encoding or disk writes.
+
+Before each capture, one cheap `page.evaluate` hashes what the viewer would
+see (URL, scroll position, visible text and form values). If that matches the
+previous shot of the same page, e.g. "submitted" when the submit click
+changed nothing, the capture is skipped and the earlier file is reused.
+
+`prune_screenshots` runs inside each automation worker, which owns the disk
+the shots are written to, every `SCREENSHOT_PRUNE_INTERVAL_HOURS`. It deletes superseded intermediate
+shots after `SCREENSHOT_UNREFERENCED_HOURS`, deletes every shot older than
+`SCREENSHOT_RETENTION_DAYS` (clearing `Application.screenshot_path`), and
+re-encodes legacy full-size PNGs to the configured format when possible.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from collections import Counter
+from datetime import datetime
+from io import BytesIO
+from typing import Dict, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Application
+
+try:
+    from PIL import Image
+except ImportError:  # WebP output needs Pillow; PNG and JPEG come straight from Chromium
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+SCREENSHOT_DIR = "uploads/screenshots"
+EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+# In-process counters, logged by the automation worker heartbeat
+stats: Counter = Counter()
+
+# FNV-1a of what a viewer would see: URL, scroll position, visible text and form values
+SIGNATURE_SCRIPT = """
+() => {
+  const parts = [location.href, String(window.scrollY), document.body ? document.body.innerText : ''];
+  for (const el of document.querySelectorAll('input, textarea, select')) {
+    parts.push(el.type === 'file' ? String(el.files ? el.files.length : 0) : (el.type === 'checkbox' || el.type === 'radio') ? String(el.checked) : (el.value || ''));
+  }
+  const signature = parts.join('\\u0000');
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < signature.length; i++) {
+    hash ^= signature.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193) >>> 0;
+  }
+  return hash.toString(16).padStart(8, '0');
+}
+"""
+
+# Last (signature, path) captured per page, dropped with the page
+_last_shot: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def output_format() -> str:
+    """Configured format, falling back to JPEG when WebP is asked for without Pillow."""
+    fmt = settings.SCREENSHOT_FORMAT.lower()
+    if fmt == "jpg":
+        fmt = "jpeg"
+    if fmt not in EXTENSIONS:
+        logger.warning(f"[Screenshots] Unknown SCREENSHOT_FORMAT '{fmt}' — using jpeg")
+        return "jpeg"
+    if fmt == "webp" and Image is None:
+        logger.warning("[Screenshots] WebP needs Pillow — using jpeg")
+        return "jpeg"
+    return fmt
+
+
+def _encode_webp(data: bytes) -> bytes:
+    out = BytesIO()
+    Image.open(BytesIO(data)).convert("RGB").save(out, "WEBP", quality=settings.SCREENSHOT_QUALITY, method=4)
+    return out.getvalue()
+
+
+def _write(path: str, data: bytes, fmt: str) -> int:
+    if fmt == "webp":
+        data = _encode_webp(data)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+async def capture(page, application_id: int, suffix: str) -> str:
+    """Save a screenshot of `page`; returns its path ("" on failure)."""
+    try:
+        signature = await page.evaluate(SIGNATURE_SCRIPT)
+    except Exception:
+        signature = None
+    last = _last_shot.get(page)
+    if signature and last and last[0] == signature:
+        stats["skipped"] += 1
+        logger.info(f"[Screenshots] '{suffix}' unchanged since last shot — reusing {last[1]}")
+        return last[1]
+
+    fmt = output_format()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = os.path.join(SCREENSHOT_DIR, f"app_{application_id}_{suffix}_{timestamp}{EXTENSIONS[fmt]}")
+    options = {"full_page": settings.SCREENSHOT_FULL_PAGE, "animations": "disabled", "caret": "hide"}
+    if fmt == "jpeg":
+        options.update(type="jpeg", quality=settings.SCREENSHOT_QUALITY)
+    else:
+        options["type"] = "png"  # WebP is transcoded from a lossless capture
+
+    started = time.monotonic()
+    try:
+        data = await page.screenshot(**options)
+        os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+        size = await asyncio.to_thread(_write, filepath, data, fmt)
+    except Exception as e:
+        logger.error(f"[Screenshots] Capture failed: {e}")
+        return ""
+
+    elapsed_ms = int((time.monotonic() - started) * 1000)
+    stats["captured"] += 1
+    stats["bytes"] += size
+    stats["capture_ms"] += elapsed_ms
+    if signature:
+        _last_shot[page] = (signature, filepath)
+    logger.info(f"[Screenshots] Saved {filepath} ({size // 1024} KB, {elapsed_ms} ms)")
+    return filepath
+
+
+def _compact(path: str, fmt: str) -> Tuple[str, int]:
+    """Re-encode a PNG as `fmt` at SCREENSHOT_QUALITY; returns (new path, bytes saved)."""
+    target = os.path.splitext(path)[0] + EXTENSIONS[fmt]
+    with Image.open(path) as image:
+        image.convert("RGB").save(target, "WEBP" if fmt == "webp" else "JPEG", quality=settings.SCREENSHOT_QUALITY)
+    saved = os.path.getsize(path) - os.path.getsize(target)
+    os.remove(path)
+    return target, saved
+
+
+def prune_screenshots(db: Session) -> Dict[str, int]:
+    """Delete superseded and expired screenshots; compact legacy PNGs."""
+    result = {"deleted": 0, "expired": 0, "compacted": 0, "bytes_freed": 0}
+    if not os.path.isdir(SCREENSHOT_DIR):
+        return result
+
+    now = time.time()
+    unreferenced_cutoff = now - settings.SCREENSHOT_UNREFERENCED_HOURS * 3600
+    retention_cutoff = now - settings.SCREENSHOT_RETENTION_DAYS * 86400
+    referenced = {
+        os.path.normpath(path): app_id for app_id, path in
+        db.query(Application.id, Application.screenshot_path).filter(Application.screenshot_path.isnot(None))
+        if path
+    }
+    fmt = output_format()
+    compact = Image is not None and fmt != "png"
+
+    expired_ids, moved = [], {}
+    for entry in os.scandir(SCREENSHOT_DIR):
+        if not entry.is_file():
+            continue
+        path = os.path.normpath(entry.path)
+        stat = entry.stat()
+        app_id = referenced.get(path)
+        try:
+            if stat.st_mtime < retention_cutoff or (app_id is None and stat.st_mtime < unreferenced_cutoff):
+                os.remove(path)
+                result["bytes_freed"] += stat.st_size
+                if app_id is None:
+                    result["deleted"] += 1
+                else:
+                    result["expired"] += 1
+                    expired_ids.append(app_id)
+            elif compact and app_id is not None and path.endswith(".png") and stat.st_mtime < unreferenced_cutoff:
+                target, saved = _compact(path, fmt)
+                moved[app_id] = target
+                result["compacted"] += 1
+                result["bytes_freed"] += saved
+        except Exception as e:
+            logger.warning(f"[Screenshots] Could not prune {path}: {e}")
+
+    if expired_ids:
+        db.query(Application).filter(Application.id.in_(expired_ids)).update(
+            {Application.screenshot_path: None}, synchronize_session=False)
+    for app_id, target in moved.items():
+        db.query(Application).filter(Application.id == app_id).update(
+            {Application.screenshot_path: target}, synchronize_session=False)
+    db.commit()
+
+    logger.info(f"[Screenshots] Retention: {result}")
+    return result
@@ -0,0 +1,121 @@
+"""
+Recording swipes with upsert semantics.
+
+A user has at most one swipe and one application per job (unique
+constraints on both tables). Swipes are written with INSERT ... ON CONFLICT
+DO NOTHING, so a retried or double-tapped swipe — even two requests racing
+each other — creates nothing new, and only the request that actually
+inserted an application queues its automation.
+
+A LEFT swipe can later be upgraded to RIGHT; a RIGHT swipe is final, since
+its application may already be submitted.
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import Application, ApplicationStatus, JobPosting, SwipeAction
+from app.services import automation_queue
+
+logger = logging.getLogger(__name__)
+
+DIRECTIONS = ("LEFT", "RIGHT")
+_UNIQUE_COLUMNS = ["user_id", "job_posting_id"]
+
+
+def _insert_ignore(db: Session, model):
+    """INSERT that skips rows violating the (user_id, job_posting_id) constraint."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(model).on_conflict_do_nothing(index_elements=_UNIQUE_COLUMNS)
+
+
+def record_swipes(db: Session, user_id: int, swipes: List[Tuple[int, str]]) -> List[Dict]:
+    """
+    Apply an ordered list of (job_posting_id, direction) swipes for a user.
+
+    Adds everything to the session without committing, so callers control
+    the transaction. Returns one result dict per swipe with `status`
+    recorded, duplicate, invalid or not_found, and the `application_id` of
+    right swipes (existing or new).
+    """
+    job_ids = {job_id for job_id, _ in swipes}
+    existing_jobs = {job_id for (job_id,) in db.query(JobPosting.id).filter(JobPosting.id.in_(job_ids))}
+    actions = dict(
+        db.query(SwipeAction.job_posting_id, SwipeAction.action)
+        .filter(SwipeAction.user_id == user_id, SwipeAction.job_posting_id.in_(job_ids))
+    )
+    applications = dict(
+        db.query(Application.job_posting_id, Application.id)
+        .filter(Application.user_id == user_id, Application.job_posting_id.in_(job_ids))
+    )
+
+    results = []
+    new_swipes: Dict[int, str] = {}
+    upgrades, new_applications = [], []
+    for job_id, direction in swipes:
+        result = {"job_posting_id": job_id, "direction": direction, "status": "recorded",
+                  "application_id": None, "detail": None}
+        results.append(result)
+        if direction not in DIRECTIONS:
+            result.update(status="invalid", detail="Direction must be LEFT or RIGHT")
+            continue
+        if job_id not in existing_jobs:
+            result.update(status="not_found", detail="Job not found")
+            continue
+
+        previous = actions.get(job_id)
+        if previous == "RIGHT" or (previous == "LEFT" and direction == "LEFT"):
+            result.update(status="duplicate", detail=f"Job already swiped {previous}")
+            continue
+
+        if previous is None:
+            new_swipes[job_id] = direction
+        elif job_id in new_swipes:
+            new_swipes[job_id] = direction  # LEFT -> RIGHT within this batch
+        else:
+            upgrades.append(job_id)
+        actions[job_id] = direction
+        if direction == "RIGHT" and job_id not in applications:
+            new_applications.append(job_id)
+
+    if new_swipes:
+        db.execute(_insert_ignore(db, SwipeAction), [
+            {"user_id": user_id, "job_posting_id": job_id, "action": direction}
+            for job_id, direction in new_swipes.items()
+        ])
+    if upgrades:
+        db.query(SwipeAction).filter(
+            SwipeAction.user_id == user_id,
+            SwipeAction.job_posting_id.in_(upgrades),
+            SwipeAction.action == "LEFT",
+        ).update({SwipeAction.action: "RIGHT"}, synchronize_session=False)
+
+    if new_applications:
+        inserted = db.execute(
+            _insert_ignore(db, Application).returning(Application.id, Application.job_posting_id),
+            [
+                {"user_id": user_id, "job_posting_id": job_id, "status": ApplicationStatus.PENDING_AUTOMATION}
+                for job_id in new_applications
+            ],
+        ).all()
+        created = {job_id: app_id for app_id, job_id in inserted}
+        automation_queue.enqueue_many(db, list(created.values()))
+        applications.update(created)
+
+        raced = [job_id for job_id in new_applications if job_id not in created]
+        if raced:
+            # A concurrent request inserted these first and owns their automation
+            applications.update(
+                db.query(Application.job_posting_id, Application.id)
+                .filter(Application.user_id == user_id, Application.job_posting_id.in_(raced))
+            )
+            logger.info(f"[Swipes] {len(raced)} application(s) for user {user_id} already created concurrently")
+
+    for result in results:
+        answered_right = result["status"] == "duplicate" or (result["status"] == "recorded" and result["direction"] == "RIGHT")
+        if answered_right and actions.get(result["job_posting_id"]) == "RIGHT":
+            result["application_id"] = applications.get(result["job_posting_id"])
+    return results
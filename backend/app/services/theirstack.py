@@ -1,61 +1,317 @@
-import requests
-from typing import List, Optional
+"""
+TheirStack job search API client.
+
+Wraps the TheirStack `/jobs/search` endpoint with pooled httpx clients
+(sync and async), explicit connect/read timeouts, and retry with
+exponential backoff that honours 429 `Retry-After` headers. A hung
+TheirStack call can no longer pin a worker thread indefinitely.
+
+`search_jobs` and `async_search_jobs` return [] once retries are exhausted;
+`iter_jobs` raises instead, so a stream cut short by an error is never
+mistaken for the end of the results.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, List, Optional
+
+import httpx
+
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying — rate limiting and transient upstream failures
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
 class TheirStackService:
     BASE_URL = "https://api.theirstack.com/v1"
 
     def __init__(self):
         self.api_key = settings.THEIRSTACK_API_KEY
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
 
-    def search_jobs(
-        self, 
-        job_title_patterns: List[str] = [], 
-        locations: List[str] = [],
-        remote: Optional[bool] = None,
-        limit: int = 10
-    ) -> List[dict]:
-        """
-        Search for jobs using TheirStack API.
-        """
-        if not self.api_key:
-            print("Warning: THEIR_STACK_API_KEY is not set.")
-            return []
+    # --- Client lifecycle ---
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=settings.THEIRSTACK_CONNECT_TIMEOUT,
+            read=settings.THEIRSTACK_READ_TIMEOUT,
+            write=settings.THEIRSTACK_READ_TIMEOUT,
+            pool=settings.THEIRSTACK_CONNECT_TIMEOUT,
+        )
 
-        url = f"{self.BASE_URL}/jobs/search"
-        headers = {
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.THEIRSTACK_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.THEIRSTACK_MAX_CONNECTIONS,
+        )
+
+    def _headers(self) -> dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
         }
-        
+
+    @property
+    def client(self) -> httpx.Client:
+        """Persistent sync client — connections are reused across calls."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.Client(
+                base_url=self.BASE_URL,
+                headers=self._headers(),
+                timeout=self._timeout(),
+                limits=self._limits(),
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Persistent async client — connections are reused across calls."""
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                headers=self._headers(),
+                timeout=self._timeout(),
+                limits=self._limits(),
+            )
+        return self._async_client
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    # --- Request building & retry policy ---
+
+    def _build_payload(
+        self,
+        job_title_patterns: List[str],
+        locations: List[str],
+        remote: Optional[bool],
+        limit: int,
+        page: int = 0,
+    ) -> dict:
         payload = {
+            "page": page,
             "limit": limit,
-            "posted_at_max_age_days": 30, # Default to last 30 days
+            "posted_at_max_age_days": 30,  # Default to last 30 days
             "job_title_or": job_title_patterns,
-            # For locations, TheirStack uses country codes or location patterns. 
-            # Ideally we'd map "New York" to a pattern or exact match.
+            # For locations, TheirStack uses country codes or location patterns.
             # Using job_location_pattern_or for flexible matching if locations provided
-            "job_location_pattern_or": locations if locations else []
+            "job_location_pattern_or": locations if locations else [],
         }
-        
         if remote:
             payload["remote"] = True
+        return payload
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """
+        Seconds to wait before the next attempt.
 
-        print(f"DEBUG: TheirStack Request: URL={url}, Payload={payload}")
+        Honours `Retry-After` (delta-seconds or HTTP-date) when the server
+        sends one; otherwise exponential backoff with full jitter.
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    try:
+                        when = parsedate_to_datetime(retry_after)
+                        delay = (when - datetime.now(timezone.utc)).total_seconds()
+                    except (TypeError, ValueError):
+                        delay = None
+                if delay is not None:
+                    return min(max(delay, 0.0), settings.THEIRSTACK_MAX_BACKOFF)
+
+        backoff = settings.THEIRSTACK_BACKOFF_BASE * (2 ** attempt)
+        return random.uniform(0, min(backoff, settings.THEIRSTACK_MAX_BACKOFF))
+
+    def _should_retry(self, attempt: int, response: Optional[httpx.Response]) -> bool:
+        if attempt >= settings.THEIRSTACK_MAX_RETRIES:
+            return False
+        return response is None or response.status_code in RETRYABLE_STATUS_CODES
+
+    def _parse_response(self, response: httpx.Response) -> List[dict]:
+        response.raise_for_status()
+        return response.json().get("data", [])
+
+    def _log_search(self, job_title_patterns: List[str], locations: List[str],
+                    remote: Optional[bool], limit: int, page: int):
+        logger.info(
+            f"[TheirStack] Searching jobs: roles={job_title_patterns} locations={locations} "
+            f"remote={bool(remote)} limit={limit} page={page}"
+        )
+
+    def _after_attempt(
+        self,
+        attempt: int,
+        started: float,
+        response: Optional[httpx.Response],
+        error: Optional[Exception],
+    ) -> Optional[float]:
+        """
+        Log one attempt and decide what happens next, identically for the
+        sync and async clients: returns the delay before a retry, or None
+        when the result is final.
+        """
+        if error is not None:
+            logger.warning(f"[TheirStack] Transport error on attempt {attempt + 1}: {error}")
+        if response is not None:
+            logger.info(
+                f"[TheirStack] Response {response.status_code} on attempt {attempt + 1} "
+                f"in {int((time.monotonic() - started) * 1000)}ms"
+            )
 
+        if not self._should_retry(attempt, response):
+            return None
+        delay = self._retry_delay(attempt, response)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        logger.info(f"[TheirStack] Retrying in {delay:.1f}s"
+                    + (f" (Retry-After: {retry_after})" if retry_after else ""))
+        return delay
+
+    def _final_result(self, response: Optional[httpx.Response]) -> Optional[List[dict]]:
+        """Jobs from the last attempt, or None if it failed."""
+        if response is None:
+            logger.error("[TheirStack] Giving up after repeated transport errors")
+            return None
         try:
-            response = requests.post(url, json=payload, headers=headers)
-            # response.raise_for_status() # Let's see the error if any
-            print(f"DEBUG: TheirStack Response Status: {response.status_code}")
-            print(f"DEBUG: TheirStack Response Body: {response.text[:500]}...") # Print first 500 chars
-            
-            response.raise_for_status()
-            data = response.json()
-            return data.get("data", [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching jobs from TheirStack: {e}")
-            if response:
-                print(response.text)
+            return self._parse_response(response)
+        except (httpx.HTTPStatusError, ValueError) as e:
+            logger.error(f"[TheirStack] Search failed ({response.status_code}): {e}")
+            return None
+
+    # --- Sync API ---
+
+    def search_jobs(
+        self,
+        job_title_patterns: List[str] = [],
+        locations: List[str] = [],
+        remote: Optional[bool] = None,
+        limit: int = 10,
+        page: int = 0,
+    ) -> List[dict]:
+        """
+        Search for jobs using TheirStack API.
+
+        Returns an empty list if the API key is missing or the request
+        ultimately fails after retries.
+        """
+        if not self.api_key:
+            logger.warning("[TheirStack] THEIRSTACK_API_KEY is not set — skipping search")
+            return []
+        return self._search(job_title_patterns, locations, remote, limit, page) or []
+
+    def _search(
+        self,
+        job_title_patterns: List[str],
+        locations: List[str],
+        remote: Optional[bool],
+        limit: int,
+        page: int,
+    ) -> Optional[List[dict]]:
+        """One page with retries; None if it ultimately failed."""
+        payload = self._build_payload(job_title_patterns, locations, remote, limit, page)
+        self._log_search(job_title_patterns, locations, remote, limit, page)
+
+        attempt = 0
+        while True:
+            response, error, started = None, None, time.monotonic()
+            try:
+                response = self.client.post("/jobs/search", json=payload)
+            except httpx.TransportError as e:
+                error = e
+
+            delay = self._after_attempt(attempt, started, response, error)
+            if delay is None:
+                return self._final_result(response)
+            time.sleep(delay)
+            attempt += 1
+
+    # --- Async API ---
+
+    async def async_search_jobs(
+        self,
+        job_title_patterns: List[str] = [],
+        locations: List[str] = [],
+        remote: Optional[bool] = None,
+        limit: int = 10,
+        page: int = 0,
+    ) -> List[dict]:
+        """Async variant of `search_jobs` using the pooled AsyncClient."""
+        if not self.api_key:
+            logger.warning("[TheirStack] THEIRSTACK_API_KEY is not set — skipping search")
             return []
+        return await self._async_search(job_title_patterns, locations, remote, limit, page) or []
+
+    async def _async_search(
+        self,
+        job_title_patterns: List[str],
+        locations: List[str],
+        remote: Optional[bool],
+        limit: int,
+        page: int,
+    ) -> Optional[List[dict]]:
+        """Async variant of `_search`."""
+        payload = self._build_payload(job_title_patterns, locations, remote, limit, page)
+        self._log_search(job_title_patterns, locations, remote, limit, page)
+
+        attempt = 0
+        while True:
+            response, error, started = None, None, time.monotonic()
+            try:
+                response = await self.async_client.post("/jobs/search", json=payload)
+            except httpx.TransportError as e:
+                error = e
+
+            delay = self._after_attempt(attempt, started, response, error)
+            if delay is None:
+                return self._final_result(response)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def iter_jobs(
+        self,
+        job_title_patterns: List[str] = [],
+        locations: List[str] = [],
+        remote: Optional[bool] = None,
+        page_size: int = 25,
+        max_pages: int = 10,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream jobs page by page.
+
+        Yields individual job dicts as each page arrives, stopping at
+        `max_pages` or the first short/empty page. Raises RuntimeError if a
+        page fails after retries, after yielding the jobs of earlier pages.
+        """
+        if not self.api_key:
+            logger.warning("[TheirStack] THEIRSTACK_API_KEY is not set — skipping search")
+            return
+
+        for page in range(max_pages):
+            jobs = await self._async_search(job_title_patterns, locations, remote, page_size, page)
+            if jobs is None:
+                logger.warning(f"[TheirStack] Page {page} failed — stopping job stream early")
+                raise RuntimeError(f"TheirStack search failed on page {page}")
+            for job in jobs:
+                yield job
+            if len(jobs) < page_size:
+                return
+
 
 theirstack_service = TheirStackService()
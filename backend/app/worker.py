@@ -0,0 +1,212 @@
+"""
+Periodic-job worker: owns every scheduled job (Gmail polling, link
+validation, retention/cleanup).
+
+Usage:
+    python -m app.worker
+
+Any number of these processes may run; they elect a single leader through
+a lease in `scheduler_leases`, and only the leader runs the APScheduler.
+Standbys keep trying to acquire the lease and take over within
+`SCHEDULER_LEASE_SECONDS` if the leader dies. Every job re-checks the lease
+before it starts, and a leader that loses the lease waits for its running
+jobs before it stops, so a deposed leader never starts new work. API
+processes run no scheduler at all.
+"""
+
+import functools
+import logging
+import os
+import signal
+import socket
+import threading
+import uuid
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import engine, SessionLocal
+from app.services import leader
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "periodic-jobs"
+
+
+def poll_all_users_job():
+    """Background job: poll Gmail for all connected users."""
+    from app.services.gmail import poll_all_users
+    db = SessionLocal()
+    try:
+        poll_all_users(db)
+    except Exception as e:
+        logger.error(f"[Scheduler] Gmail poll error: {e}")
+    finally:
+        db.close()
+
+
+def job_retention_job():
+    """Background job: backfill derived job columns, archive expired postings, compact, prune timings."""
+    from app.services.job_retention import run_retention
+    from app.services.job_text import compress_legacy_descriptions
+    from app.services.companies import backfill_job_companies
+    from app.services.job_dedup import release_stranded_duplicates
+    from app.services.geo import backfill_job_locations
+    from app.services.idempotency import purge_expired_keys
+    from app.services.automation_timing import purge_old_timings
+    tasks = [
+        ("Description compression", compress_legacy_descriptions),
+        ("Company backfill", backfill_job_companies),
+        ("Location backfill", backfill_job_locations),
+        ("Idempotency key purge", purge_expired_keys),
+        ("Job retention", run_retention),
+        ("Stranded duplicate release", release_stranded_duplicates),
+        ("Timing purge", purge_old_timings),
+    ]
+    db = SessionLocal()
+    try:
+        # Independent tasks: one failing must not skip the rest
+        for name, task in tasks:
+            try:
+                task(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"[Scheduler] {name} error: {e}")
+    finally:
+        db.close()
+
+
+def link_validation_job():
+    """Background job: flag job postings whose URLs are closed or gone."""
+    from app.services.link_validator import validate_job_links
+    db = SessionLocal()
+    try:
+        validate_job_links(db)
+    except Exception as e:
+        logger.error(f"[Scheduler] Link validation error: {e}")
+    finally:
+        db.close()
+
+
+def _leader_only(job, worker_id: str):
+    """Wrap `job` so it only starts while `worker_id` still holds the lease."""
+    @functools.wraps(job)
+    def run():
+        db = SessionLocal()
+        try:
+            is_leader = leader.holds(db, LEASE_NAME, worker_id)
+        except Exception as e:
+            logger.error(f"[Scheduler] Lease check failed: {e}")
+            is_leader = False
+        finally:
+            db.close()
+        if not is_leader:
+            logger.warning(f"[Scheduler] Skipping {job.__name__} — {worker_id} no longer holds the lease")
+            return
+        job()
+    return run
+
+
+def build_scheduler(worker_id: str) -> BackgroundScheduler:
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(
+        _leader_only(poll_all_users_job, worker_id),
+        "interval",
+        minutes=settings.GMAIL_POLL_INTERVAL_MINUTES,
+        id="gmail_poll",
+        name="Poll Gmail for all connected users",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        _leader_only(job_retention_job, worker_id),
+        "interval",
+        hours=24,
+        id="job_retention",
+        name="Archive expired job postings",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        _leader_only(link_validation_job, worker_id),
+        "interval",
+        minutes=30,
+        id="link_validation",
+        name="Revalidate job posting URLs",
+        replace_existing=True,
+    )
+    return scheduler
+
+
+class PeriodicWorker:
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.stopping = threading.Event()
+        self.scheduler = None
+
+    def _renew(self) -> bool:
+        db = SessionLocal()
+        try:
+            return leader.try_acquire(db, LEASE_NAME, self.worker_id, settings.SCHEDULER_LEASE_SECONDS)
+        except Exception as e:
+            logger.error(f"[Worker] Lease renewal failed: {e}")
+            return False
+        finally:
+            db.close()
+
+    def _start_scheduler(self):
+        self.scheduler = build_scheduler(self.worker_id)
+        self.scheduler.start()
+        logger.info(f"[Worker] {self.worker_id} is leader — scheduler started")
+
+    def _stop_scheduler(self, keep_lease: bool):
+        """
+        Stop the scheduler and wait for running jobs to finish. On a clean
+        shutdown we still hold the lease and keep renewing it while waiting,
+        so no standby starts a job that overlaps ours.
+        """
+        if not self.scheduler:
+            return
+        scheduler, self.scheduler = self.scheduler, None
+        stopper = threading.Thread(target=scheduler.shutdown, kwargs={"wait": True}, daemon=True)
+        stopper.start()
+        while stopper.is_alive():
+            if keep_lease:
+                self._renew()
+            stopper.join(settings.SCHEDULER_RENEW_SECONDS)
+
+    def run(self):
+        logger.info(f"[Worker] {self.worker_id} started")
+        while not self.stopping.is_set():
+            is_leader = self._renew()
+            if is_leader and self.scheduler is None:
+                self._start_scheduler()
+            elif not is_leader and self.scheduler is not None:
+                logger.warning(f"[Worker] {self.worker_id} lost the lease — stopping scheduler")
+                self._stop_scheduler(keep_lease=False)
+            self.stopping.wait(settings.SCHEDULER_RENEW_SECONDS)
+
+        if self.scheduler is not None:
+            self._stop_scheduler(keep_lease=True)
+            db = SessionLocal()
+            try:
+                leader.release(db, LEASE_NAME, self.worker_id)
+            finally:
+                db.close()
+        logger.info(f"[Worker] {self.worker_id} stopped")
+
+    def stop(self, *_):
+        self.stopping.set()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    Base.metadata.create_all(bind=engine)
+
+    worker = PeriodicWorker()
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
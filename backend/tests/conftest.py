@@ -0,0 +1,26 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Settings require these; tests never talk to Google or sign tokens
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test-client-id")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-client-secret")
+
+from app.db.base import Base  # noqa: E402
+import app.models  # noqa: E402,F401  (registers every table on Base.metadata)
+
+
+@pytest.fixture
+def db():
+    """Fresh in-memory SQLite database per test."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from app.models import (
+    Application, ApplicationStatus, ApplicationStatusEvent, AutomationJob, AutomationJobStatus, JobPosting, User,
+)
+from app.services import automation_queue
+
+
+def _claimed_job(db, status=ApplicationStatus.PENDING_AUTOMATION, **application_fields) -> AutomationJob:
+    user = User(email="candidate@example.com", google_sub="sub-1")
+    posting = JobPosting(external_id="ext-1", title="Backend Engineer", company_name="Acme")
+    application = Application(user=user, job_posting=posting, status=status, **application_fields)
+    db.add(application)
+    db.flush()
+    automation_queue.enqueue(db, application.id)
+    db.commit()
+    [job_id] = automation_queue.claim_jobs(db, "worker-1", 1)
+    return db.get(AutomationJob, job_id)
+
+
+def test_pending_application_runs(db):
+    job = _claimed_job(db)
+
+    assert automation_queue.ready_to_run(db, job)
+    assert job.status == AutomationJobStatus.RUNNING
+
+
+def test_settled_application_is_not_rerun(db):
+    job = _claimed_job(db, status=ApplicationStatus.APPLIED)
+
+    assert not automation_queue.ready_to_run(db, job)
+    assert job.status == AutomationJobStatus.DONE
+    assert "APPLIED" in job.last_error
+
+
+def test_retry_after_submit_click_needs_manual_check(db):
+    job = _claimed_job(db, submit_started_at=datetime.now(timezone.utc))
+
+    assert not automation_queue.ready_to_run(db, job)
+    application = db.get(Application, job.application_id)
+    assert job.status == AutomationJobStatus.FAILED
+    assert application.status == ApplicationStatus.MANUAL_INTERVENTION_REQUIRED
+    assert db.query(ApplicationStatusEvent).filter_by(application_id=application.id).count() == 1
@@ -0,0 +1,58 @@
+import asyncio
+
+from app.core.config import settings
+from app.services import browser_pool as pool_module
+from app.services.browser_pool import BrowserPool, _PooledBrowser
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def _pool(count: int, active: int = 1) -> BrowserPool:
+    pool = BrowserPool()
+    for _ in range(count):
+        pooled = _PooledBrowser(_FakeBrowser())
+        pooled.active = active
+        pool._browsers.append(pooled)
+    return pool
+
+
+def test_memory_sample_is_reused_between_checks(monkeypatch):
+    samples = []
+    monkeypatch.setattr(pool_module, "browser_rss_mb", lambda: samples.append(1) or 10.0)
+    pool = _pool(1)
+
+    for _ in range(5):
+        pool.stats()
+    assert len(samples) == 1
+
+
+def test_one_memory_spike_retires_only_the_oldest_browser(monkeypatch):
+    samples = []
+    over_limit = settings.BROWSER_MAX_RSS_MB * 3 * 2
+    monkeypatch.setattr(pool_module, "browser_rss_mb", lambda: samples.append(1) or over_limit)
+    pool = _pool(3, active=2)
+    oldest, *others = pool._browsers
+
+    for pooled in list(pool._browsers):
+        asyncio.run(pool._release(pooled))
+
+    assert oldest.retiring
+    assert not any(b.retiring for b in others)
+    assert pool.stats()["recycles"] == 1
+    assert len(samples) == 1
+
+    # The retired browser closes once idle, which forces a fresh sample on the next release
+    asyncio.run(pool._release(oldest))
+    assert oldest.browser.closed and oldest not in pool._browsers
+    asyncio.run(pool._release(others[0]))
+    assert len(samples) == 2
+    assert others[0].retiring
@@ -0,0 +1,42 @@
+import io
+import json
+
+from app.models import JobPosting
+from app.services import bulk_import
+
+DESCRIPTION = "Build and operate Python services on Postgres for our hiring platform. " * 20
+
+
+def _ndjson(records) -> io.StringIO:
+    return io.StringIO("".join(json.dumps(record) + "\n" for record in records))
+
+
+def test_numeric_id_zero_is_valid(db):
+    stats = bulk_import.import_jobs(db, _ndjson([
+        {"id": 0, "job_title": "Backend Engineer", "company": "Acme"},
+        {"id": "", "job_title": "No Id", "company": "Acme"},
+    ]), "ndjson")
+
+    assert stats["inserted"] == 1
+    assert stats["invalid"] == 1
+    assert db.query(JobPosting).one().external_id == "0"
+
+
+def test_near_duplicates_link_across_batches(db):
+    records = [
+        {"id": 1, "job_title": "Senior Backend Engineer", "company": "Acme Inc", "description": DESCRIPTION},
+        {"id": 2, "job_title": "Senior Backend Engineer", "company": "Acme", "description": DESCRIPTION + " Apply today."},
+        {"id": 3, "job_title": "Pastry Chef", "company": "Bakery Co",
+         "description": "Laminate dough and run the morning bake. " * 20},
+        {"id": 4, "job_title": "Senior Backend Engineer", "company": "ACME", "description": DESCRIPTION},
+    ]
+    stats = bulk_import.import_jobs(db, _ndjson(records), "ndjson", batch_size=2)
+
+    assert stats["inserted"] == 4
+    assert stats["duplicates"] == 2
+    by_external_id = {job.external_id: job for job in db.query(JobPosting)}
+    canonical = by_external_id["1"]
+    assert canonical.canonical_id is None
+    assert by_external_id["2"].canonical_id == canonical.id
+    assert by_external_id["3"].canonical_id is None
+    assert by_external_id["4"].canonical_id == canonical.id
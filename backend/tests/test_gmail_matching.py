@@ -0,0 +1,47 @@
+from app.models import Application, CompanyAlias, JobPosting, User
+from app.services import companies, gmail
+
+
+def _application(db, company_name: str) -> Application:
+    user = db.query(User).first()
+    if user is None:
+        user = User(email="candidate@example.com", google_sub="sub-1")
+        db.add(user)
+        db.flush()
+    posting = JobPosting(
+        external_id=f"ext-{company_name}",
+        title="Backend Engineer",
+        company_name=company_name,
+        company=companies.get_or_create_company(db, company_name),
+    )
+    application = Application(user_id=user.id, job_posting=posting)
+    db.add(application)
+    db.flush()
+    return application
+
+
+def _alias_keys(db):
+    return {alias.alias_key for alias in db.query(CompanyAlias)}
+
+
+def test_resolved_company_matches_by_id(db):
+    acme = _application(db, "Acme Inc")
+    _application(db, "Globex")
+
+    assert gmail.match_to_application("ACME, Inc.", [acme], db) is acme
+
+
+def test_weak_fuzzy_match_does_not_create_alias(db):
+    labs = _application(db, "Acme Labs")
+    before = _alias_keys(db)
+
+    assert gmail.match_to_application("Acme Health", [labs], db) is labs
+    assert _alias_keys(db) == before
+    assert companies.find_company(db, "Acme Health") is None
+
+
+def test_same_words_fuzzy_match_creates_alias(db):
+    labs = _application(db, "Acme Labs")
+
+    assert gmail.match_to_application("Labs Acme", [labs], db) is labs
+    assert companies.find_company(db, "Labs Acme").id == labs.job_posting.company_id
@@ -0,0 +1,149 @@
+import random
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.models import JobPosting
+from app.services import job_dedup
+
+
+def _flip(value: int, bits) -> int:
+    for bit in bits:
+        value ^= 1 << bit
+    return value
+
+
+def _band_starts():
+    starts, shift = [], 0
+    for width in job_dedup.BAND_WIDTHS:
+        starts.append(shift)
+        shift += width
+    return starts
+
+
+def _posting(db, value: int, persist: bool = True, **kwargs) -> JobPosting:
+    """A posting with a fixed SimHash (bypassing the text hash), inserted unless persist=False."""
+    job = JobPosting(
+        external_id=kwargs.pop("external_id", f"ext-{random.getrandbits(32)}"),
+        title="Backend Engineer",
+        company_name="Acme",
+        simhash=job_dedup._to_signed(value),
+        **kwargs,
+    )
+    for i, key in enumerate(job_dedup.bands(value)):
+        setattr(job, f"simhash_band_{i}", key)
+    if persist:
+        db.add(job)
+        db.flush()
+    return job
+
+
+def test_bands_cover_the_simhash():
+    assert sum(job_dedup.BAND_WIDTHS) == job_dedup.SIMHASH_BITS
+    assert settings.JOB_DEDUP_MAX_HAMMING <= job_dedup.NUM_BANDS - 1
+
+
+def test_hashes_within_threshold_always_share_a_band():
+    rng = random.Random(7)
+    for _ in range(2000):
+        value = rng.getrandbits(64)
+        flips = rng.sample(range(64), rng.randint(0, job_dedup.NUM_BANDS - 1))
+        other = _flip(value, flips)
+        assert job_dedup.hamming_distance(value, other) == len(flips)
+        assert any(a == b for a, b in zip(job_dedup.bands(value), job_dedup.bands(other)))
+
+
+def test_one_flip_per_band_shares_no_band():
+    value = random.Random(3).getrandbits(64)
+    other = _flip(value, _band_starts())
+    assert job_dedup.hamming_distance(value, other) == job_dedup.NUM_BANDS
+    assert all(a != b for a, b in zip(job_dedup.bands(value), job_dedup.bands(other)))
+
+
+def test_similar_postings_hash_closer_than_different_ones():
+    description = "Build and operate Python services on Postgres. " * 20
+    a = job_dedup.simhash("Senior Backend Engineer", "Acme Inc", description)
+    b = job_dedup.simhash("Senior Backend Engineer", "Acme", description + " Apply today.")
+    c = job_dedup.simhash("Pastry Chef", "Bakery Co", "Laminate dough and run the morning bake. " * 20)
+    assert job_dedup.hamming_distance(a, b) <= settings.JOB_DEDUP_MAX_HAMMING
+    assert job_dedup.hamming_distance(a, c) > settings.JOB_DEDUP_MAX_HAMMING
+
+
+def test_link_respects_hamming_threshold(db):
+    value = random.Random(11).getrandbits(64)
+    canonical = _posting(db, value)
+    # Flips confined to the first band leave the other five bands equal
+    near = _posting(db, _flip(value, range(settings.JOB_DEDUP_MAX_HAMMING)), persist=False)
+    far = _posting(db, _flip(value, range(settings.JOB_DEDUP_MAX_HAMMING + 1)), persist=False)
+
+    assert job_dedup.find_canonical(db, near).id == canonical.id
+    assert job_dedup.find_canonical(db, far) is None
+
+
+def test_closest_canonical_wins_and_ties_go_to_oldest(db):
+    value = random.Random(5).getrandbits(64)
+    older = _posting(db, _flip(value, [0, 1]))
+    newer_same_distance = _posting(db, _flip(value, [2, 3]))
+    closest = _posting(db, _flip(value, [4]))
+    job = _posting(db, value)
+
+    assert job_dedup.find_canonical(db, job).id == closest.id
+
+    closest.canonical_id = older.id  # No longer canonical
+    db.flush()
+    assert job_dedup.find_canonical(db, job).id == older.id
+    assert newer_same_distance.id > older.id
+
+
+def test_batch_linking_uses_earlier_rows_as_canonicals(db):
+    value = random.Random(9).getrandbits(64)
+    rows = [_posting(db, _flip(value, bits)) for bits in ([], [1], [2], [40])]
+
+    linked = job_dedup.link_duplicates_for_ids(db, [row.id for row in rows])
+    db.flush()
+    db.expire_all()
+
+    assert linked == 3
+    assert rows[0].canonical_id is None
+    assert [row.canonical_id for row in rows[1:]] == [rows[0].id] * 3
+
+
+def test_batch_linking_ignores_candidates_just_past_threshold(db):
+    value = random.Random(19).getrandbits(64)
+    # Shares five bands with `canonical` but sits exactly one bit past the threshold
+    canonical = _posting(db, value)
+    far = _posting(db, _flip(value, range(settings.JOB_DEDUP_MAX_HAMMING + 1)))
+
+    assert job_dedup.link_duplicates_for_ids(db, [canonical.id, far.id]) == 0
+    db.flush()
+    db.expire_all()
+    assert far.canonical_id is None
+
+
+def test_dead_or_expired_postings_are_not_canonical(db):
+    value = random.Random(13).getrandbits(64)
+    now = datetime.now(timezone.utc)
+    _posting(db, value, dead_at=now)
+    _posting(db, _flip(value, [1]), expired_at=now)
+    job = _posting(db, _flip(value, [2]))
+
+    assert job_dedup.find_canonical(db, job) is None
+
+
+def test_release_promotes_oldest_live_duplicate(db):
+    value = random.Random(17).getrandbits(64)
+    canonical = _posting(db, value)
+    dead_duplicate = _posting(db, _flip(value, [1]), canonical_id=canonical.id,
+                              dead_at=datetime.now(timezone.utc))
+    first = _posting(db, _flip(value, [2]), canonical_id=canonical.id)
+    second = _posting(db, _flip(value, [3]), canonical_id=canonical.id)
+
+    canonical.dead_at = datetime.now(timezone.utc)
+    db.flush()
+    job_dedup.release_duplicates(db, [canonical.id])
+    db.flush()
+    db.expire_all()
+
+    assert first.canonical_id is None
+    assert second.canonical_id == first.id
+    assert dead_duplicate.canonical_id is None  # Unlinked, but still hidden as dead
+    assert job_dedup.release_stranded_duplicates(db) == 0
@@ -1,5 +1,5 @@
 import { Injectable } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpHeaders } from '@angular/common/http';
 import { Observable } from 'rxjs';
 import { environment } from '../../../environments/environment';
 
@@ -15,7 +15,14 @@ export class JobService {
         return this.http.get<any[]>(`${this.apiUrl}/recommendations`);
     }
 
+    // Retries of the same request reuse its Idempotency-Key, so the backend never records a swipe twice
     swipeJob(jobId: number, direction: 'LEFT' | 'RIGHT'): Observable<any> {
-        return this.http.post(`${this.apiUrl}/${jobId}/swipe`, { job_posting_id: jobId, direction });
+        const headers = new HttpHeaders({ 'Idempotency-Key': crypto.randomUUID() });
+        return this.http.post(`${this.apiUrl}/${jobId}/swipe`, { job_posting_id: jobId, direction }, { headers });
+    }
+
+    swipeJobs(swipes: { job_posting_id: number; direction: 'LEFT' | 'RIGHT' }[], idempotencyKey: string = crypto.randomUUID()): Observable<any> {
+        const headers = new HttpHeaders({ 'Idempotency-Key': idempotencyKey });
+        return this.http.post(`${this.apiUrl}/swipes`, { swipes }, { headers });
     }
 }
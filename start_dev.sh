@@ -35,6 +35,16 @@ pip install -r requirements.txt
 echo "Starting Backend Server..."
 uvicorn app.main:app --reload &
 BACKEND_PID=$!
+
+# Start Automation Worker (runs queued browser automations)
+echo "Starting Automation Worker..."
+python -m app.automation_worker &
+WORKER_PID=$!
+
+# Start Periodic-Job Worker (Gmail polling, link validation, cleanup)
+echo "Starting Periodic-Job Worker..."
+python -m app.worker &
+SCHEDULER_PID=$!
 cd ..
 
 # Frontend Setup & Run